@@ -1,6 +1,8 @@
 """Core Bazi calculation modules."""
 
 from .calculator import BaZiCalculator
+from .encoding import EncodedChart
+from .analysis import analyze_chart
 from .wuxing import analyze_wuxing
 from .ten_gods import ten_god, analyze_ten_gods
 from .strength import analyze_strength
@@ -8,6 +10,8 @@ from .interactions import analyze_interactions
 
 __all__ = [
     "BaZiCalculator",
+    "EncodedChart",
+    "analyze_chart",
     "analyze_wuxing",
     "ten_god",
     "analyze_ten_gods",
@@ -0,0 +1,106 @@
+"""单次遍历的综合分析。"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Iterable, Mapping
+
+from .constants import WUXING, SHENG, KE
+from .interactions import interactions_from_masks
+from .pattern import pattern_from_indices
+from .tables import (
+    STEM_ELEMENT,
+    TEN_GOD_NAMES,
+    TEN_GOD_TABLE,
+    HIDDEN_ELEMENTS,
+    MONTH_STRENGTH,
+    STEM_STRENGTH,
+    BRANCH_STRENGTH_TERMS,
+    stem_indices,
+    branch_indices,
+)
+
+ANALYSES = ("wuxing", "ten_gods", "strength", "interactions", "pattern")
+
+
+def strength_level(score: float) -> str:
+    """强弱分数 -> 判定。"""
+    if score >= 4.0:
+        return "身强"
+    if score >= 1.0:
+        return "身偏强"
+    if score >= -1.0:
+        return "中和"
+    return "身弱"
+
+
+def analyze_chart(chart: Mapping, include: Iterable[str] = ANALYSES) -> dict:
+    """
+    一次遍历八字，同时得出五行、十神、强弱、刑冲合害与格局。
+
+    四干、四支各只读取一次，五行计数、十神、强弱得分与地支掩码在同一趟循环里累积，
+    各项结果与 ``analyze_wuxing`` 等单项函数完全一致（单项函数即本函数的包装）。
+
+    Args:
+        chart: 四柱字典或 ``EncodedChart``
+        include: 需要的分析项，取自 ``ANALYSES``；只要十神时不读取地支
+
+    Returns:
+        dict: 以分析项为键的结果
+    """
+    include = set(include)
+    unknown = include.difference(ANALYSES)
+    if unknown:
+        raise ValueError(f"unknown analyses: {sorted(unknown)}")
+    stems = stem_indices(chart)
+    day_stem = stems[2]
+    day_element = STEM_ELEMENT[day_stem]
+    god_row = day_stem * 10
+    strength_row = day_element * 5
+
+    counts = {}
+    gods = []
+    score = 0.0
+    stem_scores = []
+    for i, stem in enumerate(stems):
+        element = STEM_ELEMENT[stem]
+        counts[element] = counts.get(element, 0) + 1
+        gods.append(TEN_GOD_NAMES[TEN_GOD_TABLE[god_row + stem]])
+        if i != 2:
+            # 得势：不含日干本身
+            stem_scores.append(STEM_STRENGTH[strength_row + element])
+
+    seen = dup = 0
+    if include != {"ten_gods"}:
+        branches = branch_indices(chart)
+        # 得令先加，再依次加干、支，保持与逐项累加相同的浮点顺序
+        score += MONTH_STRENGTH[day_element * 12 + branches[1]]
+        for value in stem_scores:
+            score += value
+        branch_row = day_element * 12
+        for branch in branches:
+            bit = 1 << branch
+            dup |= seen & bit
+            seen |= bit
+            for element in HIDDEN_ELEMENTS[branch]:
+                counts[element] = counts.get(element, 0) + 1
+            for term in BRANCH_STRENGTH_TERMS[branch_row + branch]:
+                score += term
+
+    result = {}
+    if "wuxing" in include:
+        result["wuxing"] = {
+            "counts": {WUXING[e]: n for e, n in counts.items()},
+            "missing": [WUXING[e] for e in range(5) if e not in counts],
+            "sheng": SHENG.copy(),
+            "ke": KE.copy(),
+        }
+    if "ten_gods" in include:
+        result["ten_gods"] = {"gods": gods, "counts": dict(Counter(gods))}
+    if "strength" in include:
+        result["strength"] = {"score": round(score, 2), "level": strength_level(score)}
+    if "interactions" in include:
+        result["interactions"] = interactions_from_masks(seen, dup)
+    if "pattern" in include:
+        result["pattern"] = pattern_from_indices(stems, branches)
+    return result
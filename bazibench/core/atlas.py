@@ -0,0 +1,184 @@
+"""干支历图谱：预计算的四柱区间表。
+
+对固定的经度与时区，四柱只在时辰交界、子夜和节令交接处变化。``build_atlas``
+把某一年份范围内所有变化点（以钟表时间计）连同区间四柱写入一个紧凑的二进制文件；
+``CalendarAtlas`` 以 ``mmap`` 只读映射该文件，查询时只做一次二分查找，
+无需加载 lunar_python 或节气表，多个进程共享同一份物理页。
+
+文件布局（小端）::
+
+    header  48 字节  magic, version, count, start_year, end_year, longitude, utc_offset, zi_school
+    starts  int64 * (count + 1)   区间起点（钟表时间 Unix 秒），末项为范围终点
+    codes   uint8 * (count * 4)   区间四柱的六十甲子序号（年、月、日、时）
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .calculator import BaZiCalculator, _chart_dict
+from .constants import JIAZI
+from .ganzhi import ZI_HOUR_SCHOOLS
+from .solar_time import EOT_APPROX
+from ..utils.cache import get_cache_dir
+
+_MAGIC = b"BZATLAS\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIiiddB7x")
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def default_atlas_path(
+    start_year: int = 1900,
+    end_year: int = 2100,
+    longitude: float = 120.0,
+    utc_offset: float = 8.0,
+    zi_school: str = "late",
+) -> Path:
+    """缓存目录下与参数对应的图谱文件路径。"""
+    return get_cache_dir() / f"atlas_{start_year}_{end_year}_{longitude:g}_{utc_offset:g}_{zi_school}_v{_VERSION}.bin"
+
+
+def build_atlas(
+    path: Union[str, Path],
+    start_year: int = 1900,
+    end_year: int = 2100,
+    longitude: float = 120.0,
+    utc_offset: float = 8.0,
+    calculator: Optional[BaZiCalculator] = None,
+) -> int:
+    """
+    预计算 [start_year, end_year] 内的四柱区间并写入图谱文件。
+
+    Args:
+        path: 输出文件路径
+        start_year: 起始年份（钟表时间）
+        end_year: 结束年份（含）
+        longitude: 经度
+        utc_offset: 时区
+        calculator: 用于排盘的计算器（决定子时流派），默认新建
+
+    Returns:
+        int: 区间个数
+    """
+    calculator = calculator if calculator is not None else BaZiCalculator(cache_size=0)
+    if calculator.eot_method != EOT_APPROX:
+        # 区间推导依赖“同一钟表日内偏移恒定”，只有近似均时差满足
+        raise ValueError("atlas requires the approx equation of time")
+    first_day = (np.datetime64(f"{start_year}-01-01") - np.datetime64("1970-01-01")).astype(np.int64)
+    last_day = (np.datetime64(f"{end_year + 1}-01-01") - np.datetime64("1970-01-01")).astype(np.int64)
+    starts = calculator._transition_points(np.arange(first_day, last_day, dtype=np.int64), longitude, utc_offset)
+    pillars = calculator.calculate_batch(starts.astype("datetime64[s]"), longitude, utc_offset)
+    codes = np.stack([pillars["year"], pillars["month"], pillars["day"], pillars["hour"]], axis=1)
+
+    # 只保留四柱确实发生变化的起点
+    keep = np.ones(len(starts), dtype=bool)
+    keep[1:] = np.any(codes[1:] != codes[:-1], axis=1)
+    starts = np.append(starts[keep], last_day * 86400).astype("<i8")
+    codes = np.ascontiguousarray(codes[keep], dtype=np.uint8)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, _VERSION, len(codes), start_year, end_year, longitude, utc_offset,
+            ZI_HOUR_SCHOOLS.index(calculator.zi_school),
+        ))
+        f.write(starts.tobytes())
+        f.write(codes.tobytes())
+    os.replace(tmp_path, path)
+    return len(codes)
+
+
+class CalendarAtlas:
+    """
+    只读映射的四柱区间表。
+
+    ``lookup`` 按钟表时间（Unix 秒）返回四柱的六十甲子序号，仅做一次 bisect，
+    不分配 Python 对象；``calculate`` 返回与 ``BaZiCalculator.calculate`` 相同的字典。
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        if sys.byteorder != "little":
+            raise RuntimeError("CalendarAtlas requires a little-endian platform")
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, count, self.start_year, self.end_year,
+         self.longitude, self.utc_offset, school) = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a version {_VERSION} calendar atlas")
+        self.zi_school = ZI_HOUR_SCHOOLS[school]
+        self._count = count
+        view = memoryview(self._mmap)
+        starts_end = _HEADER.size + 8 * (count + 1)
+        self.starts = view[_HEADER.size:starts_end].cast("q")
+        self.codes = view[starts_end:starts_end + 4 * count]
+        self._first = self.starts[0]
+        self._last = self.starts[count]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "CalendarAtlas":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.starts.release()
+        self.codes.release()
+        self._mmap.close()
+
+    def covers(self, dt: datetime, longitude: float = 120.0, utc_offset: float = 8.0) -> bool:
+        """图谱能否直接回答该时刻（同一地点、整秒、在年份范围内）。"""
+        if dt.microsecond or longitude != self.longitude or utc_offset != self.utc_offset:
+            return False
+        return self.start_year <= dt.year <= self.end_year
+
+    def lookup(self, seconds: int) -> Tuple[int, int, int, int]:
+        """钟表时间（Unix 秒）-> (年, 月, 日, 时) 六十甲子序号。"""
+        if not self._first <= seconds < self._last:
+            raise ValueError(f"time out of atlas range {self.start_year}-{self.end_year}")
+        i = 4 * (bisect_right(self.starts, seconds) - 1)
+        codes = self.codes
+        return codes[i], codes[i + 1], codes[i + 2], codes[i + 3]
+
+    @staticmethod
+    def seconds(dt: datetime) -> int:
+        """钟表时间 -> 图谱使用的 Unix 秒数。"""
+        return (dt - _EPOCH) // _SECOND
+
+    def calculate(self, dt: datetime) -> dict:
+        """按图谱排盘，``dt`` 为图谱所在地的钟表时间。"""
+        year, month, day, hour = self.lookup(self.seconds(dt))
+        return _chart_dict(JIAZI[year], JIAZI[month], JIAZI[day], JIAZI[hour])
+
+
+
+def load_atlas(
+    start_year: int = 1900,
+    end_year: int = 2100,
+    longitude: float = 120.0,
+    utc_offset: float = 8.0,
+    zi_school: str = "late",
+) -> CalendarAtlas:
+    """打开缓存目录中的图谱，不存在时先构建。"""
+    path = default_atlas_path(start_year, end_year, longitude, utc_offset, zi_school)
+    if not path.exists():
+        calculator = BaZiCalculator(zi_school=zi_school, cache_size=0)
+        build_atlas(path, start_year, end_year, longitude, utc_offset, calculator)
+    return CalendarAtlas(path)
@@ -0,0 +1,211 @@
+"""批量分析：对 (N, 8) 编码数组一次算出五行、十神、强弱、格局与刑冲合害类别。
+
+输入每行为 ``EncodedChart.indices()``，即年干、年支、月干、月支、日干、日支、时干、时支的序号；
+所有结果都是对 ``tables`` 中预计算表的花式索引，与逐个调用单项分析函数的结果一致。
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable, Mapping, Tuple
+
+import numpy as np
+
+from .encoding import EncodedChart
+from .interactions import FIELDS, SELF_XING_MASKS, interaction_table
+from .pattern import PATTERN_INDEX, CONG_SHI, PROTRUSION, NORMAL_PATTERN, HUA_ELEMENT
+from .tables import (
+    SAME,
+    SUPPORTED,
+    DRAIN,
+    CONTROLLED,
+    CONTROLS,
+    STEM_ELEMENT,
+    BRANCH_ELEMENT,
+    ELEMENT_RELATION,
+    TEN_GOD_TABLE,
+    HIDDEN_ELEMENT_VECTORS,
+    MONTH_STRENGTH,
+    STEM_STRENGTH,
+    BRANCH_STRENGTH_TERMS,
+)
+
+LEVELS = ("身强", "身偏强", "中和", "身弱")
+
+_STEM_ELEMENT = np.array(STEM_ELEMENT, dtype=np.intp)
+_TEN_GOD = np.array(TEN_GOD_TABLE, dtype=np.uint8).reshape(10, 10)
+_HIDDEN_VECTORS = np.array(HIDDEN_ELEMENT_VECTORS, dtype=np.int64)
+_MONTH_STRENGTH = np.array(MONTH_STRENGTH).reshape(5, 12)
+_STEM_STRENGTH = np.array(STEM_STRENGTH).reshape(5, 5)
+# 各地支的藏干得分补齐为 3 项（不足补 0.0，加 0.0 不改变累加结果）
+_BRANCH_TERMS = np.array([terms + (0.0,) * (3 - len(terms)) for terms in BRANCH_STRENGTH_TERMS]).reshape(5, 12, 3)
+_LEVEL_BOUNDS = np.array([-1.0, 1.0, 4.0])
+_BRANCH_ELEMENT = np.array(BRANCH_ELEMENT, dtype=np.intp)
+_RELATION = np.array(ELEMENT_RELATION, dtype=np.intp).reshape(5, 5)
+_PROTRUSION = np.array(PROTRUSION, dtype=np.intp).reshape(12, 1024)
+_NORMAL_PATTERN = np.array(NORMAL_PATTERN, dtype=np.uint8).reshape(10, 12, 8)
+_HUA_ELEMENT = np.array(HUA_ELEMENT, dtype=np.intp).reshape(10, 10)
+
+
+def encode_charts(charts: Iterable[Mapping]) -> np.ndarray:
+    """四柱字典或 ``EncodedChart`` 序列 -> (N, 8) uint8 数组。"""
+    return np.array(
+        [EncodedChart.from_dict(chart).indices() for chart in charts], dtype=np.uint8
+    ).reshape(-1, 8)
+
+
+def codes_from_cycles(pillars: Mapping[str, np.ndarray]) -> np.ndarray:
+    """``BaZiCalculator.calculate_batch`` 的六十甲子序号 -> (N, 8) uint8 数组。"""
+    cycles = np.stack([pillars[p] for p in ("year", "month", "day", "hour")], axis=1).astype(np.uint8)
+    codes = np.empty((len(cycles), 8), dtype=np.uint8)
+    codes[:, 0::2] = cycles % 10
+    codes[:, 1::2] = cycles % 12
+    return codes
+
+
+def _as_codes(codes: np.ndarray) -> np.ndarray:
+    codes = np.asarray(codes, dtype=np.intp)
+    if codes.ndim != 2 or codes.shape[1] != 8:
+        raise ValueError(f"codes must have shape (N, 8), got {codes.shape}")
+    return codes
+
+
+def wuxing_counts_batch(codes: np.ndarray) -> np.ndarray:
+    """
+    批量统计五行（天干本气 + 地支全部藏干），同 ``analyze_wuxing`` 的 counts。
+
+    Args:
+        codes: (N, 8) 编码数组
+
+    Returns:
+        np.ndarray: (N, 5) 计数，列顺序同 ``WUXING``；为 0 的列即缺失的五行
+    """
+    codes = _as_codes(codes)
+    counts = _HIDDEN_VECTORS[codes[:, 1::2]].sum(axis=1)
+    elements = _STEM_ELEMENT[codes[:, 0::2]]
+    for e in range(5):
+        counts[:, e] += (elements == e).sum(axis=1)
+    return counts
+
+
+def ten_gods_batch(codes: np.ndarray) -> np.ndarray:
+    """
+    批量计算四干十神。
+
+    Returns:
+        np.ndarray: (N, 4) uint8，``TEN_GOD_NAMES`` 下标，按年、月、日、时干
+    """
+    codes = _as_codes(codes)
+    return _TEN_GOD[codes[:, 4:5], codes[:, 0::2]]
+
+
+def strength_batch(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    批量计算日主强弱。
+
+    得分按单个分析相同的顺序逐项累加（月令、三干、四支藏干），而不是对汇总的
+    BRANCH_STRENGTH 做矩阵乘：浮点求和顺序不同会让恰在阈值上的少数样本判定翻转。
+
+    Returns:
+        tuple: ((N,) 保留两位小数的得分, (N,) uint8 判定，``LEVELS`` 下标)
+    """
+    codes = _as_codes(codes)
+    day_element = _STEM_ELEMENT[codes[:, 4]]
+    score = np.zeros(len(codes))
+    score += _MONTH_STRENGTH[day_element, codes[:, 3]]
+    for column in (0, 2, 6):
+        score += _STEM_STRENGTH[day_element, _STEM_ELEMENT[codes[:, column]]]
+    for column in (1, 3, 5, 7):
+        terms = _BRANCH_TERMS[day_element, codes[:, column]]
+        for k in range(3):
+            score += terms[:, k]
+    levels = (3 - np.searchsorted(_LEVEL_BOUNDS, score, side="right")).astype(np.uint8)
+    return np.round(score, 2), levels
+
+
+def pattern_batch(codes: np.ndarray) -> np.ndarray:
+    """
+    批量判定主格局，规则与 ``pattern.pattern_from_indices`` 相同（化气 > 专旺 > 从格 > 正格）。
+
+    Returns:
+        np.ndarray: (N,) uint8，``PATTERN_NAMES`` 下标
+    """
+    codes = _as_codes(codes)
+    stems = codes[:, 0::2]
+    branches = codes[:, 1::2]
+    day_stem = stems[:, 2]
+    month_branch = branches[:, 1]
+
+    # 正格：月令藏干透出情况查表
+    stem_mask = (1 << stems[:, 0]) | (1 << stems[:, 1]) | (1 << stems[:, 3])
+    protrusion = _PROTRUSION[month_branch, stem_mask]
+    result = _NORMAL_PATTERN[day_stem, month_branch, protrusion]
+
+    # 从格、专旺：日干以外七个字相对日主的五行关系计数
+    day_element = _STEM_ELEMENT[day_stem]
+    elements = np.concatenate([_STEM_ELEMENT[stems[:, [0, 1, 3]]], _BRANCH_ELEMENT[branches]], axis=1)
+    relations = _RELATION[day_element[:, None], elements]
+    counts = np.stack([(relations == k).sum(axis=1) for k in range(5)], axis=1)
+    support = counts[:, SAME] + counts[:, SUPPORTED]
+
+    cong = support == 0
+    classes = np.array([DRAIN, CONTROLS, CONTROLLED])
+    dominant = classes[np.argmax(counts[:, classes], axis=1)]
+    cong_codes = np.full(len(codes), CONG_SHI, dtype=np.uint8)
+    for relation, name in ((CONTROLS, "从财格"), (CONTROLLED, "从杀格"), (DRAIN, "从儿格")):
+        cong_codes[(dominant == relation) & (counts[:, relation] >= 4)] = PATTERN_INDEX[name]
+    result = np.where(cong, cong_codes, result)
+
+    zhuanwang = (
+        (_RELATION[day_element, _BRANCH_ELEMENT[month_branch]] == SAME)
+        & (counts[:, SAME] >= 4)
+        & (support >= 6)
+        & (counts[:, CONTROLLED] == 0)
+    )
+    result = np.where(zhuanwang, PATTERN_INDEX["曲直格"] + day_element, result)
+
+    # 化气：日干只与月干或时干之一相合，化神当令，合干以外无克化神之干
+    month_hua = _HUA_ELEMENT[day_stem, stems[:, 1]]
+    hour_hua = _HUA_ELEMENT[day_stem, stems[:, 3]]
+    hua = (month_hua >= 0) != (hour_hua >= 0)
+    element = np.where(month_hua >= 0, month_hua, hour_hua)
+    partner = np.where(month_hua >= 0, 1, 3)
+    hua &= _BRANCH_ELEMENT[month_branch] == element
+    safe_element = np.maximum(element, 0)
+    for i in (0, 1, 3):
+        hua &= (partner == i) | (_RELATION[safe_element, _STEM_ELEMENT[stems[:, i]]] != CONTROLLED)
+    result = np.where(hua, PATTERN_INDEX["化木格"] + safe_element, result)
+    return result.astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _interaction_flag_table() -> np.ndarray:
+    # 4096 项：地支集合掩码 -> 命中的规则字段位（位序同 ``FIELDS``，自刑另算）
+    rule_fields = [f for f in FIELDS if f != "self_xing"]
+    return np.array([
+        sum(1 << FIELDS.index(field) for field, hits in zip(rule_fields, row) if hits)
+        for row in interaction_table()
+    ], dtype=np.uint8)
+
+
+_SELF_XING_MASK = sum(bit for bit, _ in SELF_XING_MASKS)
+_SELF_XING_BIT = 1 << FIELDS.index("self_xing")
+
+
+def interaction_flags_batch(codes: np.ndarray) -> np.ndarray:
+    """
+    批量判定地支刑冲合害出现了哪几类。
+
+    Returns:
+        np.ndarray: (N,) uint8 位掩码，第 k 位表示 ``FIELDS[k]`` 非空
+    """
+    codes = _as_codes(codes)
+    seen = np.zeros(len(codes), dtype=np.intp)
+    dup = np.zeros(len(codes), dtype=np.intp)
+    for column in (1, 3, 5, 7):
+        bit = 1 << codes[:, column]
+        dup |= seen & bit
+        seen |= bit
+    flags = _interaction_flag_table()[seen]
+    flags[(dup & _SELF_XING_MASK) != 0] |= _SELF_XING_BIT
+    return flags
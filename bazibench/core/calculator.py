@@ -2,14 +2,99 @@
 
 from __future__ import annotations
 
-import math
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import TYPE_CHECKING, Any, Iterator, List, Dict, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from lunar_python import Solar
 
-from .constants import TIANGAN, DIZHI
+from .constants import JIAZI
+from .jieqi import JieQiIndex, load_jieqi_index
+from .ganzhi import ZI_HOUR_LATE, ZI_HOUR_SCHOOLS, MONTH_CYCLES, day_hour_cycles, day_hour_cycles_array, year_cycle
+from .dayun import DaYunSequence
+from .timeline import Timeline
+from .encoding import EncodedChart
+from .solar_time import EOT_APPROX, EOT_METHODS, solar_offset_us, true_solar_time, true_solar_seconds_array
+
+if TYPE_CHECKING:
+    from .atlas import CalendarAtlas
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+# 首尾相接的两轮六十甲子，连续年份的流年即其中的一个切片
+_JIAZI_TWICE = JIAZI * 2
+# 年干序号 -> 12 个流月干支
+_LIUYUE = tuple(tuple(JIAZI[cycle] for cycle in cycles) for cycles in MONTH_CYCLES)
+_JIAZI_INDEX = {ganzhi: i for i, ganzhi in enumerate(JIAZI)}
+
+
+def _chart_dict(year_ganzhi: str, month_ganzhi: str, day_ganzhi: str, hour_ganzhi: str) -> dict:
+    return {
+        "year": year_ganzhi,
+        "month": month_ganzhi,
+        "day": day_ganzhi,
+        "hour": hour_ganzhi,
+        "year_stem": year_ganzhi[0],
+        "year_branch": year_ganzhi[1],
+        "month_stem": month_ganzhi[0],
+        "month_branch": month_ganzhi[1],
+        "day_stem": day_ganzhi[0],
+        "day_branch": day_ganzhi[1],
+        "hour_stem": hour_ganzhi[0],
+        "hour_branch": hour_ganzhi[1],
+    }
+
+
+def _to_solar(true_solar_time: datetime) -> Solar:
+    return Solar.fromYmdHms(
+        true_solar_time.year, true_solar_time.month, true_solar_time.day,
+        true_solar_time.hour, true_solar_time.minute, true_solar_time.second,
+    )
+
+
+def _lunar_year_month(true_solar_time: datetime) -> Tuple[int, int]:
+    """节气索引范围之外的年柱、月柱：退回 lunar_python 排盘。"""
+    bazi = _to_solar(true_solar_time).getLunar().getEightChar()
+    return _JIAZI_INDEX[bazi.getYear()], _JIAZI_INDEX[bazi.getMonth()]
+
+
+# 真太阳时下四柱可能变化的时刻：子夜与各时辰交界（奇数点整）
+_HOUR_MARKS = np.array([0] + list(range(1, 24, 2)), dtype=np.int64) * 3600
+
+
+def _ceil_div(a: np.ndarray, b: int) -> np.ndarray:
+    return -((-a) // b)
+
+
+def _transition_candidates(
+    days: np.ndarray, offsets_us: np.ndarray, instants: np.ndarray
+) -> np.ndarray:
+    """
+    求钟表时间下所有可能的四柱变化点。
+
+    每个钟表日内真太阳时 = 钟表时间 + 当日固定偏移，故真太阳时边界 B 对应的钟表秒
+    是满足 ``s * 1e6 + offset >= B * 1e6`` 的最小整数 s（与排盘时截断到秒的规则一致）。
+    """
+    day_starts = days * 86400
+    # 时辰边界：取前一日、当日、次日的真太阳时刻，映射回当日钟表时间
+    marks = ((days[:, None] + np.array([-1, 0, 1]))[:, :, None] * 86400 + _HOUR_MARKS).reshape(len(days), -1)
+    hour_points = _ceil_div(marks * 1_000_000 - offsets_us[:, None], 1_000_000)
+    in_day = (hour_points >= day_starts[:, None]) & (hour_points < day_starts[:, None] + 86400)
+
+    # 节令交接：可能落在相邻的三个钟表日内
+    jie_days = instants // 86400 + np.array([[-1], [0], [1]])
+    positions = jie_days - days[0]
+    valid = (positions >= 0) & (positions < len(days))
+    jie_points = _ceil_div(
+        np.broadcast_to(instants, jie_days.shape)[valid] * 1_000_000 - offsets_us[positions[valid]], 1_000_000
+    )
+    jie_in_day = jie_points // 86400 == jie_days[valid]
+
+    return np.unique(np.concatenate([day_starts, hour_points[in_day], jie_points[jie_in_day]]))
+
+
 
 @dataclass(frozen=True)
 class BaZiPillar:
@@ -21,38 +106,102 @@ class BaZiPillar:
         return f"{self.stem}{self.branch}"
 
 
+@dataclass
+class _ResolvedInstant:
+    """缓存中的一个真太阳时时刻：四柱序号与字典，以及按需生成的各性别大运序列。"""
+    true_solar_time: datetime
+    cycles: Tuple[int, int, int, int]
+    chart: dict
+    dayun: Dict[int, DaYunSequence] = field(default_factory=dict)
+
+
 class BaZiCalculator:
-    def __init__(self) -> None:
-        pass
+    def __init__(
+        self,
+        jieqi_index: Optional[JieQiIndex] = None,
+        zi_school: str = ZI_HOUR_LATE,
+        cache_size: int = 4096,
+        atlas: Optional["CalendarAtlas"] = None,
+        eot_method: str = EOT_APPROX,
+    ) -> None:
+        """
+        Args:
+            jieqi_index: 节气索引，默认加载 1800-2200 年的全局索引
+            zi_school: 子时流派，``"late"``（晚子时日柱算当天）或 ``"early"``（23点即换日）
+            cache_size: 时刻解析结果的 LRU 缓存容量，0 表示不缓存
+            atlas: 预计算的干支历图谱，命中其地点与年份范围的 ``calculate`` 直接查表
+            eot_method: 均时差算法，``"approx"``（默认）或 ``"spencer"``
+        """
+        if zi_school not in ZI_HOUR_SCHOOLS:
+            raise ValueError(f"zi_school must be one of {ZI_HOUR_SCHOOLS}, got {zi_school!r}")
+        if cache_size < 0:
+            raise ValueError("cache_size must be non-negative")
+        if eot_method not in EOT_METHODS:
+            raise ValueError(f"eot_method must be one of {EOT_METHODS}, got {eot_method!r}")
+        if atlas is not None and atlas.zi_school != zi_school:
+            raise ValueError(f"atlas was built for zi_school {atlas.zi_school!r}, calculator uses {zi_school!r}")
+        if atlas is not None and eot_method != EOT_APPROX:
+            raise ValueError("atlas is only valid with the approx equation of time")
+        self.atlas = atlas
+        self.jieqi = jieqi_index if jieqi_index is not None else load_jieqi_index()
+        self.zi_school = zi_school
+        self.eot_method = eot_method
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache: "OrderedDict[Tuple[Any, ...], _ResolvedInstant]" = OrderedDict()
+
+    def clear_cache(self) -> None:
+        """清空时刻解析缓存并重置命中计数。"""
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """返回缓存统计：hits, misses, size, maxsize。"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._cache),
+            "maxsize": self.cache_size,
+        }
+
+    def _resolve(self, dt: datetime, longitude: float, utc_offset: float) -> _ResolvedInstant:
+        """
+        解析出生时刻，结果按 (真太阳时, 经度, 时区) 做 LRU 缓存。
+
+        真太阳时取到秒，这正是排盘实际使用的精度（节气交接可落在任意一秒），
+        因此同一时刻的四柱与大运计算都只做一次。
+        """
+        true_solar_time = self._true_solar_time(dt, longitude, utc_offset).replace(microsecond=0)
+        key = (true_solar_time, longitude, utc_offset)
+        entry = self._cache.get(key)
+        if entry is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return entry
+
+        self.cache_misses += 1
+        cycles = self._pillar_cycles(true_solar_time)
+        entry = _ResolvedInstant(true_solar_time, cycles, _chart_dict(*(JIAZI[c] for c in cycles)))
+        if self.cache_size:
+            self._cache[key] = entry
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def _true_solar_time(self, dt: datetime, longitude: float = 120.0, utc_offset: float = 8.0) -> datetime:
+        """
+        根据时间和经度计算真太阳时（均时差算法见 ``solar_time``）。
+        """
+        return true_solar_time(dt, longitude, utc_offset, self.eot_method)
 
     def _get_solar(self, dt: datetime, longitude: float = 120.0, utc_offset: float = 8.0) -> Solar:
         """
         根据时间和经度获取True Solar Time对应的Solar对象。
         """
-        # 1. 计算真太阳时 (True Solar Time)
-        # 1.1 平太阳时 (Local Mean Time)
-        # 标准经度 = 时区 * 15
-        standard_meridian = utc_offset * 15.0
-        # 经度差带来的时间差 (每度4分钟)
-        offset_minutes = (longitude - standard_meridian) * 4
-        
-        # 1.2 真太阳时均时差 (Equation of Time)
-        day_of_year = dt.timetuple().tm_yday
-        B = 360 * (day_of_year - 81) / 365
-        B_rad = math.radians(B)
-        eot = 9.87 * math.sin(2 * B_rad) - 7.53 * math.cos(B_rad) - 1.5 * math.sin(B_rad)
-        
-        total_offset_minutes = offset_minutes + eot
-        true_solar_time = dt + timedelta(minutes=total_offset_minutes)
-        
-        return Solar.fromYmdHms(
-            true_solar_time.year, 
-            true_solar_time.month, 
-            true_solar_time.day, 
-            true_solar_time.hour, 
-            true_solar_time.minute, 
-            true_solar_time.second
-        )
+        true_solar_time = self._true_solar_time(dt, longitude, utc_offset)
+        return _to_solar(true_solar_time)
 
     def calculate(self, dt: datetime, longitude: float = 120.0, latitude: float = 30.0, utc_offset: float = 8.0) -> dict:
         """
@@ -67,32 +216,149 @@ class BaZiCalculator:
         Returns:
             dict: 包含四柱信息的字典
         """
-        solar = self._get_solar(dt, longitude, utc_offset)
-        lunar = solar.getLunar()
-        bazi = lunar.getEightChar()
-        
-        # 3. 提取结果
-        year_ganzhi = bazi.getYear()
-        month_ganzhi = bazi.getMonth()
-        day_ganzhi = bazi.getDay()
-        hour_ganzhi = bazi.getTime()
-        
+        if self.atlas is not None and self.atlas.covers(dt, longitude, utc_offset):
+            return self.atlas.calculate(dt)
+        return dict(self._resolve(dt, longitude, utc_offset).chart)
+
+    def calculate_encoded(self, dt: datetime, longitude: float = 120.0, utc_offset: float = 8.0) -> EncodedChart:
+        """
+        计算八字四柱，返回整数编码的 ``EncodedChart``，不构造字符串字典。
+        """
+        if self.atlas is not None and self.atlas.covers(dt, longitude, utc_offset):
+            return EncodedChart.from_cycles(*self.atlas.lookup(self.atlas.seconds(dt)))
+        return EncodedChart.from_cycles(*self._resolve(dt, longitude, utc_offset).cycles)
+
+    def _pillar_cycles(self, true_solar_time: datetime) -> Tuple[int, int, int, int]:
+        """
+        由真太阳时推出四柱的六十甲子序号：年柱、月柱查节气索引（索引范围之外退回
+        lunar_python），日柱、时柱交给算术内核。
+        """
+        days = true_solar_time.toordinal() - _EPOCH_ORDINAL
+        hour = true_solar_time.hour
+        seconds = days * 86400 + hour * 3600 + true_solar_time.minute * 60 + true_solar_time.second
+        if self.jieqi.contains(seconds):
+            year_cycle, month_cycle = self.jieqi.year_month(seconds)
+        else:
+            year_cycle, month_cycle = _lunar_year_month(true_solar_time)
+        day_cycle, hour_cycle = day_hour_cycles(days, hour, self.zi_school)
+        return year_cycle, month_cycle, day_cycle, hour_cycle
+
+    def calculate_batch(
+        self,
+        datetimes: Union[Sequence[datetime], np.ndarray],
+        longitudes: Union[float, Sequence[float], np.ndarray] = 120.0,
+        utc_offsets: Union[float, Sequence[float], np.ndarray] = 8.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        批量计算八字四柱，结果与逐个调用 ``calculate`` 完全一致。
+
+        全程为数组运算：真太阳时按与 ``_true_solar_time`` 相同的公式求出，
+        日柱、时柱由儒略日数直接推出，年柱、月柱通过节气索引二分查找得到；
+        节气索引范围（1800-2200）之外的时刻逐个退回 lunar_python。
+
+        Args:
+            datetimes: datetime 序列或 datetime64 数组 (Clock Time)
+            longitudes: 经度，标量或与 datetimes 等长的数组
+            utc_offsets: 时区，标量或与 datetimes 等长的数组
+
+        Returns:
+            Dict[str, np.ndarray]: ``year``/``month``/``day``/``hour`` 四个 uint8 数组，
+            值为六十甲子序号（见 ``constants.JIAZI``）
+        """
+        # 1. 真太阳时（秒，朴素本地时间）
+        seconds = true_solar_seconds_array(datetimes, longitudes, utc_offsets, self.eot_method)
+
+        # 2. 日柱、时柱
+        days = np.floor_divide(seconds, 86400)
+        hours = (seconds - days * 86400) // 3600
+        day_cycle, hour_cycle = day_hour_cycles_array(days, hours, self.zi_school)
+
+        # 3. 年柱、月柱：查节气索引，索引之外逐个退回 lunar_python
+        inside = (seconds >= self.jieqi.instants[0]) & (seconds < self.jieqi.instants[-1])
+        if inside.all():
+            year_cycle, month_cycle = self.jieqi.year_month_array(seconds)
+        else:
+            year_cycle = np.empty(seconds.shape, dtype=np.int64)
+            month_cycle = np.empty(seconds.shape, dtype=np.int64)
+            year_cycle[inside], month_cycle[inside] = self.jieqi.year_month_array(seconds[inside])
+            for i in np.flatnonzero(~inside).tolist():
+                year_cycle[i], month_cycle[i] = _lunar_year_month(_EPOCH + timedelta(seconds=int(seconds[i])))
+
         return {
-            "year": year_ganzhi,
-            "month": month_ganzhi,
-            "day": day_ganzhi,
-            "hour": hour_ganzhi,
-            "year_stem": year_ganzhi[0],
-            "year_branch": year_ganzhi[1],
-            "month_stem": month_ganzhi[0],
-            "month_branch": month_ganzhi[1],
-            "day_stem": day_ganzhi[0],
-            "day_branch": day_ganzhi[1],
-            "hour_stem": hour_ganzhi[0],
-            "hour_branch": hour_ganzhi[1],
+            "year": year_cycle.astype(np.uint8),
+            "month": month_cycle.astype(np.uint8),
+            "day": day_cycle.astype(np.uint8),
+            "hour": hour_cycle.astype(np.uint8),
         }
 
-    def calculate_dayun(self, dt: datetime, gender: int, longitude: float = 120.0, utc_offset: float = 8.0) -> List[Dict]:
+    def _transition_points(self, days: np.ndarray, longitude: float, utc_offset: float) -> np.ndarray:
+        """连续的钟表日（1970 起的日数）内所有可能的四柱变化点（钟表时间 Unix 秒，已排序）。"""
+        if self.eot_method != EOT_APPROX:
+            # 推导依赖“同一钟表日内真太阳时偏移恒定”，只有近似均时差满足
+            raise ValueError("boundary computation requires the approx equation of time")
+        dates = days.astype("datetime64[D]")
+        day_of_year = (dates - dates.astype("datetime64[Y]")).astype(np.int64) + 1
+        offsets_us = solar_offset_us(day_of_year, longitude, utc_offset)
+        return _transition_candidates(days, offsets_us, self.jieqi.instants)
+
+    def iter_intervals(
+        self,
+        start: datetime,
+        end: datetime,
+        longitude: float = 120.0,
+        utc_offset: float = 8.0,
+        encoded: bool = False,
+        chunk_days: int = 366,
+    ) -> Iterator[Tuple[datetime, datetime, Union[dict, EncodedChart]]]:
+        """
+        按四柱不变的区间遍历一段时间，只在时辰交界、子夜与节令交接处出新区间。
+
+        变化点由时辰边界和节气时刻经当日真太阳时偏移反推得出，按块批量排盘后合并
+        四柱相同的相邻点，几十年的跨度只需几十万个区间而非逐分钟排盘。
+
+        Args:
+            start: 起始钟表时间（含）
+            end: 结束钟表时间（不含）
+            longitude: 经度
+            utc_offset: 时区
+            encoded: 为 True 时给出 ``EncodedChart``，否则给出与 ``calculate`` 相同的字典
+            chunk_days: 每批处理的天数
+
+        Returns:
+            Iterator: (区间起点, 区间终点, 四柱)，区间左闭右开，首尾截到 [start, end)
+        """
+        if end <= start:
+            return
+        epoch = datetime(1970, 1, 1)
+        start_us = (start - epoch) // timedelta(microseconds=1)
+        end_us = (end - epoch) // timedelta(microseconds=1)
+
+        def chart_of(cycles: Tuple[int, ...]) -> Union[dict, EncodedChart]:
+            if encoded:
+                return EncodedChart.from_cycles(*cycles)
+            return _chart_dict(*(JIAZI[c] for c in cycles))
+
+        current_start = start
+        current = tuple(self._resolve(start, longitude, utc_offset).cycles)
+        first_day = start_us // 86_400_000_000
+        last_day = -(-end_us // 86_400_000_000)
+        for chunk_start in range(first_day, last_day, chunk_days):
+            days = np.arange(chunk_start, min(chunk_start + chunk_days, last_day), dtype=np.int64)
+            points = self._transition_points(days, longitude, utc_offset)
+            points = points[(points * 1_000_000 > start_us) & (points * 1_000_000 < end_us)]
+            if not len(points):
+                continue
+            pillars = self.calculate_batch(points.astype("datetime64[s]"), longitude, utc_offset)
+            cycles = np.stack([pillars["year"], pillars["month"], pillars["day"], pillars["hour"]], axis=1)
+            for point, row in zip(points.tolist(), cycles.tolist()):
+                row = tuple(row)
+                if row != current:
+                    boundary = epoch + timedelta(seconds=point)
+                    yield current_start, boundary, chart_of(current)
+                    current_start, current = boundary, row
+        yield current_start, end, chart_of(current)
+
+    def calculate_dayun(self, dt: datetime, gender: int, longitude: float = 120.0, utc_offset: float = 8.0, count: int = 9) -> List[Dict]:
         """
         计算大运。
         
@@ -100,29 +366,59 @@ class BaZiCalculator:
             dt: 出生时间
             gender: 性别 (1男, 0女)
             longitude: 经度
+            count: 大运步数，默认9步
             
         Returns:
             List[Dict]: 大运列表，包含 start_age, start_year, ganzhi
         """
-        # 验证性别参数，lunar_python 中 1男 0女
+        # 验证性别参数，1男 0女
         if gender not in [0, 1]:
             raise ValueError("Gender must be 1 (Male) or 0 (Female)")
 
-        solar = self._get_solar(dt, longitude, utc_offset)
-        lunar = solar.getLunar()
-        bazi = lunar.getEightChar()
-        yun = bazi.getYun(gender)
-        da_yun_list = yun.getDaYun()
+        entry = self._resolve(dt, longitude, utc_offset)
+        return self._dayun(entry, gender).take(count)
+
+    def iter_dayun(self, dt: datetime, gender: int, longitude: float = 120.0, utc_offset: float = 8.0) -> Iterator[Dict]:
+        """
+        惰性地逐步生成大运，只需前几步时不必计算完整列表。
         
-        result = []
-        # lunar_python的大运列表第0个通常是起运前，跳过
-        for dy in da_yun_list[1:]:
-             result.append({
-                 "start_year": dy.getStartYear(),
-                 "start_age": dy.getStartAge(),
-                 "ganzhi": dy.getGanZhi()
-             })
-        return result
+        Args:
+            dt: 出生时间
+            gender: 性别 (1男, 0女)
+            longitude: 经度
+            
+        Returns:
+            Iterator[Dict]: 无穷的大运迭代器，元素同 ``calculate_dayun``
+        """
+        if gender not in [0, 1]:
+            raise ValueError("Gender must be 1 (Male) or 0 (Female)")
+
+        return iter(self._dayun(self._resolve(dt, longitude, utc_offset), gender))
+
+    def timeline(self, dt: datetime, gender: int, longitude: float = 120.0, utc_offset: float = 8.0) -> Timeline:
+        """
+        构造原局对照大运、流年、流月的时间线。
+        
+        Args:
+            dt: 出生时间
+            gender: 性别 (1男, 0女)
+            longitude: 经度
+            utc_offset: 时区
+            
+        Returns:
+            Timeline: 惰性时间线，见 ``timeline.Timeline``
+        """
+        if gender not in [0, 1]:
+            raise ValueError("Gender must be 1 (Male) or 0 (Female)")
+
+        entry = self._resolve(dt, longitude, utc_offset)
+        return Timeline(EncodedChart.from_cycles(*entry.cycles), self._dayun(entry, gender))
+
+    def _dayun(self, entry: _ResolvedInstant, gender: int) -> DaYunSequence:
+        if gender not in entry.dayun:
+            year, month = entry.cycles[:2]
+            entry.dayun[gender] = DaYunSequence(entry.true_solar_time, gender, year, month, self.jieqi)
+        return entry.dayun[gender]
 
     def calculate_liunian(self, year: int) -> str:
         """
@@ -135,21 +431,41 @@ class BaZiCalculator:
             str: 流年干支 (例如 "甲辰")
         """
         # 1984年是甲子年
-        offset = year - 1984
-        gan_idx = offset % 10
-        zhi_idx = offset % 12
+        return JIAZI[year_cycle(year)]
+
+    def liunian_range(self, start_year: int, end_year: int) -> List[str]:
+        """
+        计算一段年份的流年干支。
+        
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份（含）
+            
+        Returns:
+            List[str]: 各年流年干支，按年份顺序
+        """
+        count = end_year - start_year + 1
+        if count <= 0:
+            return []
+        start = year_cycle(start_year)
+        full, rest = divmod(count, 60)
+        return _JIAZI_TWICE[start:start + 60] * full + _JIAZI_TWICE[start:start + rest]
+
+    def liuyue_range(self, year: int) -> List[str]:
+        """
+        按五虎遁计算某年 12 个流月干支。
         
-        # 处理负数情况
-        if gan_idx < 0:
-            gan_idx += 10
-        if zhi_idx < 0:
-            zhi_idx += 12
+        Args:
+            year: 年份（干支年，立春起算）
             
-        return TIANGAN[gan_idx] + DIZHI[zhi_idx]
+        Returns:
+            List[str]: 寅月至丑月的月柱干支
+        """
+        return list(_LIUYUE[year_cycle(year) % 10])
 
     def calculate_with_dayun(self, dt: datetime, gender: int, longitude: float = 120.0, latitude: float = 30.0, utc_offset: float = 8.0) -> dict:
         """
-        一次性计算八字四柱和大运，避免重复创建 Solar 对象。
+        一次性计算八字四柱和大运，两者共享同一次时刻解析（及其缓存）。
         
         Args:
             dt: datetime对象 (Clock Time)
@@ -161,43 +477,12 @@ class BaZiCalculator:
         Returns:
             dict: 包含四柱信息和大运列表的字典
         """
-        solar = self._get_solar(dt, longitude, utc_offset)
-        lunar = solar.getLunar()
-        bazi = lunar.getEightChar()
-        
-        year_ganzhi = bazi.getYear()
-        month_ganzhi = bazi.getMonth()
-        day_ganzhi = bazi.getDay()
-        hour_ganzhi = bazi.getTime()
-        
-        chart_data = {
-            "year": year_ganzhi,
-            "month": month_ganzhi,
-            "day": day_ganzhi,
-            "hour": hour_ganzhi,
-            "year_stem": year_ganzhi[0],
-            "year_branch": year_ganzhi[1],
-            "month_stem": month_ganzhi[0],
-            "month_branch": month_ganzhi[1],
-            "day_stem": day_ganzhi[0],
-            "day_branch": day_ganzhi[1],
-            "hour_stem": hour_ganzhi[0],
-            "hour_branch": hour_ganzhi[1],
-        }
-        
         if gender not in [0, 1]:
             raise ValueError("Gender must be 1 (Male) or 0 (Female)")
-        
-        yun = bazi.getYun(gender)
-        da_yun_list = yun.getDaYun()
-        
-        dayun_data = []
-        for dy in da_yun_list[1:]:
-            dayun_data.append({
-                "start_year": dy.getStartYear(),
-                "start_age": dy.getStartAge(),
-                "ganzhi": dy.getGanZhi()
-            })
+
+        entry = self._resolve(dt, longitude, utc_offset)
+        chart_data = dict(entry.chart)
+        dayun_data = self._dayun(entry, gender).take(9)
         
         return {
             "chart": chart_data,
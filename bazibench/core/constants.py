@@ -5,6 +5,9 @@ DIZHI = ["子", "丑", "寅", "卯", "辰", "巳", "午", "未", "申", "酉", "
 WUXING = ["木", "火", "土", "金", "水"]
 YINYANG = {"阳": 1, "阴": -1}
 
+# 六十甲子：下标 i 对应 TIANGAN[i % 10] + DIZHI[i % 12]
+JIAZI = [TIANGAN[i % 10] + DIZHI[i % 12] for i in range(60)]
+
 STEM_INFO = {
     "甲": {"wuxing": "木", "yinyang": "阳"},
     "乙": {"wuxing": "木", "yinyang": "阴"},
@@ -33,6 +36,31 @@ BRANCH_INFO = {
     "亥": {"wuxing": "水", "hidden_stems": ["壬", "甲"]},
 }
 
+# 地支藏干权重（本气、中气、余气），顺序同 BRANCH_INFO 的 hidden_stems
+HIDDEN_WEIGHTS = {
+    "子": [1.0],          # 癸
+    "丑": [0.6, 0.3, 0.1], # 己, 癸, 辛
+    "寅": [0.6, 0.2, 0.2], # 甲, 丙, 戊
+    "卯": [1.0],          # 乙
+    "辰": [0.6, 0.3, 0.1], # 戊, 乙, 癸
+    "巳": [0.6, 0.2, 0.2], # 丙, 戊, 庚
+    "午": [0.7, 0.3],     # 丁, 己
+    "未": [0.6, 0.3, 0.1], # 己, 丁, 乙
+    "申": [0.6, 0.2, 0.2], # 庚, 壬, 戊
+    "酉": [1.0],          # 辛
+    "戌": [0.6, 0.3, 0.1], # 戊, 辛, 丁
+    "亥": [0.7, 0.3],     # 壬, 甲
+}
+
+# 天干五合及所化五行
+TIANGAN_HE = [
+    ("甲", "己", "土"),
+    ("乙", "庚", "金"),
+    ("丙", "辛", "水"),
+    ("丁", "壬", "木"),
+    ("戊", "癸", "火"),
+]
+
 # 五虎遁：年干 -> 寅月月干
 WU_HU_DUN = {
     "甲": "丙",
@@ -0,0 +1,153 @@
+"""大运推算。
+
+阳男阴女顺排、阴男阳女逆排；起运岁数按出生时刻到相邻“节”的距离折算
+（三天折一年、一个时辰折十天，同 lunar_python 流派1），大运干支由月柱在
+六十甲子上顺逆推得。节气时刻取自 ``JieQiIndex``，不构造任何历法对象；
+只有出生时刻或所需的“节”超出索引范围时，起运才退回 lunar_python 计算。
+"""
+
+from __future__ import annotations
+
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import count, islice
+from typing import Dict, Iterator, List
+
+from lunar_python import Solar
+
+from .constants import JIAZI
+from .jieqi import JieQiIndex
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _yun_hour_branch(hour: int) -> int:
+    # 起运折算中 23 点按亥时计，其余同时辰地支
+    return 11 if hour == 23 else (hour + 1) // 2 % 12
+
+
+@dataclass(frozen=True)
+class YunStart:
+    """起运信息：顺逆、起运前的年月日数与起运日期。"""
+    forward: bool
+    years: int
+    months: int
+    days: int
+    start_date: date
+
+
+def compute_yun_start(true_solar_time: datetime, gender: int, year_cycle: int, jieqi: JieQiIndex) -> YunStart:
+    """
+    计算起运。
+
+    Args:
+        true_solar_time: 出生真太阳时（精确到秒）
+        gender: 性别 (1男, 0女)
+        year_cycle: 年柱六十甲子序号
+        jieqi: 节气索引
+
+    Returns:
+        YunStart: 起运信息
+    """
+    yang = year_cycle % 2 == 0
+    forward = yang == (gender == 1)
+
+    seconds = (true_solar_time - _EPOCH) // timedelta(seconds=1)
+    if not jieqi.contains(seconds):
+        return _lunar_yun_start(true_solar_time, gender)
+    term = jieqi.locate(seconds)
+    prev_jie = term - term % 2
+    # 上一节取交接时刻 <= 出生时刻者，下一节严格晚于出生时刻
+    jie = prev_jie + 2 if forward else prev_jie
+    if jie >= len(jieqi):
+        return _lunar_yun_start(true_solar_time, gender)
+    jie_time = _EPOCH + timedelta(seconds=jieqi.instant(jie))
+    start, end = (true_solar_time, jie_time) if forward else (jie_time, true_solar_time)
+
+    hour_diff = _yun_hour_branch(end.hour) - _yun_hour_branch(start.hour)
+    day_diff = (end.date() - start.date()).days
+    if hour_diff < 0:
+        hour_diff += 12
+        day_diff -= 1
+    month_diff = hour_diff * 10 // 30
+    months = day_diff * 4 + month_diff
+    days = hour_diff * 10 - month_diff * 30
+    years, months = divmod(months, 12)
+
+    return YunStart(forward, years, months, days, _shift_date(true_solar_time.date(), years, months, days))
+
+
+def _lunar_yun_start(true_solar_time: datetime, gender: int) -> YunStart:
+    """节气索引范围之外的起运：直接取 lunar_python 的结果。"""
+    solar = Solar.fromYmdHms(
+        true_solar_time.year, true_solar_time.month, true_solar_time.day,
+        true_solar_time.hour, true_solar_time.minute, true_solar_time.second,
+    )
+    yun = solar.getLunar().getEightChar().getYun(gender)
+    start = yun.getStartSolar()
+    return YunStart(
+        yun.isForward(), yun.getStartYear(), yun.getStartMonth(), yun.getStartDay(),
+        date(start.getYear(), start.getMonth(), start.getDay()),
+    )
+
+
+def _shift_date(birth: date, years: int, months: int, days: int) -> date:
+    """按年、月、日依次推移日期，月末日期就近截断（同 lunar_python）。"""
+    year = birth.year + years
+    day = birth.day
+    if birth.month == 2 and day == 29 and not calendar.isleap(year):
+        day = 28
+    year, month = divmod(year * 12 + birth.month - 1 + months, 12)
+    month += 1
+    day = min(day, calendar.monthrange(year, month)[1])
+    return date(year, month, day) + timedelta(days=days)
+
+
+class DaYunSequence:
+    """
+    惰性的大运序列。
+
+    迭代时按需逐步生成 ``{"start_year", "start_age", "ganzhi"}``，
+    只取前 N 步的调用方只付 N 步的代价。
+    """
+
+    def __init__(self, true_solar_time: datetime, gender: int, year_cycle: int, month_cycle: int, jieqi: JieQiIndex) -> None:
+        if gender not in [0, 1]:
+            raise ValueError("Gender must be 1 (Male) or 0 (Female)")
+        self.gender = gender
+        self.birth_year = true_solar_time.year
+        self.month_cycle = month_cycle
+        self.start = compute_yun_start(true_solar_time, gender, year_cycle, jieqi)
+
+    @property
+    def forward(self) -> bool:
+        return self.start.forward
+
+    def cycle(self, index: int) -> int:
+        """第 ``index`` 步大运（从 1 开始）的六十甲子序号。"""
+        if index < 1:
+            raise ValueError("dayun index starts at 1")
+        step = index if self.start.forward else -index
+        return (self.month_cycle + step) % 60
+
+    def start_year(self, index: int) -> int:
+        """第 ``index`` 步大运的起始年份。"""
+        return self.start.start_date.year + (index - 1) * 10
+
+    def pillar(self, index: int) -> Dict:
+        """第 ``index`` 步大运（从 1 开始）。"""
+        cycle = self.cycle(index)
+        start_year = self.start_year(index)
+        return {
+            "start_year": start_year,
+            "start_age": start_year - self.birth_year + 1,
+            "ganzhi": JIAZI[cycle],
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self.pillar(i) for i in count(1))
+
+    def take(self, n: int) -> List[Dict]:
+        """前 ``n`` 步大运。"""
+        return list(islice(self, n))
@@ -0,0 +1,149 @@
+"""整数编码的八字。
+
+``EncodedChart`` 用 8 个小整数（天干序号 0-9、地支序号 0-11）表示四柱，
+``__slots__`` 存储，单个对象约 100 字节，而等价的 12 键字符串字典约 1.5KB。
+它实现了只读 Mapping 接口，键与 ``BaZiCalculator.calculate`` 返回的字典相同，
+因此所有接受四柱字典的分析函数都能直接使用它。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Iterator, Tuple
+
+from .constants import TIANGAN, DIZHI, JIAZI
+
+if TYPE_CHECKING:
+    from ..dataset.schema import BaziChart
+
+PILLARS = ("year", "month", "day", "hour")
+# 编码字段顺序：年干、年支、月干、月支、日干、日支、时干、时支
+FIELDS = (
+    "year_stem", "year_branch",
+    "month_stem", "month_branch",
+    "day_stem", "day_branch",
+    "hour_stem", "hour_branch",
+)
+KEYS = PILLARS + FIELDS
+
+STEM_INDEX = {stem: i for i, stem in enumerate(TIANGAN)}
+BRANCH_INDEX = {branch: i for i, branch in enumerate(DIZHI)}
+
+
+class EncodedChart(Mapping):
+    """
+    四柱的紧凑整数表示。
+
+    ``pack`` 把 8 个序号按每个 4 位压成一个 32 位整数，可作为字典键或持久化；
+    ``from_dict``/``to_dict``、``from_model``/``to_model`` 与现有字典和 ``BaziChart`` 互转。
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        year_stem: int, year_branch: int,
+        month_stem: int, month_branch: int,
+        day_stem: int, day_branch: int,
+        hour_stem: int, hour_branch: int,
+    ) -> None:
+        self.year_stem = year_stem
+        self.year_branch = year_branch
+        self.month_stem = month_stem
+        self.month_branch = month_branch
+        self.day_stem = day_stem
+        self.day_branch = day_branch
+        self.hour_stem = hour_stem
+        self.hour_branch = hour_branch
+
+    @classmethod
+    def from_dict(cls, pillars: Mapping) -> "EncodedChart":
+        """由 ``calculate`` 风格的四柱字典构造。"""
+        if isinstance(pillars, EncodedChart):
+            return pillars
+        return cls(*(
+            (STEM_INDEX if field.endswith("_stem") else BRANCH_INDEX)[pillars[field]]
+            for field in FIELDS
+        ))
+
+    @classmethod
+    def from_model(cls, chart: "BaziChart") -> "EncodedChart":
+        """由 ``BaziChart`` 模型构造。"""
+        return cls(*(
+            (STEM_INDEX if field.endswith("_stem") else BRANCH_INDEX)[getattr(chart, field)]
+            for field in FIELDS
+        ))
+
+    @classmethod
+    def from_cycles(cls, year: int, month: int, day: int, hour: int) -> "EncodedChart":
+        """由四柱的六十甲子序号构造（如 ``calculate_batch`` 的输出）。"""
+        return cls(
+            year % 10, year % 12,
+            month % 10, month % 12,
+            day % 10, day % 12,
+            hour % 10, hour % 12,
+        )
+
+    @classmethod
+    def unpack(cls, packed: int) -> "EncodedChart":
+        """``pack`` 的逆运算。"""
+        return cls(*((packed >> (4 * i)) & 0xF for i in range(8)))
+
+    def pack(self) -> int:
+        """压缩为 32 位整数：第 i 个字段占第 4i 至 4i+3 位。"""
+        packed = 0
+        for i, value in enumerate(self.indices()):
+            packed |= value << (4 * i)
+        return packed
+
+    def indices(self) -> Tuple[int, ...]:
+        """8 个序号，顺序同 ``FIELDS``。"""
+        return (
+            self.year_stem, self.year_branch,
+            self.month_stem, self.month_branch,
+            self.day_stem, self.day_branch,
+            self.hour_stem, self.hour_branch,
+        )
+
+    def stems(self) -> Tuple[int, int, int, int]:
+        return self.year_stem, self.month_stem, self.day_stem, self.hour_stem
+
+    def branches(self) -> Tuple[int, int, int, int]:
+        return self.year_branch, self.month_branch, self.day_branch, self.hour_branch
+
+    def to_dict(self) -> dict:
+        """转为与 ``BaZiCalculator.calculate`` 相同的字典。"""
+        return {key: self[key] for key in KEYS}
+
+    def to_model(self) -> "BaziChart":
+        """转为 ``BaziChart`` 模型。"""
+        from ..dataset.schema import BaziChart
+
+        return BaziChart(**self.to_dict())
+
+    def __getitem__(self, key: str) -> str:
+        if key in PILLARS:
+            stem = getattr(self, f"{key}_stem")
+            branch = getattr(self, f"{key}_branch")
+            return JIAZI[(6 * stem - 5 * branch) % 60]
+        if key in FIELDS:
+            value = getattr(self, key)
+            return TIANGAN[value] if key.endswith("_stem") else DIZHI[value]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(KEYS)
+
+    def __len__(self) -> int:
+        return len(KEYS)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, EncodedChart):
+            return self.indices() == other.indices()
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self) -> int:
+        return self.pack()
+
+    def __repr__(self) -> str:
+        return f"EncodedChart({' '.join(self[p] for p in PILLARS)})"
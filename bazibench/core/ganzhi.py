@@ -0,0 +1,137 @@
+"""干支算术内核。
+
+日柱是儒略日数上的六十甲子循环，时柱由时辰地支与日干按五鼠遁推出，
+流年按年份循环，流月由年干按五虎遁推出，都无需构造历法对象。
+
+子时跨日有两种流派：
+
+- ``"late"``（分早晚子时，默认，同 lunar_python 流派2）：23:00-24:00 为晚子时，
+  日柱仍算当天，时干按次日日干起；
+- ``"early"``（子初换日，同 lunar_python 流派1）：23:00 起日柱即换为次日。
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Tuple
+
+import numpy as np
+
+from .constants import TIANGAN, WU_HU_DUN, WU_SHU_DUN
+
+ZI_HOUR_LATE = "late"
+ZI_HOUR_EARLY = "early"
+ZI_HOUR_SCHOOLS = (ZI_HOUR_LATE, ZI_HOUR_EARLY)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# 1970-01-01 的儒略日数；儒略日数 - 11 对 60 取余即为日柱序号
+_EPOCH_JDN = 2440588
+
+# 五鼠遁：日干序号 -> 子时天干序号
+_ZI_HOUR_STEM = tuple(TIANGAN.index(WU_SHU_DUN[stem]) for stem in TIANGAN)
+_ZI_HOUR_STEM_ARRAY = np.array(_ZI_HOUR_STEM, dtype=np.int64)
+# 五虎遁：年干序号 -> 寅月天干序号
+_YIN_MONTH_STEM = tuple(TIANGAN.index(WU_HU_DUN[stem]) for stem in TIANGAN)
+
+
+def _check_school(zi_school: str) -> None:
+    if zi_school not in ZI_HOUR_SCHOOLS:
+        raise ValueError(f"zi_school must be one of {ZI_HOUR_SCHOOLS}, got {zi_school!r}")
+
+
+def cycle_index(stem: int, branch: int) -> int:
+    """天干序号、地支序号 -> 六十甲子序号（两者需同阴阳）。"""
+    return (6 * stem - 5 * branch) % 60
+
+
+def day_cycle(jdn: int) -> int:
+    """儒略日数 -> 日柱六十甲子序号。"""
+    return (jdn - 11) % 60
+
+
+def epoch_day_cycle(days: int) -> int:
+    """1970-01-01 起算的日数 -> 日柱六十甲子序号。"""
+    return (days + _EPOCH_JDN - 11) % 60
+
+
+def hour_branch(hour: int) -> int:
+    """小时 (0-23) -> 时辰地支序号，23 点与 0 点同属子时。"""
+    return (hour + 1) // 2 % 12
+
+
+def hour_cycle(day_stem: int, branch: int) -> int:
+    """按五鼠遁由日干序号与时支序号求时柱六十甲子序号。"""
+    stem = (_ZI_HOUR_STEM[day_stem] + branch) % 10
+    return cycle_index(stem, branch)
+
+
+def year_cycle(year: int) -> int:
+    """年份 -> 流年六十甲子序号（1984 年为甲子）。"""
+    return (year - 4) % 60
+
+
+def month_cycle(year_stem: int, month: int) -> int:
+    """
+    按五虎遁求流月六十甲子序号。
+
+    Args:
+        year_stem: 年干序号
+        month: 干支月序，1 为寅月（立春起），12 为丑月
+
+    Returns:
+        int: 月柱六十甲子序号
+    """
+    branch = (month + 1) % 12
+    stem = (_YIN_MONTH_STEM[year_stem] + month - 1) % 10
+    return cycle_index(stem, branch)
+
+
+# 年干序号 -> 寅月至丑月 12 个流月的六十甲子序号
+MONTH_CYCLES = tuple(tuple(month_cycle(stem, month) for month in range(1, 13)) for stem in range(10))
+_MONTH_CYCLES_ARRAY = np.array(MONTH_CYCLES, dtype=np.uint8)
+
+
+def year_cycle_array(years: np.ndarray) -> np.ndarray:
+    """``year_cycle`` 的数组版本，返回 uint8 数组。"""
+    return ((np.asarray(years, dtype=np.int64) - 4) % 60).astype(np.uint8)
+
+
+def month_cycle_array(year_stems: np.ndarray) -> np.ndarray:
+    """年干序号数组 -> (N, 12) 流月六十甲子序号（寅月至丑月），查 ``MONTH_CYCLES`` 表。"""
+    return _MONTH_CYCLES_ARRAY[np.asarray(year_stems, dtype=np.intp)]
+
+
+def day_hour_cycles(days: int, hour: int, zi_school: str = ZI_HOUR_LATE) -> Tuple[int, int]:
+    """
+    计算日柱、时柱。
+
+    Args:
+        days: 真太阳时所在日期距 1970-01-01 的天数
+        hour: 真太阳时的小时 (0-23)
+        zi_school: 子时流派，``"late"`` 或 ``"early"``
+
+    Returns:
+        Tuple[int, int]: (日柱序号, 时柱序号)，均为六十甲子序号
+    """
+    _check_school(zi_school)
+    day = epoch_day_cycle(days)
+    next_day = (day + 1) % 60 if hour == 23 else day
+    if zi_school == ZI_HOUR_EARLY:
+        day = next_day
+    return day, hour_cycle(next_day % 10, hour_branch(hour))
+
+
+def day_hour_cycles_array(
+    days: np.ndarray, hours: np.ndarray, zi_school: str = ZI_HOUR_LATE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``day_hour_cycles`` 的数组版本。"""
+    _check_school(zi_school)
+    days = np.asarray(days, dtype=np.int64)
+    hours = np.asarray(hours, dtype=np.int64)
+    day = (days + _EPOCH_JDN - 11) % 60
+    next_day = (day + (hours == 23)) % 60
+    if zi_school == ZI_HOUR_EARLY:
+        day = next_day
+    branch = (hours + 1) // 2 % 12
+    stem = (_ZI_HOUR_STEM_ARRAY[next_day % 10] + branch) % 10
+    return day, (6 * stem - 5 * branch) % 60
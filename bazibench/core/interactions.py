@@ -1,37 +1,131 @@
-"""刑冲合害分析。"""
+"""刑冲合害分析。
+
+地支集合编码为 12 位掩码（第 i 位对应 ``DIZHI[i]``），每条规则预编译为同样的掩码，
+匹配即 ``mask & rule == rule``。全部 4096 种集合的结果在首次使用时一次建表，
+之后每次分析只是一次查表；自刑另由“出现两次以上”的地支掩码决定。
+"""
 
 from __future__ import annotations
 
-from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from .constants import DIZHI, LIU_HE, LIU_CHONG, SAN_HE, XING, SELF_XING, SAN_HUI, LIU_HAI
+from .encoding import BRANCH_INDEX
+
+# 结果字段与对应规则，顺序即输出字典的键顺序（self_xing 单独处理）
+_RULES = {
+    "liuhe": LIU_HE,
+    "liuchong": LIU_CHONG,
+    "sanhe": SAN_HE,
+    "sanhui": SAN_HUI,
+    "xing": XING,
+    "liuhai": LIU_HAI,
+}
+FIELDS = ("liuhe", "liuchong", "sanhe", "sanhui", "xing", "self_xing", "liuhai")
+
+
+def branch_mask(branches: Iterable[int]) -> int:
+    """地支序号序列 -> 12 位集合掩码。"""
+    mask = 0
+    for b in branches:
+        mask |= 1 << b
+    return mask
+
+
+def branch_masks(branches: Iterable[int]) -> Tuple[int, int]:
+    """地支序号序列 -> (出现过的地支掩码, 出现两次及以上的地支掩码)。"""
+    seen = dup = 0
+    for b in branches:
+        bit = 1 << b
+        dup |= seen & bit
+        seen |= bit
+    return seen, dup
+
+
+RULE_MASKS = {
+    field: tuple((branch_mask(BRANCH_INDEX[b] for b in rule), rule) for rule in rules)
+    for field, rules in _RULES.items()
+}
+SELF_XING_MASKS = tuple((1 << BRANCH_INDEX[b], b) for b in SELF_XING)
+
 
-from .constants import LIU_HE, LIU_CHONG, SAN_HE, XING, SELF_XING, SAN_HUI, LIU_HAI
+@lru_cache(maxsize=None)
+def interaction_table() -> Tuple[Tuple[Tuple[tuple, ...], ...], ...]:
+    """
+    4096 项结果表：``interaction_table()[mask]`` 为各规则字段（顺序同 ``_RULES``）命中的规则元组。
 
+    Returns:
+        tuple: 以集合掩码为下标的结果表
+    """
+    return tuple(
+        tuple(
+            tuple(rule for rule_mask, rule in RULE_MASKS[field] if mask & rule_mask == rule_mask)
+            for field in _RULES
+        )
+        for mask in range(1 << len(DIZHI))
+    )
 
-def analyze_interactions(branches: list[str]) -> dict:
-    branch_set = set(branches)
-    counts = Counter(branches)
 
-    liuhe = [pair for pair in LIU_HE if set(pair).issubset(branch_set)]
-    liuchong = [pair for pair in LIU_CHONG if set(pair).issubset(branch_set)]
-    sanhe = [group for group in SAN_HE if set(group).issubset(branch_set)]
-    sanhui = [group for group in SAN_HUI if set(group).issubset(branch_set)]
-    
-    xing = []
-    for group in XING:
-        if set(group).issubset(branch_set):
-            xing.append(group)
-        elif len(group) == 2 and set(group).issubset(branch_set):
-            xing.append(group)
+def interactions_from_masks(mask: int, dup_mask: int = 0) -> dict:
+    """
+    由地支集合掩码与重复掩码查表得出刑冲合害。
 
-    self_xing = [b for b in SELF_XING if counts[b] >= 2]
-    liuhai = [pair for pair in LIU_HAI if set(pair).issubset(branch_set)]
+    Args:
+        mask: 出现过的地支掩码
+        dup_mask: 出现两次及以上的地支掩码（决定自刑）
 
+    Returns:
+        dict: 与 ``analyze_interactions`` 相同的结构
+    """
+    liuhe, liuchong, sanhe, sanhui, xing, liuhai = interaction_table()[mask]
     return {
-        "liuhe": liuhe,
-        "liuchong": liuchong,
-        "sanhe": sanhe,
-        "sanhui": sanhui,
-        "xing": xing,
-        "self_xing": self_xing,
-        "liuhai": liuhai,
+        "liuhe": list(liuhe),
+        "liuchong": list(liuchong),
+        "sanhe": list(sanhe),
+        "sanhui": list(sanhui),
+        "xing": list(xing),
+        "self_xing": [b for bit, b in SELF_XING_MASKS if dup_mask & bit],
+        "liuhai": list(liuhai),
     }
+
+
+@lru_cache(maxsize=None)
+def period_interactions(mask: int, branch: int) -> dict:
+    """
+    运限（大运、流年、流月）地支与原局的刑冲合害：只保留包含该地支的规则。
+
+    结果按 (原局掩码, 地支) 缓存并共享，值为元组，调用方不应修改。
+
+    Args:
+        mask: 原局地支集合掩码
+        branch: 运限地支序号
+
+    Returns:
+        dict: 键同 ``analyze_interactions``
+    """
+    bit = 1 << branch
+    combined = mask | bit
+    result = {
+        field: tuple(
+            rule for rule_mask, rule in RULE_MASKS[field]
+            if rule_mask & bit and combined & rule_mask == rule_mask
+        )
+        for field in _RULES
+    }
+    # 运限地支与原局某支相同即成自刑
+    result["self_xing"] = tuple(b for b_bit, b in SELF_XING_MASKS if b_bit == bit and mask & bit)
+    return {field: result[field] for field in FIELDS}
+
+
+def analyze_interactions(branches: List[str]) -> dict:
+    """
+    分析一组地支间的刑冲合害，地支个数不限（如原局四支再加大运、流年支）。
+
+    Args:
+        branches: 地支列表
+
+    Returns:
+        dict: 六合、六冲、三合、三会、三刑、自刑、六害命中的规则
+    """
+    return interactions_from_masks(*branch_masks(BRANCH_INDEX[b] for b in branches))
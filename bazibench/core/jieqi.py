@@ -0,0 +1,170 @@
+"""节气时刻表。
+
+按 ``lunar_python`` 的寿星算法一次性求出各年 24 节气的交接时刻（北京时间），
+并折算为朴素本地时间的 Unix 秒数，供月柱/年柱按区间二分查找使用。
+完整的 1800-2200 年表首次构建后缓存到磁盘，之后直接加载。
+"""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+from typing import Tuple, Union
+
+import numpy as np
+from lunar_python import LunarYear, Solar
+
+from ..utils.cache import get_cache_dir
+
+# 表内节气顺序：每年自小寒起，至冬至止；偶数下标为“节”，奇数下标为“气”
+JIEQI_NAMES = [
+    "小寒", "大寒", "立春", "雨水", "惊蛰", "春分",
+    "清明", "谷雨", "立夏", "小满", "芒种", "夏至",
+    "小暑", "大暑", "立秋", "处暑", "白露", "秋分",
+    "寒露", "霜降", "立冬", "小雪", "大雪", "冬至",
+]
+
+JIEQI_START_YEAR = 1800
+JIEQI_END_YEAR = 2200
+
+# lunar_python 节气表中当年小寒所在的下标（0为上年大雪，1为上年冬至）
+_LUNAR_XIAO_HAN_INDEX = 2
+# 甲子年（1984）立春所起的丙寅月在六十甲子中的序号
+_BASE_MONTH_CYCLE = 2
+_CACHE_VERSION = 1
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _solar_to_seconds(solar: Solar) -> int:
+    """Solar -> 朴素本地时间的 Unix 秒数（日期越界时按天顺延）。"""
+    days = date(solar.getYear(), solar.getMonth(), 1).toordinal() + solar.getDay() - 1 - _EPOCH_ORDINAL
+    return days * 86400 + solar.getHour() * 3600 + solar.getMinute() * 60 + solar.getSecond()
+
+
+def jieqi_table(start_year: int, end_year: int) -> np.ndarray:
+    """
+    计算 [start_year, end_year] 内全部节气时刻。
+
+    Args:
+        start_year: 起始公历年
+        end_year: 结束公历年（含）
+
+    Returns:
+        np.ndarray: int64 数组，长度为 24 * 年数，第 ``(year - start_year) * 24 + k``
+        项为该年第 k 个节气（见 ``JIEQI_NAMES``）的时刻，精度与 lunar_python 一致到秒。
+    """
+    instants = []
+    for year in range(start_year, end_year + 1):
+        julian_days = LunarYear(year).getJieQiJulianDays()
+        for k in range(24):
+            jd = julian_days[_LUNAR_XIAO_HAN_INDEX + k]
+            instants.append(_solar_to_seconds(Solar.fromJulianDay(jd)))
+    return np.array(instants, dtype=np.int64)
+
+
+Seconds = Union[int, np.ndarray]
+
+
+class JieQiIndex:
+    """
+    有序节气时刻索引。
+
+    时刻均为朴素本地时间（真太阳时）的 Unix 秒数。``locate`` 返回时刻所处的节气下标，
+    该下标整除 2 即为所处的“节令”序号，年柱、月柱都只取决于它。
+    """
+
+    def __init__(self, instants: np.ndarray, start_year: int) -> None:
+        if len(instants) % 24:
+            raise ValueError("instants must contain 24 solar terms per year")
+        self.instants = np.asarray(instants, dtype=np.int64)
+        self.instants.setflags(write=False)
+        self.start_year = start_year
+        self.end_year = start_year + len(instants) // 24 - 1
+        self._instants = self.instants.tolist()
+        self._lichun_1984 = (1984 - start_year) * 12 + 1
+
+    def __len__(self) -> int:
+        return len(self._instants)
+
+    def contains(self, seconds: int) -> bool:
+        """时刻是否落在索引可解析的区间内。"""
+        return self._instants[0] <= seconds < self._instants[-1]
+
+    def locate(self, seconds: int) -> int:
+        """返回 ``seconds`` 所处节气的下标（该节气交接时刻 <= seconds）。"""
+        index = bisect_right(self._instants, seconds) - 1
+        if index < 0 or index >= len(self._instants) - 1:
+            raise ValueError(f"time out of solar term range {self.start_year}-{self.end_year}")
+        return index
+
+    def locate_array(self, seconds: np.ndarray) -> np.ndarray:
+        """``locate`` 的数组版本。"""
+        seconds = np.asarray(seconds, dtype=np.int64)
+        if seconds.size and (seconds.min() < self._instants[0] or seconds.max() >= self._instants[-1]):
+            raise ValueError(f"time out of solar term range {self.start_year}-{self.end_year}")
+        return np.searchsorted(self.instants, seconds, side="right") - 1
+
+    def instant(self, index: int) -> int:
+        """第 ``index`` 个节气的交接时刻。"""
+        return self._instants[index]
+
+    def term_name(self, index: int) -> str:
+        return JIEQI_NAMES[index % 24]
+
+    def year_cycle(self, jie: Seconds) -> Seconds:
+        """节令序号 -> 年柱六十甲子序号（以立春为界）。"""
+        return (self.start_year + (jie - 1) // 12 - 4) % 60
+
+    def month_cycle(self, jie: Seconds) -> Seconds:
+        """节令序号 -> 月柱六十甲子序号。"""
+        return (jie - self._lichun_1984 + _BASE_MONTH_CYCLE) % 60
+
+    def year_month(self, seconds: int) -> Tuple[int, int]:
+        """
+        解析年柱、月柱。
+
+        Returns:
+            Tuple[int, int]: (年柱序号, 月柱序号)，均为六十甲子序号
+        """
+        jie = self.locate(seconds) // 2
+        return self.year_cycle(jie), self.month_cycle(jie)
+
+    def year_month_array(self, seconds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """``year_month`` 的数组版本。"""
+        jie = self.locate_array(seconds) // 2
+        return self.year_cycle(jie), self.month_cycle(jie)
+
+
+@lru_cache(maxsize=None)
+def load_jieqi_index() -> JieQiIndex:
+    """
+    加载 1800-2200 年节气索引。
+
+    首次调用时计算并写入缓存目录，此后进程内单例、跨进程从磁盘读取；
+    缓存目录不可写时不落盘，直接使用算好的表。
+    """
+    cache_path = get_cache_dir() / f"jieqi_{JIEQI_START_YEAR}_{JIEQI_END_YEAR}_v{_CACHE_VERSION}.npy"
+    instants = None
+    if cache_path.exists():
+        try:
+            instants = np.load(cache_path)
+        except (OSError, ValueError):
+            instants = None
+    expected = (JIEQI_END_YEAR - JIEQI_START_YEAR + 1) * 24
+    if instants is None or instants.shape != (expected,):
+        instants = jieqi_table(JIEQI_START_YEAR, JIEQI_END_YEAR)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, instants)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # 缓存目录不可写时只用内存中的表，下次进程再重算
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+    return JieQiIndex(instants, JIEQI_START_YEAR)
@@ -0,0 +1,238 @@
+"""以八字为键的分析结果缓存。
+
+除大运外，``analyze_chart`` 的全部结果只取决于八个字，而实际出现的八字不过几十万种。
+``AnalysisMemo`` 以 ``EncodedChart.pack()`` 的整数为键，进程内用有界 LRU，
+可选再接一个 SQLite 持久库；``prewarm_range`` 枚举某一年份范围内出现过的全部八字
+（取自干支历图谱的区间表）并预先算好写入。
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Union
+
+import numpy as np
+
+from .analysis import analyze_chart
+from .constants import SHENG, KE
+from .encoding import EncodedChart
+from ..utils.cache import get_cache_dir
+
+# 分析逻辑改变输出时递增，持久库中旧版本的结果会被整体丢弃
+ANALYSIS_VERSION = 2
+
+_TUPLE_FIELDS = ("liuhe", "liuchong", "sanhe", "sanhui", "xing", "liuhai")
+
+
+def default_memo_path() -> Path:
+    """缓存目录下的默认持久库路径。"""
+    return get_cache_dir() / "analysis_memo.sqlite"
+
+
+def _encode(result: dict) -> str:
+    # 五行生克表对所有八字相同，不入库
+    wuxing = {k: v for k, v in result["wuxing"].items() if k not in ("sheng", "ke")}
+    return json.dumps({**result, "wuxing": wuxing}, ensure_ascii=False, separators=(",", ":"))
+
+
+def _decode(text: str) -> dict:
+    result = json.loads(text)
+    result["wuxing"]["sheng"] = SHENG.copy()
+    result["wuxing"]["ke"] = KE.copy()
+    # JSON 没有元组，恢复刑冲合害规则的元组形式
+    interactions = result.get("interactions")
+    if interactions is not None:
+        for field in _TUPLE_FIELDS:
+            interactions[field] = [tuple(rule) for rule in interactions[field]]
+    return result
+
+
+def packed_charts_from_cycles(cycles: np.ndarray) -> np.ndarray:
+    """(N, 4) 六十甲子序号（年、月、日、时）-> 去重后的 ``pack()`` 整数数组。"""
+    cycles = np.asarray(cycles, dtype=np.int64).reshape(-1, 4)
+    packed = np.zeros(len(cycles), dtype=np.int64)
+    for i in range(4):
+        packed |= (cycles[:, i] % 10) << (8 * i)
+        packed |= (cycles[:, i] % 12) << (8 * i + 4)
+    return np.unique(packed)
+
+
+class AnalysisMemo:
+    """
+    八字分析结果的两级缓存。
+
+    返回的结果字典在多次调用间共享，调用方不应修改。
+    """
+
+    def __init__(self, maxsize: int = 65536, path: Optional[Union[str, Path]] = None, commit_every: int = 256) -> None:
+        """
+        Args:
+            maxsize: 进程内 LRU 容量，0 表示不在内存中缓存
+            path: SQLite 持久库路径，None 表示只用内存
+            commit_every: 持久库每新写入这么多条结果提交一次，未 ``close`` 的进程至多丢失最后一批
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        if commit_every < 1:
+            raise ValueError("commit_every must be positive")
+        self.maxsize = maxsize
+        self.commit_every = commit_every
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[int, dict]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self._open_db()
+
+    def _open_db(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(str(self.path))
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        db.execute("CREATE TABLE IF NOT EXISTS analysis (chart INTEGER PRIMARY KEY, result TEXT NOT NULL)")
+        row = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != ANALYSIS_VERSION:
+            db.execute("DELETE FROM analysis")
+            db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(ANALYSIS_VERSION),))
+        db.commit()
+        self._db = db
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __enter__(self) -> "AnalysisMemo":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """提交并关闭持久库。"""
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+            self._pending = 0
+
+    def flush(self) -> None:
+        """提交尚未写入持久库的结果。"""
+        if self._db is not None:
+            self._db.commit()
+            self._pending = 0
+
+    def clear(self) -> None:
+        """清空进程内缓存与命中统计（不影响持久库）。"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def cache_info(self) -> Dict[str, int]:
+        """返回命中、未命中次数及当前容量。"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "maxsize": self.maxsize,
+        }
+
+    def _remember(self, key: int, result: dict) -> None:
+        if self.maxsize:
+            self._cache[key] = result
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def get(self, packed: int) -> dict:
+        """
+        按 ``pack()`` 整数取分析结果，依次查内存、持久库，都未命中则计算并写回；
+        写回每满 ``commit_every`` 条提交一次，其余在 ``flush``/``close`` 时提交。
+
+        Args:
+            packed: ``EncodedChart.pack()`` 的结果
+
+        Returns:
+            dict: 与 ``analyze_chart`` 相同的结果
+        """
+        result = self._cache.get(packed)
+        if result is not None:
+            self.hits += 1
+            self._cache.move_to_end(packed)
+            return result
+
+        if self._db is not None:
+            row = self._db.execute("SELECT result FROM analysis WHERE chart = ?", (packed,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                result = _decode(row[0])
+                self._remember(packed, result)
+                return result
+
+        self.misses += 1
+        result = analyze_chart(EncodedChart.unpack(packed))
+        self._remember(packed, result)
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO analysis VALUES (?, ?)",
+                (packed, _encode(result)),
+            )
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self.flush()
+        return result
+
+    def analyze(self, chart: Mapping) -> dict:
+        """``analyze_chart`` 的缓存版本，接受四柱字典或 ``EncodedChart``。"""
+        return self.get(EncodedChart.from_dict(chart).pack())
+
+    def prewarm(self, packed_charts: Iterable[int]) -> int:
+        """
+        预先计算一批八字。有持久库时只补算库中没有的，并写入库；否则装入内存缓存。
+
+        Args:
+            packed_charts: ``pack()`` 整数序列
+
+        Returns:
+            int: 新计算的八字数
+        """
+        keys = [int(k) for k in packed_charts]
+        if self._db is None:
+            computed = 0
+            for key in keys:
+                if key not in self._cache:
+                    self._remember(key, analyze_chart(EncodedChart.unpack(key)))
+                    computed += 1
+            return computed
+
+        known = {row[0] for row in self._db.execute("SELECT chart FROM analysis")}
+        rows = [
+            (key, _encode(analyze_chart(EncodedChart.unpack(key))))
+            for key in keys if key not in known
+        ]
+        self._db.executemany("INSERT OR REPLACE INTO analysis VALUES (?, ?)", rows)
+        self.flush()
+        return len(rows)
+
+    def prewarm_range(
+        self,
+        start_year: int,
+        end_year: int,
+        longitude: float = 120.0,
+        utc_offset: float = 8.0,
+        zi_school: str = "late",
+    ) -> int:
+        """
+        枚举 [start_year, end_year] 内（给定地点与子时流派）出现的全部八字并预计算。
+
+        Returns:
+            int: 新计算的八字数
+        """
+        from .atlas import load_atlas
+
+        with load_atlas(start_year, end_year, longitude, utc_offset, zi_school) as atlas:
+            cycles = np.frombuffer(atlas.codes, dtype=np.uint8)
+            packed = packed_charts_from_cycles(cycles)
+            del cycles
+        return self.prewarm(packed)
@@ -1,29 +1,241 @@
+"""格局判定。
 
-from typing import Dict, List, Any
+正格取月令：月支藏干透出年、月、时干者优先（本气、中气、余气依次），都不透则取本气，
+以其对日干的十神立格；本气为比劫时取建禄格、阳刃格（阳干）或月劫格（阴干）。
+特殊格局依次检查化气格、专旺格、从格，成立时取代正格。
 
-def analyze_pattern(chart: Dict[str, Any], ten_gods: Dict[str, Any], strength: Dict[str, Any]) -> Dict[str, Any]:
+所有判定都在导入时编成查找表：
+
+- ``PROTRUSION[month_branch * 1024 + stem_mask]``：月支各藏干是否透出（3 位掩码），
+  ``stem_mask`` 为年、月、时干的 10 位集合掩码；
+- ``NORMAL_PATTERN[(day_stem * 12 + month_branch) * 8 + protrusion]``：正格结果；
+- ``HUA_ELEMENT[day_stem * 10 + stem]``：日干与该干相合所化五行（不合为 -1）；
+- ``SUB_PATTERNS[god_mask]``：年、月、时干十神组合对应的兼格。
+
+一次判定只需几次查表和对七个字的五行关系计数。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from .constants import TIANGAN, DIZHI, WUXING, TIANGAN_HE
+from .tables import (
+    RELATIONS,
+    SAME,
+    SUPPORTED,
+    DRAIN,
+    CONTROLLED,
+    CONTROLS,
+    STEM_ELEMENT,
+    STEM_YANG,
+    BRANCH_ELEMENT,
+    ELEMENT_RELATION,
+    TEN_GOD_NAMES,
+    TEN_GOD_TABLE,
+    HIDDEN_STEMS,
+    stem_indices,
+    branch_indices,
+)
+
+_TEN_GOD_PATTERNS = ("建禄格", None, "食神格", "伤官格", "偏财格", "正财格", "七杀格", "正官格", "偏印格", "正印格")
+_ZHUANWANG = ("曲直格", "炎上格", "稼穑格", "从革格", "润下格")
+_CONG = {CONTROLS: "从财格", CONTROLLED: "从杀格", DRAIN: "从儿格"}
+_CONG_SOURCE = {CONTROLS: "财星", CONTROLLED: "官杀", DRAIN: "食伤"}
+
+PATTERN_NAMES = (
+    "建禄格", "阳刃格", "月劫格",
+    "食神格", "伤官格", "偏财格", "正财格", "七杀格", "正官格", "偏印格", "正印格",
+    *_ZHUANWANG,
+    "从财格", "从杀格", "从儿格", "从势格",
+    *(f"化{e}格" for e in WUXING),
+)
+PATTERN_INDEX = {name: i for i, name in enumerate(PATTERN_NAMES)}
+CONG_SHI = PATTERN_INDEX["从势格"]
+
+
+def _normal_pattern(day_stem: int, month_branch: int, protrusion: int) -> Tuple[int, str]:
+    hidden = HIDDEN_STEMS[month_branch]
+    gods = [TEN_GOD_TABLE[day_stem * 10 + stem] for stem in hidden]
+    branch = DIZHI[month_branch]
+    # 透出的非比劫藏干优先，依本气、中气、余气顺序
+    for k, god in enumerate(gods):
+        if protrusion >> k & 1 and god > 1:
+            name = _TEN_GOD_PATTERNS[god]
+            stem = TIANGAN[hidden[k]]
+            return PATTERN_INDEX[name], f"月令{branch}藏{stem}透出天干，以{TEN_GOD_NAMES[god]}立格，取{name}。"
+
+    god = gods[0]
+    stem = TIANGAN[hidden[0]]
+    if god == 1:
+        name = "阳刃格" if STEM_YANG[day_stem] else "月劫格"
+    else:
+        name = _TEN_GOD_PATTERNS[god]
+    if god <= 1:
+        return PATTERN_INDEX[name], f"月令{branch}本气{stem}为日主{TEN_GOD_NAMES[god]}，取{name}。"
+    return PATTERN_INDEX[name], f"月令{branch}本气{stem}不透，以本气{TEN_GOD_NAMES[god]}立格，取{name}。"
+
+
+PROTRUSION = tuple(
+    sum(1 << k for k, stem in enumerate(HIDDEN_STEMS[branch]) if stem_mask >> stem & 1)
+    for branch in range(12)
+    for stem_mask in range(1024)
+)
+
+_NORMAL = tuple(
+    _normal_pattern(day_stem, month_branch, protrusion)
+    for day_stem in range(10)
+    for month_branch in range(12)
+    for protrusion in range(8)
+)
+NORMAL_PATTERN = tuple(code for code, _ in _NORMAL)
+_NORMAL_DESCRIPTION = tuple(description for _, description in _NORMAL)
+
+_HE = {
+    frozenset((TIANGAN.index(a), TIANGAN.index(b))): WUXING.index(element)
+    for a, b, element in TIANGAN_HE
+}
+HUA_ELEMENT = tuple(
+    _HE.get(frozenset((day_stem, stem)), -1) for day_stem in range(10) for stem in range(10)
+)
+
+# 兼格：年、月、时干十神同时出现两类时成立，(十神组 A, 十神组 B, 名称)
+_SUB_RULES = (
+    ((6, 7), (8, 9), "官印相生"),
+    ((2,), (6,), "食神制杀"),
+    ((3,), (8, 9), "伤官配印"),
+    ((3,), (7,), "伤官见官"),
+    ((4, 5), (7,), "财官双美"),
+    ((2,), (4, 5), "食神生财"),
+    ((7,), (6,), "官杀混杂"),
+    ((8,), (2,), "枭神夺食"),
+)
+SUB_PATTERNS = tuple(
+    tuple(
+        name
+        for a, b, name in _SUB_RULES
+        if any(god_mask >> g & 1 for g in a) and any(god_mask >> g & 1 for g in b)
+    )
+    for god_mask in range(1024)
+)
+
+
+def _relation_counts(day_element: int, stems: Sequence[int], branches: Sequence[int]) -> list:
+    """日干以外七个字（三干及四支本气）的五行相对日主的关系计数，下标同 ``RELATIONS``。"""
+    row = day_element * 5
+    counts = [0] * len(RELATIONS)
+    for i, stem in enumerate(stems):
+        if i != 2:
+            counts[ELEMENT_RELATION[row + STEM_ELEMENT[stem]]] += 1
+    for branch in branches:
+        counts[ELEMENT_RELATION[row + BRANCH_ELEMENT[branch]]] += 1
+    return counts
+
+
+def _hua(stems: Sequence[int], month_branch: int) -> Tuple[int, int]:
+    """化气格：(所化五行, 合干位置)，不成立返回 (-1, -1)。"""
+    day_stem = stems[2]
+    month_hua = HUA_ELEMENT[day_stem * 10 + stems[1]]
+    hour_hua = HUA_ELEMENT[day_stem * 10 + stems[3]]
+    # 日干须与月干或时干之一相合（两干争合不化），且化神当令
+    if (month_hua >= 0) == (hour_hua >= 0):
+        return -1, -1
+    element, partner = (month_hua, 1) if month_hua >= 0 else (hour_hua, 3)
+    if BRANCH_ELEMENT[month_branch] != element:
+        return -1, -1
+    # 合干以外的年、月、时干中不能有克化神者
+    for i in (0, 1, 3):
+        if i != partner and ELEMENT_RELATION[element * 5 + STEM_ELEMENT[stems[i]]] == CONTROLLED:
+            return -1, -1
+    return element, partner
+
+
+def special_pattern(stems: Sequence[int], branches: Sequence[int]) -> Tuple[int, Optional[str]]:
+    """
+    判定化气格、专旺格、从格。
+
+    Args:
+        stems: 年、月、日、时干序号
+        branches: 年、月、日、时支序号
+
+    Returns:
+        tuple: (``PATTERN_NAMES`` 下标, 描述)，不成立时为 (-1, None)
+    """
+    element, partner = _hua(stems, branches[1])
+    if element >= 0:
+        name = f"化{WUXING[element]}格"
+        return PATTERN_INDEX[name], (
+            f"日干{TIANGAN[stems[2]]}与{TIANGAN[stems[partner]]}相合，化神{WUXING[element]}当令且无克制，成{name}。"
+        )
+
+    day_element = STEM_ELEMENT[stems[2]]
+    counts = _relation_counts(day_element, stems, branches)
+    month_relation = ELEMENT_RELATION[day_element * 5 + BRANCH_ELEMENT[branches[1]]]
+    # 专旺：日主得令，比劫为主、印星相辅，全局不见官杀
+    if (
+        month_relation == SAME
+        and counts[SAME] >= 4
+        and counts[SAME] + counts[SUPPORTED] >= 6
+        and counts[CONTROLLED] == 0
+    ):
+        name = _ZHUANWANG[day_element]
+        return PATTERN_INDEX[name], f"日主{WUXING[day_element]}得令，一行专旺而无官杀，成{name}。"
+
+    # 从格：日主不得比劫、印星任何生扶
+    if counts[SAME] + counts[SUPPORTED] == 0:
+        dominant = max((DRAIN, CONTROLS, CONTROLLED), key=counts.__getitem__)
+        if counts[dominant] >= 4:
+            name = _CONG[dominant]
+            return PATTERN_INDEX[name], f"日主无根无助，{_CONG_SOURCE[dominant]}当权，弃命相从，成{name}。"
+        return CONG_SHI, "日主无根无助，财官食伤并见，从其势，成从势格。"
+
+    return -1, None
+
+
+def pattern_from_indices(stems: Sequence[int], branches: Sequence[int]) -> Dict[str, Any]:
     """
-    Analyze the pattern (格局) of the Bazi chart.
-    This is a simplified implementation focusing on the Ten Gods of the Month Branch.
+    由四干、四支序号判定格局。
+
+    Args:
+        stems: 年、月、日、时干序号
+        branches: 年、月、日、时支序号
+
+    Returns:
+        dict: main_pattern, sub_patterns, description
     """
-    month_branch = chart["month_branch"]
-    day_stem = chart["day_stem"]
-    
-    # Get the main Qi (Hidden Stem) of the Month Branch to determine the pattern
-    # Simplified logic: use the month branch directly if possible, or look up hidden stems
-    # For now, we return a placeholder or basic logic
-    
-    main_pattern = "普通格局"
-    sub_patterns = []
-    description = "格局判定需要综合月令本气与透干情况。"
-    
-    # TODO: Implement detailed pattern recognition logic
-    # 1. Determine the dominant hidden stem in Month Branch
-    # 2. Check if it protrudes in Heaven Stems
-    # 3. Check for special patterns (Cong, Hua, etc.)
-    
+    day_stem = stems[2]
+    month_branch = branches[1]
+    row = day_stem * 10
+    stem_mask = 1 << stems[0] | 1 << stems[1] | 1 << stems[3]
+    god_mask = 1 << TEN_GOD_TABLE[row + stems[0]] | 1 << TEN_GOD_TABLE[row + stems[1]] | 1 << TEN_GOD_TABLE[row + stems[3]]
+
+    code, description = special_pattern(stems, branches)
+    if code < 0:
+        key = (day_stem * 12 + month_branch) * 8 + PROTRUSION[month_branch * 1024 + stem_mask]
+        code = NORMAL_PATTERN[key]
+        description = _NORMAL_DESCRIPTION[key]
+
     return {
-        "main_pattern": main_pattern,
-        "sub_patterns": sub_patterns,
-        "description": description
+        "main_pattern": PATTERN_NAMES[code],
+        "sub_patterns": list(SUB_PATTERNS[god_mask]),
+        "description": description,
     }
+
+
+def analyze_pattern(
+    chart: Mapping[str, Any],
+    ten_gods: Optional[Dict[str, Any]] = None,
+    strength: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    判定八字格局。
+
+    Args:
+        chart: 四柱字典或 ``EncodedChart``
+        ten_gods: 兼容旧接口，不再使用
+        strength: 兼容旧接口，不再使用
+
+    Returns:
+        dict: main_pattern（主格）, sub_patterns（兼格）, description（描述）
+    """
+    return pattern_from_indices(stem_indices(chart), branch_indices(chart))
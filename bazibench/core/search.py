@@ -0,0 +1,122 @@
+"""反查八字：由四柱（或其中几柱）找出对应的全部出生时间区间。
+
+以干支历图谱的区间表为底，把每个区间的四柱序号编成整数键，排序后得到倒排索引，
+查询只是一次 ``searchsorted``。只给出部分柱（如日柱 + 时柱）时，按所给柱的组合
+另建二级索引（首次使用时构建并缓存），结果中首尾相接的区间会合并。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from .atlas import CalendarAtlas, load_atlas
+from .constants import JIAZI
+from .encoding import PILLARS
+
+_EPOCH = datetime(1970, 1, 1)
+
+Pillar = Union[str, int, None]
+
+_JIAZI_INDEX = {ganzhi: i for i, ganzhi in enumerate(JIAZI)}
+
+
+def _cycle(value: Union[str, int]) -> int:
+    if isinstance(value, str):
+        try:
+            return _JIAZI_INDEX[value]
+        except KeyError:
+            raise ValueError(f"not a sexagenary pillar: {value!r}") from None
+    if not 0 <= value < 60:
+        raise ValueError(f"pillar cycle index must be in [0, 60), got {value}")
+    return int(value)
+
+
+class ChartSearchIndex:
+    """
+    四柱 -> 时间区间的倒排索引。
+
+    时间均为图谱所在地的钟表时间；区间为左闭右开 ``[start, end)``。
+    """
+
+    def __init__(self, atlas: CalendarAtlas) -> None:
+        self.atlas = atlas
+        self._codes = np.frombuffer(atlas.codes, dtype=np.uint8).reshape(-1, 4).astype(np.int64)
+        # 复制一份，不占住图谱的 mmap 导出，图谱仍可关闭
+        self._starts = np.array(atlas.starts, dtype=np.int64)
+        # 所给柱的位掩码（年=1、月=2、日=4、时=8）-> (排序后的键, 区间下标)
+        self._indexes: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _index(self, selector: int) -> Tuple[np.ndarray, np.ndarray]:
+        index = self._indexes.get(selector)
+        if index is None:
+            keys = np.zeros(len(self._codes), dtype=np.int64)
+            for i in range(4):
+                if selector >> i & 1:
+                    keys = keys * 60 + self._codes[:, i]
+            order = np.argsort(keys, kind="stable").astype(np.int32)
+            index = (keys[order], order)
+            self._indexes[selector] = index
+        return index
+
+    def search_seconds(
+        self, year: Pillar = None, month: Pillar = None, day: Pillar = None, hour: Pillar = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        查找给定柱对应的全部区间。
+
+        Args:
+            year, month, day, hour: 干支字符串或六十甲子序号，None 表示不限
+
+        Returns:
+            tuple: (starts, ends) 两个 int64 数组，钟表时间 Unix 秒，按时间排序，相邻区间已合并
+        """
+        selector = 0
+        key = 0
+        for i, value in enumerate((year, month, day, hour)):
+            if value is not None:
+                selector |= 1 << i
+                key = key * 60 + _cycle(value)
+        if not selector:
+            raise ValueError(f"at least one of {PILLARS} is required")
+
+        keys, order = self._index(selector)
+        lo = keys.searchsorted(key)
+        hi = keys.searchsorted(key + 1)
+        positions = np.sort(order[lo:hi])
+        starts = self._starts[positions]
+        ends = self._starts[positions + 1]
+        if len(positions) > 1:
+            # 合并首尾相接的区间
+            keep = np.ones(len(positions), dtype=bool)
+            keep[1:] = starts[1:] != ends[:-1]
+            starts = starts[keep]
+            ends = ends[np.append(keep[1:], True)]
+        return starts, ends
+
+    def search(
+        self, year: Pillar = None, month: Pillar = None, day: Pillar = None, hour: Pillar = None
+    ) -> List[Tuple[datetime, datetime]]:
+        """同 ``search_seconds``，返回 (start, end) datetime 列表。"""
+        starts, ends = self.search_seconds(year, month, day, hour)
+        return [
+            (_EPOCH + timedelta(seconds=int(s)), _EPOCH + timedelta(seconds=int(e)))
+            for s, e in zip(starts, ends)
+        ]
+
+    def count(self, year: Pillar = None, month: Pillar = None, day: Pillar = None, hour: Pillar = None) -> int:
+        """给定柱在图谱范围内出现的区间数（合并后）。"""
+        return len(self.search_seconds(year, month, day, hour)[0])
+
+
+def load_search_index(
+    start_year: int = 1900,
+    end_year: int = 2100,
+    longitude: float = 120.0,
+    utc_offset: float = 8.0,
+    zi_school: str = "late",
+) -> ChartSearchIndex:
+    """基于缓存目录中的图谱（不存在时先构建）创建反查索引。"""
+    return ChartSearchIndex(load_atlas(start_year, end_year, longitude, utc_offset, zi_school))
@@ -0,0 +1,145 @@
+"""真太阳时与均时差。
+
+真太阳时 = 钟表时间 + 经度差修正（每度 4 分钟）+ 均时差 (Equation of Time)。
+均时差提供两种算法：
+
+- ``"approx"``：三角近似式，按年内日序计算，全天取同一值（项目默认，结果与既有数据一致）；
+- ``"spencer"``：Spencer (1971) 傅里叶级数，即 NOAA 太阳位置计算所用公式，
+  按含时刻的年内分数计算，误差约半分钟以内。
+
+标量函数供单次排盘使用，``*_array`` 版本一次处理整批时刻与经度/时区数组。
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from typing import Union
+
+import numpy as np
+
+EOT_APPROX = "approx"
+EOT_SPENCER = "spencer"
+EOT_METHODS = (EOT_APPROX, EOT_SPENCER)
+
+ArrayLike = Union[float, np.ndarray]
+
+
+def _check_method(method: str) -> None:
+    if method not in EOT_METHODS:
+        raise ValueError(f"method must be one of {EOT_METHODS}, got {method!r}")
+
+
+def equation_of_time(day_of_year: int, hour: float = 12.0, method: str = EOT_APPROX) -> float:
+    """
+    计算均时差（分钟）。
+
+    Args:
+        day_of_year: 年内日序，1 月 1 日为 1
+        hour: 当日钟表时刻（小时，可带小数），仅 ``"spencer"`` 使用
+        method: ``"approx"`` 或 ``"spencer"``
+
+    Returns:
+        float: 均时差，单位分钟
+    """
+    _check_method(method)
+    if method == EOT_APPROX:
+        B = 360 * (day_of_year - 81) / 365
+        B_rad = math.radians(B)
+        return 9.87 * math.sin(2 * B_rad) - 7.53 * math.cos(B_rad) - 1.5 * math.sin(B_rad)
+
+    gamma = 2 * math.pi / 365 * (day_of_year - 1 + (hour - 12) / 24)
+    return 229.18 * (
+        0.000075
+        + 0.001868 * math.cos(gamma)
+        - 0.032077 * math.sin(gamma)
+        - 0.014615 * math.cos(2 * gamma)
+        - 0.040849 * math.sin(2 * gamma)
+    )
+
+
+def equation_of_time_array(day_of_year: np.ndarray, hours: ArrayLike = 12.0, method: str = EOT_APPROX) -> np.ndarray:
+    """``equation_of_time`` 的数组版本。"""
+    _check_method(method)
+    if method == EOT_APPROX:
+        b_rad = np.radians(360 * (day_of_year - 81) / 365)
+        return 9.87 * np.sin(2 * b_rad) - 7.53 * np.cos(b_rad) - 1.5 * np.sin(b_rad)
+
+    gamma = 2 * np.pi / 365 * (day_of_year - 1 + (hours - 12) / 24)
+    return 229.18 * (
+        0.000075
+        + 0.001868 * np.cos(gamma)
+        - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma)
+        - 0.040849 * np.sin(2 * gamma)
+    )
+
+
+def true_solar_time(dt: datetime, longitude: float = 120.0, utc_offset: float = 8.0, method: str = EOT_APPROX) -> datetime:
+    """
+    钟表时间 -> 真太阳时。
+
+    Args:
+        dt: datetime对象 (Clock Time)
+        longitude: 经度
+        utc_offset: 时区
+        method: 均时差算法
+
+    Returns:
+        datetime: 真太阳时
+    """
+    # 标准经度 = 时区 * 15，经度差带来的时间差每度4分钟
+    offset_minutes = (longitude - utc_offset * 15.0) * 4
+    hour = dt.hour + dt.minute / 60 + dt.second / 3600
+    eot = equation_of_time(dt.timetuple().tm_yday, hour, method)
+    return dt + timedelta(minutes=offset_minutes + eot)
+
+
+def solar_offset_us(
+    day_of_year: np.ndarray,
+    longitudes: ArrayLike,
+    utc_offsets: ArrayLike,
+    hours: ArrayLike = 12.0,
+    method: str = EOT_APPROX,
+) -> np.ndarray:
+    """真太阳时相对钟表时间的偏移（微秒，int64 数组）。"""
+    eot = equation_of_time_array(day_of_year, hours, method)
+    total_offset_minutes = (np.asarray(longitudes, dtype=np.float64) - np.asarray(utc_offsets, dtype=np.float64) * 15.0) * 4 + eot
+    return np.rint(total_offset_minutes * 60_000_000).astype(np.int64)
+
+
+def true_solar_time_array(
+    clock: np.ndarray,
+    longitudes: ArrayLike = 120.0,
+    utc_offsets: ArrayLike = 8.0,
+    method: str = EOT_APPROX,
+) -> np.ndarray:
+    """
+    批量计算真太阳时，经度、时区可逐样本不同。
+
+    Args:
+        clock: 钟表时间，datetime 序列或 datetime64 数组
+        longitudes: 经度，标量或等长数组
+        utc_offsets: 时区，标量或等长数组
+        method: 均时差算法
+
+    Returns:
+        np.ndarray: datetime64[us] 数组
+    """
+    clock = np.asarray(clock, dtype="datetime64[us]")
+    day = clock.astype("datetime64[D]")
+    day_of_year = (day - day.astype("datetime64[Y]")).astype(np.int64) + 1
+    hours = (clock - day).astype(np.int64) / 3_600_000_000
+    offset_us = solar_offset_us(day_of_year, longitudes, utc_offsets, hours, method)
+    return (clock.astype(np.int64) + offset_us).astype("datetime64[us]")
+
+
+def true_solar_seconds_array(
+    clock: np.ndarray,
+    longitudes: ArrayLike = 120.0,
+    utc_offsets: ArrayLike = 8.0,
+    method: str = EOT_APPROX,
+) -> np.ndarray:
+    """批量计算真太阳时，截断到秒，返回朴素本地时间的 Unix 秒数（int64）。"""
+    tst = true_solar_time_array(clock, longitudes, utc_offsets, method)
+    return np.floor_divide(tst.astype(np.int64), 1_000_000)
@@ -0,0 +1,107 @@
+"""预计算查找表。
+
+导入时根据 ``constants`` 中的生克、藏干与权重规则一次性建表，所有表都是按
+天干序号（0-9）、地支序号（0-11）、五行序号（``WUXING`` 顺序）索引的扁平元组，
+分析函数据此把逐次推导换成几次下标访问。二维表按行主序展开，
+如 ``TEN_GOD_TABLE[day_stem * 10 + target_stem]``。
+"""
+
+from __future__ import annotations
+
+from typing import Mapping, Tuple
+
+from .constants import TIANGAN, DIZHI, WUXING, STEM_INFO, BRANCH_INFO, SHENG, KE, HIDDEN_WEIGHTS
+from .encoding import PILLARS, STEM_INDEX, BRANCH_INDEX, EncodedChart
+
+# 五行生克关系，相对日主而言
+RELATIONS = ("same", "supported", "drain", "controlled", "controls")
+SAME, SUPPORTED, DRAIN, CONTROLLED, CONTROLS = range(5)
+
+TEN_GOD_NAMES = ("比肩", "劫财", "食神", "伤官", "偏财", "正财", "七杀", "正官", "偏印", "正印")
+
+
+def _relation(day_element: str, target_element: str) -> int:
+    if day_element == target_element:
+        return SAME
+    if SHENG[target_element] == day_element:
+        return SUPPORTED
+    if SHENG[day_element] == target_element:
+        return DRAIN
+    if KE[target_element] == day_element:
+        return CONTROLLED
+    return CONTROLS
+
+
+# 天干、地支的五行与阴阳
+STEM_ELEMENT = tuple(WUXING.index(STEM_INFO[stem]["wuxing"]) for stem in TIANGAN)
+STEM_YANG = tuple(STEM_INFO[stem]["yinyang"] == "阳" for stem in TIANGAN)
+BRANCH_ELEMENT = tuple(WUXING.index(BRANCH_INFO[branch]["wuxing"]) for branch in DIZHI)
+
+# 5x5 五行关系表：ELEMENT_RELATION[day_element * 5 + target_element]
+ELEMENT_RELATION = tuple(_relation(day, target) for day in WUXING for target in WUXING)
+
+# 十神由五行关系与阴阳异同决定，(关系, 同阴阳) -> 十神序号
+_TEN_GOD_BY_RELATION = {
+    (SAME, True): 0, (SAME, False): 1,
+    (DRAIN, True): 2, (DRAIN, False): 3,
+    (CONTROLS, True): 4, (CONTROLS, False): 5,
+    (CONTROLLED, True): 6, (CONTROLLED, False): 7,
+    (SUPPORTED, True): 8, (SUPPORTED, False): 9,
+}
+
+# 10x10 十神表：TEN_GOD_TABLE[day_stem * 10 + target_stem] -> TEN_GOD_NAMES 下标
+TEN_GOD_TABLE = tuple(
+    _TEN_GOD_BY_RELATION[(
+        ELEMENT_RELATION[STEM_ELEMENT[day] * 5 + STEM_ELEMENT[target]],
+        STEM_YANG[day] == STEM_YANG[target],
+    )]
+    for day in range(10)
+    for target in range(10)
+)
+
+# 各地支藏干：天干序号、五行序号（保持本气、中气、余气顺序）及五行计数向量
+HIDDEN_STEMS = tuple(
+    tuple(TIANGAN.index(stem) for stem in BRANCH_INFO[branch]["hidden_stems"]) for branch in DIZHI
+)
+HIDDEN_ELEMENTS = tuple(tuple(STEM_ELEMENT[stem] for stem in stems) for stems in HIDDEN_STEMS)
+HIDDEN_ELEMENT_VECTORS = tuple(
+    tuple(elements.count(e) for e in range(5)) for elements in HIDDEN_ELEMENTS
+)
+
+# 强弱打分：月令（得令）、天干（得势）、地支藏干（得地）
+_MONTH_SCORE = {SAME: 4.0, SUPPORTED: 3.0}
+_ROOT_SCORE = {SAME: 1.0, SUPPORTED: 0.5}
+
+# MONTH_STRENGTH[day_element * 12 + month_branch]
+MONTH_STRENGTH = tuple(
+    _MONTH_SCORE.get(ELEMENT_RELATION[day * 5 + BRANCH_ELEMENT[branch]], -2.0)
+    for day in range(5)
+    for branch in range(12)
+)
+# STEM_STRENGTH[day_element * 5 + stem_element]
+STEM_STRENGTH = tuple(_ROOT_SCORE.get(ELEMENT_RELATION[i], -0.5) for i in range(25))
+# BRANCH_STRENGTH_TERMS[day_element * 12 + branch]：各藏干的加权得分，按藏干顺序
+BRANCH_STRENGTH_TERMS = tuple(
+    tuple(
+        STEM_STRENGTH[day * 5 + element] * weight
+        for element, weight in zip(HIDDEN_ELEMENTS[branch], HIDDEN_WEIGHTS[DIZHI[branch]])
+    )
+    for day in range(5)
+    for branch in range(12)
+)
+# BRANCH_STRENGTH[day_element * 12 + branch]：一个地支对日主强弱的总贡献
+BRANCH_STRENGTH = tuple(sum(terms) for terms in BRANCH_STRENGTH_TERMS)
+
+
+def stem_indices(pillars: Mapping) -> Tuple[int, int, int, int]:
+    """年、月、日、时四干的序号，``EncodedChart`` 直接取用，不经字符串。"""
+    if isinstance(pillars, EncodedChart):
+        return pillars.stems()
+    return tuple(STEM_INDEX[pillars[f"{p}_stem"]] for p in PILLARS)
+
+
+def branch_indices(pillars: Mapping) -> Tuple[int, int, int, int]:
+    """年、月、日、时四支的序号。"""
+    if isinstance(pillars, EncodedChart):
+        return pillars.branches()
+    return tuple(BRANCH_INDEX[pillars[f"{p}_branch"]] for p in PILLARS)
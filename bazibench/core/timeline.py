@@ -0,0 +1,135 @@
+"""运限时间线：大运、流年、流月逐期对照原局。
+
+``Timeline`` 在构造时把原局化为日干序号和地支掩码，并预先取好 10 个天干的十神、
+12 个地支与原局的刑冲合害（查 ``interactions.period_interactions`` 的缓存表）；
+之后每一期只是按六十甲子序号取两次下标，所有方法都是惰性生成器，可覆盖任意年份跨度。
+
+流年按立春换年，流月按节换月：``liuyue`` 中某年的第 1 个月是该年立春起的寅月，
+第 12 个月是次年小寒起的丑月。
+"""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import Iterator, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .constants import JIAZI
+from .dayun import DaYunSequence
+from .encoding import EncodedChart
+from .ganzhi import MONTH_CYCLES, year_cycle
+from .interactions import branch_masks, period_interactions
+from .tables import TEN_GOD_NAMES, TEN_GOD_TABLE
+
+DAYUN = "dayun"
+LIUNIAN = "liunian"
+LIUYUE = "liuyue"
+LEVELS = (DAYUN, LIUNIAN, LIUYUE)
+
+
+class TimelineEntry(NamedTuple):
+    """
+    一期运限。
+
+    ``period`` 为大运步数（从 1 开始）、流年年份或流月的 (年份, 月序)；
+    ``year`` 为该期开始的年份；``interactions`` 为该期地支与原局的刑冲合害（共享，只读）。
+    """
+    level: str
+    period: Union[int, Tuple[int, int]]
+    year: int
+    cycle: int
+    ganzhi: str
+    ten_god: str
+    interactions: dict
+
+
+class Timeline:
+    """原局对照大运、流年、流月的惰性时间线。"""
+
+    def __init__(self, chart: Mapping, dayun: Optional[DaYunSequence] = None) -> None:
+        """
+        Args:
+            chart: 原局四柱字典或 ``EncodedChart``
+            dayun: 大运序列，不需要大运时可省略
+        """
+        encoded = EncodedChart.from_dict(chart)
+        self.chart = encoded
+        self.dayun_sequence = dayun
+        mask, _ = branch_masks(encoded.branches())
+        row = encoded.day_stem * 10
+        self._gods = tuple(TEN_GOD_NAMES[TEN_GOD_TABLE[row + stem]] for stem in range(10))
+        self._interactions = tuple(period_interactions(mask, branch) for branch in range(12))
+
+    def entry(self, level: str, period: Union[int, Tuple[int, int]], year: int, cycle: int) -> TimelineEntry:
+        """由六十甲子序号构造一期运限。"""
+        return TimelineEntry(
+            level, period, year, cycle, JIAZI[cycle], self._gods[cycle % 10], self._interactions[cycle % 12]
+        )
+
+    def dayun(self, limit: Optional[int] = None) -> Iterator[TimelineEntry]:
+        """
+        逐步生成大运。
+
+        Args:
+            limit: 步数上限，None 表示不限
+
+        Returns:
+            Iterator[TimelineEntry]: 大运各步
+        """
+        if self.dayun_sequence is None:
+            raise ValueError("timeline was built without a dayun sequence")
+        steps = count(1) if limit is None else range(1, limit + 1)
+        for index in steps:
+            yield self.entry(DAYUN, index, self.dayun_sequence.start_year(index), self.dayun_sequence.cycle(index))
+
+    def liunian(self, start_year: int, end_year: int) -> Iterator[TimelineEntry]:
+        """生成 [start_year, end_year] 的流年。"""
+        for year in range(start_year, end_year + 1):
+            yield self.entry(LIUNIAN, year, year, year_cycle(year))
+
+    def liuyue(self, start_year: int, end_year: int) -> Iterator[TimelineEntry]:
+        """生成 [start_year, end_year] 各年的 12 个流月。"""
+        gods = self._gods
+        interactions = self._interactions
+        for year in range(start_year, end_year + 1):
+            for month, cycle in enumerate(MONTH_CYCLES[year_cycle(year) % 10], 1):
+                yield TimelineEntry(
+                    LIUYUE, (year, month), year, cycle, JIAZI[cycle], gods[cycle % 10], interactions[cycle % 12]
+                )
+
+    def walk(self, start_year: int, end_year: int, levels: Tuple[str, ...] = LEVELS) -> Iterator[TimelineEntry]:
+        """
+        按时间顺序交错生成各级运限：每年先出当年开始的大运，再出流年，再出该年 12 个流月。
+
+        Args:
+            start_year: 起始年份
+            end_year: 结束年份（含）
+            levels: 需要的级别，取自 ``LEVELS``
+
+        Returns:
+            Iterator[TimelineEntry]: 按时间排序的运限
+        """
+        unknown = set(levels).difference(LEVELS)
+        if unknown:
+            raise ValueError(f"unknown timeline levels: {sorted(unknown)}")
+        with_dayun = DAYUN in levels
+        if with_dayun and self.dayun_sequence is None:
+            raise ValueError("timeline was built without a dayun sequence")
+
+        if with_dayun:
+            # 跨度起点已在行运中时，先补出当时所在的那步大运
+            first = self.dayun_sequence.start_year(1)
+            index = max(1, (start_year - first) // 10 + 1)
+            if start_year > first:
+                yield self.entry(DAYUN, index, self.dayun_sequence.start_year(index), self.dayun_sequence.cycle(index))
+                index += 1
+            next_dayun = self.dayun_sequence.start_year(index)
+
+        for year in range(start_year, end_year + 1):
+            if with_dayun and year == next_dayun:
+                yield self.entry(DAYUN, index, year, self.dayun_sequence.cycle(index))
+                index += 1
+                next_dayun = self.dayun_sequence.start_year(index)
+            if LIUNIAN in levels:
+                yield from self.liunian(year, year)
+            if LIUYUE in levels:
+                yield from self.liuyue(year, year)
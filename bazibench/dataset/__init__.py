@@ -1,6 +1,9 @@
 from .schema import BaziSample, BaziAnalysis, BaziInput
 from .generator import BaziDatasetGenerator
 from .validator import BaziValidator
+from .writer import JsonlSink
+from .stratified import ChartFeatureIndex, StratifiedGenerator
+from .boundary import BoundaryIndex, BoundaryGenerator
 
 __all__ = [
     "BaziSample",
@@ -8,4 +11,9 @@ __all__ = [
     "BaziInput",
     "BaziDatasetGenerator",
     "BaziValidator",
+    "JsonlSink",
+    "ChartFeatureIndex",
+    "StratifiedGenerator",
+    "BoundaryIndex",
+    "BoundaryGenerator",
 ]
@@ -0,0 +1,131 @@
+"""交界难题生成：在节令交接与时辰交界前后出题。
+
+四柱只在图谱区间的起点变化，``BoundaryIndex`` 把这些起点按变化的最高一柱分类：
+
+- ``jie``：月柱变化，即交节（立春时年柱一并变化）
+- ``day``：日柱变化（子夜）
+- ``zi``：进入子时
+- ``hour``：其余时辰交界
+
+``BoundaryGenerator`` 直接读取这些交界时刻，在其前后给定的分钟偏移处出题，
+不做任何搜索；偏移写入样本 ``meta``。出生时间取整到分钟，与题面一致，
+偏移为正时必在交界之后、为负时必在交界之前。相邻交界（如换日与入子时相隔约
+一小时，或均时差造成的往复换日）取到同一分钟时只出一题，``meta`` 记最先遇到的交界。
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from ..core.atlas import CalendarAtlas, load_atlas
+from .generator import BaziDatasetGenerator
+from .schema import BaziSample
+
+_EPOCH = datetime(1970, 1, 1)
+
+BOUNDARY_KINDS = ("jie", "day", "zi", "hour")
+JIE, DAY, ZI, HOUR = range(4)
+DEFAULT_KINDS = ("jie", "day", "zi")
+DEFAULT_OFFSETS = (-60, -10, -1, 1, 10, 60)
+
+
+class BoundaryIndex:
+    """
+    图谱范围内全部四柱交界时刻及其类别。
+
+    Args:
+        atlas: 干支历图谱；索引构造后图谱可关闭
+    """
+
+    def __init__(self, atlas: CalendarAtlas) -> None:
+        codes = np.frombuffer(atlas.codes, dtype=np.uint8).reshape(-1, 4)
+        # 首个区间起点是图谱范围的起点，不是交界
+        self.instants = np.array(atlas.starts, dtype=np.int64)[1:len(codes)]
+        changed = codes[1:] != codes[:-1]
+        kinds = np.where(codes[1:, 3] % 12 == 0, ZI, HOUR)
+        kinds = np.where(changed[:, 2], DAY, kinds)
+        self.kinds = np.where(changed[:, 1], JIE, kinds).astype(np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.instants)
+
+    def mask(self, kinds: Sequence[str] = DEFAULT_KINDS) -> np.ndarray:
+        """属于指定类别（``BOUNDARY_KINDS`` 中的名称）的交界的布尔掩码。"""
+        unknown = set(kinds) - set(BOUNDARY_KINDS)
+        if unknown:
+            raise ValueError(f"unknown boundary kinds: {sorted(unknown)}")
+        return np.isin(self.kinds, [BOUNDARY_KINDS.index(k) for k in kinds])
+
+    def select(self, kinds: Sequence[str] = DEFAULT_KINDS) -> np.ndarray:
+        """
+        指定类别的交界时刻。
+
+        Args:
+            kinds: ``BOUNDARY_KINDS`` 中的类别
+
+        Returns:
+            np.ndarray: 钟表时间 Unix 秒，按时间排序
+        """
+        return self.instants[self.mask(kinds)]
+
+
+class BoundaryGenerator:
+    """
+    在交界时刻前后生成样本。
+
+    Args:
+        generator: 提供随机流、地点与样本模板的生成器
+        index: 交界索引，默认按生成器的年份范围与地点从图谱构建
+    """
+
+    def __init__(self, generator: BaziDatasetGenerator, index: Optional[BoundaryIndex] = None) -> None:
+        self.generator = generator
+        if index is None:
+            with load_atlas(
+                generator.start_year, generator.end_year, generator.longitude,
+                generator.utc_offset, generator.calculator.zi_school,
+            ) as atlas:
+                index = BoundaryIndex(atlas)
+        self.index = index
+
+    def generate(
+        self,
+        task_types: Sequence[str] = ("chart",),
+        kinds: Sequence[str] = DEFAULT_KINDS,
+        offsets: Sequence[int] = DEFAULT_OFFSETS,
+    ) -> Iterator[BaziSample]:
+        """
+        按时间顺序对每个交界、每个偏移生成一个样本，落在已出过题的分钟上的跳过。
+
+        Args:
+            task_types: 候选任务类型，每个样本随机选取其一
+            kinds: 交界类别
+            offsets: 相对交界的分钟偏移（非 0）
+
+        Yields:
+            BaziSample: 样本，``meta`` 含 boundary、boundary_kind、offset_minutes
+        """
+        if 0 in offsets:
+            raise ValueError("offsets must be non-zero minutes")
+        rng = self.generator.rng
+        mask = self.index.mask(kinds)
+        # 已出过题的分钟，同一分钟的出生时间题面相同，不重复出题
+        emitted = set()
+        for instant, kind in zip(self.index.instants[mask].tolist(), self.index.kinds[mask].tolist()):
+            boundary = _EPOCH + timedelta(seconds=instant)
+            for offset in offsets:
+                # 取整到分钟：题面只给到分钟
+                seconds = (instant + offset * 60) // 60 * 60
+                if seconds in emitted:
+                    continue
+                emitted.add(seconds)
+                sample = self.generator.generate_sample(rng.choice(task_types), _EPOCH + timedelta(seconds=seconds))
+                sample.meta.update(
+                    boundary=boundary.isoformat(),
+                    boundary_kind=BOUNDARY_KINDS[kind],
+                    offset_minutes=offset,
+                )
+                yield sample
@@ -1,17 +1,16 @@
 """数据集生成器。"""
 
+import hashlib
 import random
-import uuid
 import json
 from datetime import datetime, timedelta
-from typing import List, Optional
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
 
 from ..core.calculator import BaZiCalculator
-from ..core.wuxing import analyze_wuxing
-from ..core.ten_gods import analyze_ten_gods
-from ..core.strength import analyze_strength
-from ..core.interactions import analyze_interactions
-from ..core.pattern import analyze_pattern
+from ..core.memo import AnalysisMemo
 from .schema import (
     BaziSample,
     BaziInput,
@@ -27,6 +26,216 @@ from .schema import (
 )
 
 
+# 样本 ID 由内容哈希得到；修改任务指令模板或生成逻辑（影响同一输入的题目或答案）时递增对应版本
+TEMPLATE_VERSION = 3
+GENERATOR_VERSION = 2
+
+# da_yun 题默认推算的流年起始年份
+LIUNIAN_START_YEAR = 2025
+
+# 指令变体：在题面前加不同的引导语，0 为原始题面
+PROMPT_PREFIXES = (
+    "",
+    "你是一位精通子平八字的命理师。",
+    "以下是一道八字命理题，请严格按要求作答。",
+)
+
+# 各任务的难度等级
+TASK_DIFFICULTY = {
+    "chart": 2,
+    "wuxing": 3,
+    "ten_gods": 3,
+    "strength": 4,
+    "interactions": 4,
+    "pattern": 5,
+    "da_yun": 5,
+    "useful_god": 5,
+    "comprehensive": 5,
+}
+
+# 一次 memo 查询即得的各项分析
+CHART_ANALYSES = ("wuxing", "ten_gods", "strength", "interactions", "pattern")
+SECTIONS = ("chart", *CHART_ANALYSES, "da_yun", "useful_god")
+
+# 各任务写入 ground truth 的字段。同一次查询得到的分析一并保留，供校验器核对；
+# 只有 da_yun 任务需要排大运
+TASK_SECTIONS = {
+    "chart": ("chart",),
+    "wuxing": ("chart", *CHART_ANALYSES),
+    "ten_gods": ("chart", *CHART_ANALYSES),
+    "strength": ("chart", *CHART_ANALYSES),
+    "interactions": ("chart", *CHART_ANALYSES),
+    "pattern": ("chart", *CHART_ANALYSES),
+    "da_yun": ("chart", "da_yun"),
+    "useful_god": ("chart", *CHART_ANALYSES, "useful_god"),
+    "comprehensive": ("chart", *CHART_ANALYSES, "useful_god"),
+}
+
+
+def sample_seed(base_seed: int, index: int) -> int:
+    """
+    第 index 个样本的随机种子。
+
+    由 ``SeedSequence(base_seed, spawn_key=(index,))`` 派生（与 ``spawn`` 得到的第 index 个子序列相同），
+    各下标的随机流互相独立，且与生成顺序、分片方式无关。
+    """
+    state = np.random.SeedSequence(base_seed, spawn_key=(index,)).generate_state(2, np.uint64)
+    return int(state[0]) << 64 | int(state[1])
+
+
+def content_id(input_data: BaziInput, task_type: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    样本的内容地址 ID。
+
+    对 (输入, 任务类型, 指令模板版本, 生成器版本, 模板参数) 的规范 JSON 取 SHA-256，
+    同样的题目在任何一次重建中都得到同一个 ID；生成时间等元数据不参与哈希。
+
+    Args:
+        input_data: 样本输入
+        task_type: 任务类型
+        params: 输入以外影响题目的模板参数（如流年起始年份）
+
+    Returns:
+        str: 32 位十六进制 ID
+    """
+    payload = {
+        "input": input_data.model_dump(),
+        "task": task_type,
+        "template": TEMPLATE_VERSION,
+        "generator": GENERATOR_VERSION,
+        "params": params or {},
+    }
+    return _digest(payload)
+
+
+def input_id(input_data: BaziInput) -> str:
+    """只由输入决定的 ID，同一八字派生的各题共享，可用于按八字划分数据集。"""
+    return _digest({"input": input_data.model_dump(), "generator": GENERATOR_VERSION})
+
+
+def _digest(payload: Dict[str, Any]) -> str:
+    canonical = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class LazyAnalysis:
+    """
+    按需计算的八字分析。
+
+    属性与 ``BaziAnalysis`` 同名，首次访问时才计算并缓存：``chart`` 只排四柱，
+    五行、十神等各项共用一次 memo 查询，``da_yun`` 才会排大运。
+    ``materialize`` 转为 ``BaziAnalysis``，可只包含指定字段。
+    """
+
+    def __init__(self, generator: "BaziDatasetGenerator", dt: datetime, gender: int, longitude: float, latitude: float, utc_offset: float):
+        self._generator = generator
+        self.dt = dt
+        self.gender = gender
+        self.longitude = longitude
+        self.latitude = latitude
+        self.utc_offset = utc_offset
+
+    @cached_property
+    def chart_data(self) -> Dict[str, str]:
+        return self._generator.calculator.calculate(self.dt, self.longitude, self.latitude, self.utc_offset)
+
+    @cached_property
+    def results(self) -> Dict[str, Any]:
+        return self._generator.memo.analyze(self.chart_data)
+
+    @cached_property
+    def chart(self) -> BaziChart:
+        return BaziChart(**self.chart_data)
+
+    @cached_property
+    def wuxing(self) -> WuxingAnalysis:
+        return WuxingAnalysis(**self.results["wuxing"])
+
+    @cached_property
+    def ten_gods(self) -> TenGodsAnalysis:
+        return TenGodsAnalysis(**self.results["ten_gods"])
+
+    @cached_property
+    def strength(self) -> StrengthAnalysis:
+        return StrengthAnalysis(**self.results["strength"])
+
+    @cached_property
+    def interactions(self) -> InteractionsAnalysis:
+        return InteractionsAnalysis(**self.results["interactions"])
+
+    @cached_property
+    def pattern(self) -> PatternAnalysis:
+        return PatternAnalysis(**self.results["pattern"])
+
+    @cached_property
+    def da_yun(self) -> DaYunAnalysis:
+        pillars = self._generator.calculator.calculate_dayun(self.dt, self.gender, self.longitude, self.utc_offset)
+        return DaYunAnalysis(gender=self.gender, pillars=pillars)
+
+    @cached_property
+    def useful_god(self) -> UsefulGodAnalysis:
+        # Simple Useful God Heuristic
+        # Strength Thresholds: >= 1.0 Strong, >= -1.0 Neutral, < -1.0 Weak
+        score = self.results["strength"]["score"]
+        if score < -1.0:
+            ug_list = ["印", "比"]
+            unfavorable_list = ["财", "官", "食", "伤"]
+            reason = "日主偏弱，宜用印星生身或比劫帮身"
+            # Tiao Hou (Basic)
+            if self.chart_data["month_branch"] in ["亥", "子", "丑"] and "火" not in self.results["wuxing"]["counts"]:  # Winter needs Fire
+                reason += "；生于冬月，需火调候暖局"
+                ug_list.append("火")
+        elif score >= 1.0:
+            ug_list = ["官", "杀", "食", "伤", "财"]
+            unfavorable_list = ["印", "比"]
+            reason = "日主偏强，宜用官杀克制、食伤泄秀或财星耗身"
+        else:
+            ug_list = ["中和"]
+            unfavorable_list = []
+            reason = "日主中和，需视具体组合而定"
+        return UsefulGodAnalysis(god=ug_list, unfavorable=unfavorable_list, reason=reason)
+
+    def materialize(self, sections: Optional[Iterable[str]] = None) -> BaziAnalysis:
+        """
+        转为 ``BaziAnalysis``。
+
+        Args:
+            sections: 要包含的字段，默认全部；未包含的字段为 None
+
+        Returns:
+            BaziAnalysis: 分析结果
+        """
+        sections = SECTIONS if sections is None else sections
+        return BaziAnalysis(**{name: getattr(self, name) for name in sections})
+
+
+def check_fanout(tasks_per_chart: Optional[int], variants: Sequence[int]) -> None:
+    """校验派生参数：每个八字至少出一道题，变体须为 ``PROMPT_PREFIXES`` 下标。"""
+    if tasks_per_chart is not None and tasks_per_chart < 1:
+        raise ValueError(f"tasks_per_chart must be None or >= 1, got {tasks_per_chart}")
+    if not variants:
+        raise ValueError("variants must not be empty")
+    for variant in variants:
+        if not 0 <= variant < len(PROMPT_PREFIXES):
+            raise ValueError(f"prompt variant must be in [0, {len(PROMPT_PREFIXES)}), got {variant}")
+
+
+def input_of(analysis: LazyAnalysis) -> BaziInput:
+    """分析对应的样本输入。"""
+    dt = analysis.dt
+    return BaziInput(
+        year=dt.year,
+        month=dt.month,
+        day=dt.day,
+        hour=dt.hour,
+        minute=dt.minute,
+        gender=analysis.gender,
+        longitude=analysis.longitude,
+        latitude=analysis.latitude,
+        utc_offset=analysis.utc_offset
+    )
+
+
 class BaziDatasetGenerator:
     def __init__(
         self,
@@ -35,9 +244,22 @@ class BaziDatasetGenerator:
         end_year: int = 2030,
         longitude: float = 120.0,
         latitude: float = 30.0,
-        utc_offset: float = 8.0
+        utc_offset: float = 8.0,
+        memo: Optional[AnalysisMemo] = None,
+        full_ground_truth: bool = False,
+        record_time: bool = True,
+        liunian_start_year: int = LIUNIAN_START_YEAR
     ):
         self.calculator = BaZiCalculator()
+        # 四柱 -> 分析结果的缓存，可传入带持久库的实例在多次生成间复用
+        self.memo = memo if memo is not None else AnalysisMemo()
+        # 默认 ground truth 只含任务用到的字段（见 TASK_SECTIONS），置 True 则总是全量计算
+        self.full_ground_truth = full_ground_truth
+        # 是否在 meta 中记录生成时间；需要逐字节可复现的数据集时关闭
+        self.record_time = record_time
+        # da_yun 题推算流年的起始年份；固定取值，题面与答案不随生成当天的日期变化
+        self.liunian_start_year = liunian_start_year
+        self.seed = seed
         self.rng = random.Random(seed)
         self.start_year = start_year
         self.end_year = end_year
@@ -45,152 +267,86 @@ class BaziDatasetGenerator:
         self.latitude = latitude
         self.utc_offset = utc_offset
 
+    def close(self) -> None:
+        """提交 memo 中尚未写入持久库的结果；memo 由调用方传入时仍由调用方关闭。"""
+        self.memo.flush()
+
+    def __enter__(self) -> "BaziDatasetGenerator":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
     def generate_random_date(self) -> datetime:
-        """生成随机日期"""
+        """生成随机日期，精确到分钟（与样本输入、题面的精度一致）"""
         start_date = datetime(self.start_year, 1, 1)
         end_date = datetime(self.end_year, 12, 31)
         delta = end_date - start_date
         random_days = self.rng.randrange(delta.days)
-        random_seconds = self.rng.randrange(24 * 60 * 60)
-        return start_date + timedelta(days=random_days, seconds=random_seconds)
+        random_minutes = self.rng.randrange(24 * 60)
+        return start_date + timedelta(days=random_days, minutes=random_minutes)
+
+    def lazy_analyze(self, dt: datetime, gender: int = 1, longitude: float = 120.0, latitude: float = 30.0, utc_offset: float = 8.0) -> "LazyAnalysis":
+        """返回按需计算的分析结果，各字段首次访问时才计算"""
+        if gender not in [0, 1]:
+            raise ValueError("Gender must be 1 (Male) or 0 (Female)")
+        return LazyAnalysis(self, dt, gender, longitude, latitude, utc_offset)
 
     def analyze(self, dt: datetime, gender: int = 1, longitude: float = 120.0, latitude: float = 30.0, utc_offset: float = 8.0) -> BaziAnalysis:
         """对指定日期进行全量八字分析"""
-        combined_data = self.calculator.calculate_with_dayun(dt, gender, longitude, latitude, utc_offset)
-        chart_data = combined_data["chart"]
-        da_yun_list = combined_data["dayun"]
-        
-        wuxing_data = analyze_wuxing(chart_data)
-        ten_gods_data = analyze_ten_gods(chart_data)
-        strength_data = analyze_strength(chart_data)
-        pattern_data = analyze_pattern(chart_data, ten_gods_data, strength_data)
-        
-        branches = [
-            chart_data["year_branch"],
-            chart_data["month_branch"],
-            chart_data["day_branch"],
-            chart_data["hour_branch"]
-        ]
-        interactions_data = analyze_interactions(branches)
-        
-        # Simple Useful God Heuristic
-        # Strength Thresholds: >= 1.0 Strong, >= -1.0 Neutral, < -1.0 Weak
-        score = strength_data["score"]
-        ug_list = []
-        unfavorable_list = []
-        
-        if score < -1.0:
-             ug_type = "印比 (生扶)" # Keep for backward compat in logic if needed, but we use list now
-             ug_list = ["印", "比"]
-             unfavorable_list = ["财", "官", "食", "伤"]
-             reason = "日主偏弱，宜用印星生身或比劫帮身"
-             # Tiao Hou (Basic)
-             month_branch = chart_data["month_branch"]
-             if month_branch in ["亥", "子", "丑"] and "火" not in wuxing_data["counts"]: # Winter needs Fire
-                 reason += "；生于冬月，需火调候暖局"
-                 ug_list.append("火")
-        elif score >= 1.0:
-             ug_type = "克泄耗 (抑制)"
-             ug_list = ["官", "杀", "食", "伤", "财"]
-             unfavorable_list = ["印", "比"]
-             reason = "日主偏强，宜用官杀克制、食伤泄秀或财星耗身"
-        else:
-             ug_type = "中和"
-             ug_list = ["中和"]
-             unfavorable_list = []
-             reason = "日主中和，需视具体组合而定"
-
-        return BaziAnalysis(
-            chart=BaziChart(
-                year=chart_data["year"],
-                month=chart_data["month"],
-                day=chart_data["day"],
-                hour=chart_data["hour"],
-                year_stem=chart_data["year_stem"],
-                year_branch=chart_data["year_branch"],
-                month_stem=chart_data["month_stem"],
-                month_branch=chart_data["month_branch"],
-                day_stem=chart_data["day_stem"],
-                day_branch=chart_data["day_branch"],
-                hour_stem=chart_data["hour_stem"],
-                hour_branch=chart_data["hour_branch"]
-            ),
-            wuxing=WuxingAnalysis(
-                counts=wuxing_data["counts"],
-                missing=wuxing_data["missing"],
-                sheng=wuxing_data["sheng"],
-                ke=wuxing_data["ke"]
-            ),
-            ten_gods=TenGodsAnalysis(
-                gods=ten_gods_data["gods"],
-                counts=ten_gods_data["counts"]
-            ),
-            strength=StrengthAnalysis(
-                score=strength_data["score"],
-                level=strength_data["level"]
-            ),
-            interactions=InteractionsAnalysis(
-                liuhe=interactions_data["liuhe"],
-                liuchong=interactions_data["liuchong"],
-                sanhe=interactions_data["sanhe"],
-                sanhui=interactions_data["sanhui"],
-                xing=interactions_data["xing"],
-                self_xing=interactions_data["self_xing"],
-                liuhai=interactions_data["liuhai"]
-            ),
-            pattern=PatternAnalysis(
-                main_pattern=pattern_data["main_pattern"],
-                sub_patterns=pattern_data["sub_patterns"],
-                description=pattern_data["description"]
-            ),
-            da_yun=DaYunAnalysis(
-                gender=gender,
-                pillars=da_yun_list
-            ),
-            useful_god=UsefulGodAnalysis(
-                god=ug_list,
-                unfavorable=unfavorable_list,
-                reason=reason
-            )
-        )
+        return self.lazy_analyze(dt, gender, longitude, latitude, utc_offset).materialize()
 
-    def generate_sample(self, task_type: str = "chart") -> BaziSample:
-        """生成单个测试样本"""
-        dt = self.generate_random_date()
-        gender = self.rng.choice([0, 1])
-        
-        analysis = self.analyze(dt, gender, self.longitude, self.latitude, self.utc_offset)
+    def generate_sample(self, task_type: str = "chart", dt: Optional[datetime] = None, gender: Optional[int] = None, variant: int = 0) -> BaziSample:
+        """
+        生成单个测试样本，未给出出生时间或性别时随机抽取。
+
+        给定的出生时间截断到分钟再排盘：样本输入只记到分钟，同一分钟内的时刻
+        得到同一个 ID，答案也必须相同。
+        """
+        if dt is None:
+            dt = self.generate_random_date()
+        dt = dt.replace(second=0, microsecond=0)
+        if gender is None:
+            gender = self.rng.choice([0, 1])
         
-        sample_id = str(uuid.uuid4())
-        input_data = BaziInput(
-            year=dt.year,
-            month=dt.month,
-            day=dt.day,
-            hour=dt.hour,
-            minute=dt.minute,
-            gender=gender,
-            longitude=self.longitude,
-            latitude=self.latitude,
-            utc_offset=self.utc_offset
-        )
+        analysis = self.lazy_analyze(dt, gender, self.longitude, self.latitude, self.utc_offset)
+        return self.build_sample(analysis, task_type, variant)
+
+    def build_sample(self, analysis: LazyAnalysis, task_type: str, variant: int = 0) -> BaziSample:
+        """
+        由分析结果生成一道题，同一 ``LazyAnalysis`` 可生成多道题而只计算一次。
+
+        Args:
+            analysis: ``lazy_analyze`` 的结果
+            task_type: 任务类型
+            variant: 指令变体，``PROMPT_PREFIXES`` 下标
+
+        Returns:
+            BaziSample: 生成的样本
+        """
+        if not 0 <= variant < len(PROMPT_PREFIXES):
+            raise ValueError(f"prompt variant must be in [0, {len(PROMPT_PREFIXES)}), got {variant}")
+        dt = analysis.dt
+        gender = analysis.gender
+        input_data = input_of(analysis)
 
         instruction = ""
         expected_output = ""
-        difficulty = 1
+        difficulty = TASK_DIFFICULTY.get(task_type, 1)
         tags = [task_type]
         evaluation_type = "exact_match"
+        params = {}
         
         gender_str = "男" if gender == 1 else "女"
 
         if task_type == "chart":
-            instruction = f"请根据公历 {dt.year}年{dt.month}月{dt.day}日 {dt.hour}时 排出八字四柱。请以JSON格式输出，包含year, month, day, hour四个字段。"
+            instruction = f"请根据公历 {dt.year}年{dt.month}月{dt.day}日 {dt.hour}时{dt.minute}分 排出八字四柱。请以JSON格式输出，包含year, month, day, hour四个字段。"
             expected_output = json.dumps({
                 "year": analysis.chart.year,
                 "month": analysis.chart.month,
                 "day": analysis.chart.day,
                 "hour": analysis.chart.hour
             }, ensure_ascii=False)
-            difficulty = 2
         
         elif task_type == "wuxing":
             instruction = f"请分析该八字的五行个数与缺失（注意：必须计算地支藏干，天干和地支藏干一起统计）：{analysis.chart.year} {analysis.chart.month} {analysis.chart.day} {analysis.chart.hour}。请以JSON格式输出，包含counts对象和missing数组。"
@@ -198,13 +354,11 @@ class BaziDatasetGenerator:
                 "counts": analysis.wuxing.counts,
                 "missing": analysis.wuxing.missing
             }, ensure_ascii=False)
-            difficulty = 3
             evaluation_type = "partial_match"
 
         elif task_type == "ten_gods":
             instruction = f"请列出该八字天干的十神（按年干/月干/日干/时干顺序）：{analysis.chart.year} {analysis.chart.month} {analysis.chart.day} {analysis.chart.hour}。请以JSON数组格式输出，例如 [\"正印\", \"正官\", ...]。"
             expected_output = json.dumps(analysis.ten_gods.gods, ensure_ascii=False)
-            difficulty = 3
             evaluation_type = "partial_match"
             
         elif task_type == "strength":
@@ -213,7 +367,6 @@ class BaziDatasetGenerator:
                 "score": analysis.strength.score,
                 "level": analysis.strength.level
             }, ensure_ascii=False)
-            difficulty = 4
 
         elif task_type == "interactions":
             instruction = f"请分析该八字地支的刑冲合害关系。请直接输出JSON格式结果，包含键：liuhe, liuchong, sanhe, sanhui, xing, self_xing, liuhai。值为空列表则不输出该键。例如：{{\"liuchong\": [[\"寅\", \"申\"]]}}。地支：{analysis.chart.year_branch} {analysis.chart.month_branch} {analysis.chart.day_branch} {analysis.chart.hour_branch}"
@@ -229,7 +382,6 @@ class BaziDatasetGenerator:
             if analysis.interactions.liuhai: output_dict["liuhai"] = analysis.interactions.liuhai
             
             expected_output = json.dumps(output_dict, ensure_ascii=False)
-            difficulty = 4
             evaluation_type = "partial_match"
 
         elif task_type == "pattern":
@@ -239,15 +391,14 @@ class BaziDatasetGenerator:
                 "sub_patterns": analysis.pattern.sub_patterns,
                 "description": analysis.pattern.description
             }, ensure_ascii=False)
-            difficulty = 5
             evaluation_type = "partial_match"
 
         elif task_type == "da_yun":
-            # Current year range for Liu Nian
-            current_year = datetime.now().year
-            years = [current_year, current_year + 1, current_year + 2]
+            start = self.liunian_start_year
+            years = [start, start + 1, start + 2]
+            params["liunian_start"] = years[0]
             
-            instruction = f"请排出该{gender_str}命的大运（前3步），并推算{years[0]}-{years[2]}年的流年干支：{dt.year}年{dt.month}月{dt.day}日 {dt.hour}时生。请以JSON格式输出，包含dayun数组(每个元素含start_age, ganzhi)和liunian数组(每个元素含year, ganzhi)。"
+            instruction = f"请排出该{gender_str}命的大运（前3步），并推算{years[0]}-{years[2]}年的流年干支：{dt.year}年{dt.month}月{dt.day}日 {dt.hour}时{dt.minute}分生。请以JSON格式输出，包含dayun数组(每个元素含start_age, ganzhi)和liunian数组(每个元素含year, ganzhi)。"
             
             dys = analysis.da_yun.pillars
             if len(dys) >= 3:
@@ -255,16 +406,15 @@ class BaziDatasetGenerator:
             
             dayun_list = [{"start_age": d['start_age'], "ganzhi": d['ganzhi']} for d in dys]
             
-            liunian_list = []
-            for y in years:
-                ln_ganzhi = self.calculator.calculate_liunian(y)
-                liunian_list.append({"year": y, "ganzhi": ln_ganzhi})
+            liunian_list = [
+                {"year": y, "ganzhi": ganzhi}
+                for y, ganzhi in zip(years, self.calculator.liunian_range(years[0], years[-1]))
+            ]
             
             expected_output = json.dumps({
                 "dayun": dayun_list,
                 "liunian": liunian_list
             }, ensure_ascii=False)
-            difficulty = 5
             evaluation_type = "partial_match"
 
         elif task_type == "useful_god":
@@ -275,11 +425,10 @@ class BaziDatasetGenerator:
                 "unfavorable": analysis.useful_god.unfavorable,
                 "reason": analysis.useful_god.reason
             }, ensure_ascii=False)
-            difficulty = 5
             evaluation_type = "partial_match"
 
         elif task_type == "comprehensive":
-            instruction = f"请对该{gender_str}命进行综合八字分析：{dt.year}年{dt.month}月{dt.day}日 {dt.hour}时。请以JSON格式输出，包含chart(四柱), wuxing(五行统计), strength(强弱), useful_god(用神), personality(性格)字段。"
+            instruction = f"请对该{gender_str}命进行综合八字分析：{dt.year}年{dt.month}月{dt.day}日 {dt.hour}时{dt.minute}分。请以JSON格式输出，包含chart(四柱), wuxing(五行统计), strength(强弱), useful_god(用神), personality(性格)字段。"
             
             # Simple personality heuristic based on Day Master
             dm = analysis.chart.day_stem
@@ -305,28 +454,120 @@ class BaziDatasetGenerator:
                 "useful_god": analysis.useful_god.god,
                 "personality": personality
             }, ensure_ascii=False)
-            difficulty = 5
             evaluation_type = "partial_match"
 
+        meta = {"created_at": datetime.now().isoformat()} if self.record_time else {}
+        if variant:
+            instruction = PROMPT_PREFIXES[variant] + instruction
+            params["variant"] = variant
+            meta["variant"] = variant
+
         return BaziSample(
-            id=sample_id,
+            id=content_id(input_data, task_type, params),
             input=input_data,
-            ground_truth=analysis,
+            ground_truth=analysis.materialize(None if self.full_ground_truth else TASK_SECTIONS.get(task_type)),
             instruction=instruction,
             expected_output=expected_output,
             difficulty=difficulty,
             tags=tags,
             evaluation_type=evaluation_type,
-            meta={"created_at": datetime.now().isoformat()}
+            meta=meta
         )
 
-    def generate_batch(self, count: int, task_types: Optional[List[str]] = None) -> List[BaziSample]:
-        """批量生成样本"""
+    def generate_fanout(
+        self,
+        task_types: Optional[Sequence[str]] = None,
+        tasks_per_chart: Optional[int] = None,
+        variants: Sequence[int] = (0,),
+    ) -> List[BaziSample]:
+        """
+        随机抽取一个出生时间，由同一次分析派生多道题。
+
+        Args:
+            task_types: 候选任务类型，默认全部
+            tasks_per_chart: 每个八字出题的任务数，从候选中无放回抽取；默认全部。
+                取 1 时各题八字互相独立，取全部时同一八字覆盖所有任务
+            variants: 每个任务生成的指令变体
+
+        Returns:
+            List[BaziSample]: 样本列表，``meta["group"]`` 相同表示出自同一八字
+        """
+        check_fanout(tasks_per_chart, variants)
+        tasks = list(task_types) if task_types is not None else list(TASK_DIFFICULTY)
+        if not tasks:
+            raise ValueError("task_types must not be empty")
+        dt = self.generate_random_date()
+        gender = self.rng.choice([0, 1])
+        if tasks_per_chart is not None and tasks_per_chart < len(tasks):
+            tasks = self.rng.sample(tasks, tasks_per_chart)
+
+        analysis = self.lazy_analyze(dt, gender, self.longitude, self.latitude, self.utc_offset)
+        group = input_id(input_of(analysis))
+        samples = []
+        for task_type in tasks:
+            for variant in variants:
+                sample = self.build_sample(analysis, task_type, variant)
+                sample.meta["group"] = group
+                samples.append(sample)
+        return samples
+
+    def generate_batch(
+        self,
+        count: int,
+        task_types: Optional[List[str]] = None,
+        tasks_per_chart: int = 1,
+        variants: Sequence[int] = (0,),
+    ) -> List[BaziSample]:
+        """
+        批量生成样本。
+
+        Args:
+            count: 样本数
+            task_types: 候选任务类型
+            tasks_per_chart: 每个八字派生的任务数，大于 1 时按 ``generate_fanout`` 共享分析
+            variants: 每个任务生成的指令变体
+
+        Returns:
+            List[BaziSample]: 样本列表
+        """
         if task_types is None:
             task_types = ["chart", "wuxing", "ten_gods", "strength", "interactions", "da_yun", "useful_god", "comprehensive"]
         
         samples = []
-        for _ in range(count):
-            task_type = self.rng.choice(task_types)
-            samples.append(self.generate_sample(task_type))
-        return samples
+        if tasks_per_chart == 1 and tuple(variants) == (0,):
+            for _ in range(count):
+                task_type = self.rng.choice(task_types)
+                samples.append(self.generate_sample(task_type))
+            return samples
+
+        while len(samples) < count:
+            samples.extend(self.generate_fanout(task_types, tasks_per_chart, variants))
+        return samples[:count]
+
+    def generate_indexed_sample(self, index: int, task_types: Sequence[str]) -> BaziSample:
+        """
+        生成数据集中第 index 个样本。
+
+        随机流由 (seed, index) 唯一确定（见 ``sample_seed``），任务类型也从中抽取，
+        因此任意分片、任意顺序生成的结果都相同。
+
+        Args:
+            index: 样本下标
+            task_types: 候选任务类型
+
+        Returns:
+            BaziSample: 生成的样本
+        """
+        self.rng.seed(sample_seed(self.seed, index))
+        return self.generate_sample(self.rng.choice(task_types))
+
+    def generate_indexed_fanout(
+        self,
+        index: int,
+        task_types: Sequence[str],
+        tasks_per_chart: Optional[int] = None,
+        variants: Sequence[int] = (0,),
+    ) -> List[BaziSample]:
+        """同 ``generate_indexed_sample``，但第 index 个八字按 ``generate_fanout`` 派生多道题。"""
+        self.rng.seed(sample_seed(self.seed, index))
+        return self.generate_fanout(task_types, tasks_per_chart, variants)
@@ -74,12 +74,12 @@ class UsefulGodAnalysis(BaseModel):
 
 
 class BaziAnalysis(BaseModel):
-    """完整的八字分析结果"""
+    """八字分析结果，只含部分字段时其余为 None"""
     chart: BaziChart
-    wuxing: WuxingAnalysis
-    ten_gods: TenGodsAnalysis
-    strength: StrengthAnalysis
-    interactions: InteractionsAnalysis
+    wuxing: Optional[WuxingAnalysis] = None
+    ten_gods: Optional[TenGodsAnalysis] = None
+    strength: Optional[StrengthAnalysis] = None
+    interactions: Optional[InteractionsAnalysis] = None
     pattern: Optional[PatternAnalysis] = None
     da_yun: Optional[DaYunAnalysis] = None
     useful_god: Optional[UsefulGodAnalysis] = None
@@ -0,0 +1,230 @@
+"""分层抽样生成：按配额覆盖稀有结构。
+
+``ChartFeatureIndex`` 以干支历图谱的区间表为底，对每个区间批量算出日主、强弱判定、
+主格局与刑冲合害类别，某一层的候选区间只是对这几列做一次布尔筛选。
+``StratifiedGenerator`` 在候选区间内的整分钟中均匀抽取出生时间（样本输入只记到分钟），
+直接生成样本，不再反复调用 ``analyze`` 做拒绝抽样；三会、自刑、从格等稀有结构与常见结构一样便宜。
+
+配额是一组字典，``count`` 为样本数，其余键（均可省略）限定所在层：
+
+- ``task_type``：任务类型；省略时从符合 ``difficulty`` 的任务中随机选取
+- ``difficulty``：难度等级，见 ``TASK_DIFFICULTY``
+- ``interaction``：必须出现的刑冲合害类别（``FIELDS`` 之一），``"none"`` 表示全无
+- ``level``：强弱判定（``LEVELS`` 之一）
+- ``day_master``：日干
+- ``pattern``：主格局名称，或 ``PATTERN_FAMILIES`` 中的类别（如 ``"从格"``）
+- ``near``：出生时间须在某类交界前后 ``window`` 分钟内（默认 ``NEAR_WINDOW``），
+  ``"lichun"`` 为立春（年柱变化），``"midnight"`` 为换日（日柱变化，即真太阳时子夜；
+  早子时流派为 23 点）
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ..core.atlas import CalendarAtlas, load_atlas
+from ..core.batch import LEVELS, codes_from_cycles, interaction_flags_batch, pattern_batch, strength_batch
+from ..core.constants import TIANGAN, WUXING
+from ..core.interactions import FIELDS
+from ..core.pattern import PATTERN_INDEX
+from .generator import BaziDatasetGenerator, TASK_DIFFICULTY
+from .schema import BaziSample
+
+_EPOCH = datetime(1970, 1, 1)
+
+STRATUM_KEYS = ("task_type", "difficulty", "interaction", "level", "day_master", "pattern", "near", "window")
+
+NEAR_EVENTS = ("lichun", "midnight")
+NEAR_WINDOW = 60
+
+PATTERN_FAMILIES = {
+    "从格": ("从财格", "从杀格", "从儿格", "从势格"),
+    "专旺格": ("曲直格", "炎上格", "稼穑格", "从革格", "润下格"),
+    "化气格": tuple(f"化{e}格" for e in WUXING),
+}
+
+
+class ChartFeatureIndex:
+    """
+    图谱各区间的结构特征列。
+
+    Args:
+        atlas: 干支历图谱；特征在构造时一次算完，之后图谱可关闭
+    """
+
+    def __init__(self, atlas: CalendarAtlas) -> None:
+        cycles = np.frombuffer(atlas.codes, dtype=np.uint8).reshape(-1, 4)
+        codes = codes_from_cycles({p: cycles[:, i] for i, p in enumerate(("year", "month", "day", "hour"))})
+        self.starts = np.array(atlas.starts, dtype=np.int64)
+        self.durations = np.diff(self.starts)
+        # 年柱、日柱变化的时刻，供 near 分层截取交界附近的时段
+        boundaries = self.starts[1:len(cycles)]
+        self.events = {
+            "lichun": boundaries[cycles[1:, 0] != cycles[:-1, 0]],
+            "midnight": boundaries[cycles[1:, 2] != cycles[:-1, 2]],
+        }
+        self.day_masters = codes[:, 4].copy()
+        self.levels = strength_batch(codes)[1]
+        self.patterns = pattern_batch(codes)
+        self.interactions = interaction_flags_batch(codes)
+
+    def __len__(self) -> int:
+        return len(self.durations)
+
+    def select(
+        self,
+        interaction: Optional[str] = None,
+        level: Optional[str] = None,
+        day_master: Optional[str] = None,
+        pattern: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        筛选满足条件的区间。
+
+        Args:
+            interaction: 刑冲合害类别，``"none"`` 表示全无
+            level: 强弱判定
+            day_master: 日干
+            pattern: 主格局或格局类别
+
+        Returns:
+            np.ndarray: 区间下标，按时间排序
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if interaction is not None:
+            if interaction == "none":
+                mask &= self.interactions == 0
+            elif interaction in FIELDS:
+                mask &= (self.interactions >> FIELDS.index(interaction) & 1) == 1
+            else:
+                raise ValueError(f"unknown interaction type: {interaction!r}")
+        if level is not None:
+            if level not in LEVELS:
+                raise ValueError(f"unknown strength level: {level!r}")
+            mask &= self.levels == LEVELS.index(level)
+        if day_master is not None:
+            if day_master not in TIANGAN:
+                raise ValueError(f"unknown day master: {day_master!r}")
+            mask &= self.day_masters == TIANGAN.index(day_master)
+        if pattern is not None:
+            names = PATTERN_FAMILIES.get(pattern, (pattern,))
+            if any(name not in PATTERN_INDEX for name in names):
+                raise ValueError(f"unknown pattern: {pattern!r}")
+            mask &= np.isin(self.patterns, [PATTERN_INDEX[name] for name in names])
+        return np.flatnonzero(mask)
+
+    def spans(
+        self, intervals: np.ndarray, near: Optional[str] = None, window: int = NEAR_WINDOW
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        区间对应的出生时段，可截取到交界附近。
+
+        Args:
+            intervals: ``select`` 给出的区间下标
+            near: ``NEAR_EVENTS`` 之一，None 表示不截取
+            window: 交界前后的分钟数
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: 各时段的起止钟表时间 Unix 秒，左闭右开，互不重叠
+        """
+        starts, ends = self.starts[intervals], self.starts[intervals + 1]
+        if near is None:
+            return starts, ends
+        if near not in NEAR_EVENTS:
+            raise ValueError(f"unknown near event: {near!r}")
+        if window <= 0:
+            raise ValueError(f"window must be positive minutes, got {window}")
+
+        # 交界前后的窗口，相互重叠的（如均时差造成的往复换日）先合并
+        events = self.events[near]
+        lo, hi = events - window * 60, events + window * 60
+        starts_group = np.ones(len(events), dtype=bool)
+        starts_group[1:] = lo[1:] > hi[:-1]
+        ends_group = np.ones(len(events), dtype=bool)
+        ends_group[:-1] = starts_group[1:]
+        lo, hi = lo[starts_group], hi[ends_group]
+
+        # 每个窗口与其重叠的各区间求交
+        first = np.searchsorted(ends, lo, side="right")
+        counts = np.searchsorted(starts, hi, side="left") - first
+        window_index = np.repeat(np.arange(len(lo)), counts)
+        interval_index = np.repeat(first - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return (
+            np.maximum(starts[interval_index], lo[window_index]),
+            np.minimum(ends[interval_index], hi[window_index]),
+        )
+
+
+class StratifiedGenerator:
+    """
+    按配额分层生成样本。
+
+    Args:
+        generator: 提供随机流、地点与样本模板的生成器
+        features: 区间特征索引，默认按生成器的年份范围与地点从图谱构建
+    """
+
+    def __init__(self, generator: BaziDatasetGenerator, features: Optional[ChartFeatureIndex] = None) -> None:
+        self.generator = generator
+        if features is None:
+            with load_atlas(
+                generator.start_year, generator.end_year, generator.longitude,
+                generator.utc_offset, generator.calculator.zi_school,
+            ) as atlas:
+                features = ChartFeatureIndex(atlas)
+        self.features = features
+
+    def _task_types(self, stratum: Mapping[str, Any]) -> list:
+        task_type = stratum.get("task_type")
+        difficulty = stratum.get("difficulty")
+        if task_type is not None:
+            if difficulty is not None and TASK_DIFFICULTY.get(task_type) != difficulty:
+                raise ValueError(f"task {task_type!r} does not have difficulty {difficulty}")
+            return [task_type]
+        tasks = [t for t, d in TASK_DIFFICULTY.items() if difficulty is None or d == difficulty]
+        if not tasks:
+            raise ValueError(f"no task has difficulty {difficulty}")
+        return tasks
+
+    def generate(self, quotas: Iterable[Mapping[str, Any]]) -> Iterator[BaziSample]:
+        """
+        依次按配额生成样本。
+
+        Args:
+            quotas: 配额列表，每项含 ``count`` 及可选的分层键（见模块说明）
+
+        Yields:
+            BaziSample: 样本，``meta["stratum"]`` 记录所属层
+        """
+        rng = self.generator.rng
+        for quota in quotas:
+            stratum: Dict[str, Any] = {k: v for k, v in quota.items() if k != "count"}
+            unknown = set(stratum) - set(STRATUM_KEYS)
+            if unknown:
+                raise ValueError(f"unknown stratum keys: {sorted(unknown)}")
+            if "window" in stratum and "near" not in stratum:
+                raise ValueError("stratum key 'window' requires 'near'")
+            tasks = self._task_types(stratum)
+            intervals = self.features.select(
+                stratum.get("interaction"), stratum.get("level"), stratum.get("day_master"), stratum.get("pattern")
+            )
+            starts, ends = self.features.spans(intervals, stratum.get("near"), stratum.get("window", NEAR_WINDOW))
+            # 按分钟数加权：在该层全部整分钟出生时间中均匀抽取，不足一分钟的时段不出题；
+            # 时段 [a, b) 含 ceil(a/60) 至 ceil(b/60)-1 各分钟
+            first_minutes = -(-starts // 60)
+            cumulative = np.cumsum(-(-ends // 60) - first_minutes)
+            if not len(cumulative) or not cumulative[-1]:
+                raise ValueError(f"no chart in the date range matches stratum {stratum}")
+
+            for _ in range(quota["count"]):
+                r = rng.randrange(int(cumulative[-1]))
+                k = int(np.searchsorted(cumulative, r, side="right"))
+                offset = r - (int(cumulative[k - 1]) if k else 0)
+                minutes = int(first_minutes[k]) + offset
+                dt = _EPOCH + timedelta(minutes=minutes)
+                sample = self.generator.generate_sample(rng.choice(tasks), dt)
+                sample.meta["stratum"] = dict(stratum)
+                yield sample
@@ -1,12 +1,14 @@
 """数据验证器。"""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .schema import BaziSample
 from ..core.constants import TIANGAN, DIZHI, WUXING
+from ..core.memo import AnalysisMemo
 
 class BaziValidator:
-    def __init__(self):
-        pass
+    def __init__(self, memo: Optional[AnalysisMemo] = None):
+        # 传入 memo 时额外按四柱重算分析结果，核对 ground truth 是否一致
+        self.memo = memo
 
     def validate_sample(self, sample: BaziSample) -> List[str]:
         """验证单个样本，返回错误列表"""
@@ -21,22 +23,37 @@ class BaziValidator:
             if branch not in DIZHI:
                 errors.append(f"Invalid branch: {branch}")
         
+        # ground truth 可能只含任务用到的字段，缺失的部分跳过
         # 2. 验证五行总数 (天干4个 + 地支藏干，范围8-16)
         wuxing = sample.ground_truth.wuxing
-        total_count = sum(wuxing.counts.values())
-        if not (8 <= total_count <= 16):
-            errors.append(f"Total wuxing count must be between 8-16, got {total_count}")
+        if wuxing is not None:
+            total_count = sum(wuxing.counts.values())
+            if not (8 <= total_count <= 16):
+                errors.append(f"Total wuxing count must be between 8-16, got {total_count}")
         
         # 3. 验证十神数量
         ten_gods = sample.ground_truth.ten_gods
-        if len(ten_gods.gods) != 4:
+        if ten_gods is not None and len(ten_gods.gods) != 4:
             errors.append(f"Ten gods count must be 4, got {len(ten_gods.gods)}")
             
         # 4. 验证强弱分值范围 (大约 -5 到 15 之间)
         strength = sample.ground_truth.strength
-        if not (-10.0 <= strength.score <= 20.0):
+        if strength is not None and not (-10.0 <= strength.score <= 20.0):
              errors.append(f"Strength score out of reasonable range: {strength.score}")
 
+        # 5. 与重算结果核对
+        if self.memo is not None and not errors:
+            expected = self.memo.analyze(chart.model_dump())
+            if wuxing is not None and (wuxing.counts != expected["wuxing"]["counts"] or wuxing.missing != expected["wuxing"]["missing"]):
+                errors.append("Wuxing does not match the chart")
+            if ten_gods is not None and ten_gods.gods != expected["ten_gods"]["gods"]:
+                errors.append("Ten gods do not match the chart")
+            if strength is not None and (strength.score, strength.level) != (expected["strength"]["score"], expected["strength"]["level"]):
+                errors.append("Strength does not match the chart")
+            pattern = sample.ground_truth.pattern
+            if pattern is not None and pattern.model_dump() != expected["pattern"]:
+                errors.append("Pattern does not match the chart")
+
         return errors
 
     def validate_batch(self, samples: List[BaziSample]) -> Dict[str, List[str]]:
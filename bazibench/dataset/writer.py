@@ -0,0 +1,85 @@
+"""流式 JSONL 数据集写入器。
+
+样本在产生时即逐行写入磁盘，分布统计由调用方随样本传入的标签增量累计，
+不保留样本内容，内存占用与样本总数无关。写入先落到同目录的临时文件，
+``close`` 时再原子替换目标文件，中途失败不会留下半截数据集。
+"""
+
+from __future__ import annotations
+
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+class JsonlSink:
+    """
+    逐行写入序列化样本并累计统计。
+
+    Args:
+        path: 输出文件路径
+        limit: 最多写入的样本数，达到后 ``write`` 返回 False 且不再写入
+    """
+
+    def __init__(self, path: Union[str, Path], limit: Optional[int] = None) -> None:
+        self.path = Path(path)
+        self.limit = limit
+        self.count = 0
+        self.tags: Counter = Counter()
+        self.difficulties: Counter = Counter()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and self.count >= self.limit
+
+    def write(self, sample_json: str, tag: str, difficulty: Optional[int] = None) -> bool:
+        """
+        写入一个样本。
+
+        Args:
+            sample_json: 序列化后的样本（单行 JSON）
+            tag: 样本的主标签（任务类型），用于分布统计
+            difficulty: 难度等级，可选
+
+        Returns:
+            bool: 是否写入；已达上限时为 False
+        """
+        if self.full:
+            return False
+        self._file.write(sample_json)
+        self._file.write("\n")
+        self.count += 1
+        self.tags[tag] += 1
+        if difficulty is not None:
+            self.difficulties[difficulty] += 1
+        return True
+
+    def stats(self) -> Dict[str, Dict]:
+        """当前的样本分布：按标签与难度计数。"""
+        return {"tags": dict(self.tags), "difficulties": dict(sorted(self.difficulties.items()))}
+
+    def close(self) -> None:
+        """落盘并替换目标文件。"""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """放弃写入，删除临时文件，目标文件保持原样。"""
+        if not self._file.closed:
+            self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "JsonlSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
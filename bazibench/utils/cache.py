@@ -0,0 +1,20 @@
+import os
+from pathlib import Path
+
+
+def get_cache_dir() -> Path:
+    """Return the on-disk cache directory, creating it if necessary.
+
+    Defaults to ``~/.cache/bazibench`` and can be overridden with the
+    ``BAZIBENCH_CACHE_DIR`` environment variable. If the directory cannot
+    be created the path is still returned; writes into it will then fail
+    with ``OSError``.
+    """
+    path = os.environ.get("BAZIBENCH_CACHE_DIR")
+    cache_dir = Path(path) if path else Path.home() / ".cache" / "bazibench"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        # Read-only location: callers fall back to not caching on write.
+        pass
+    return cache_dir
@@ -0,0 +1,29 @@
+"""预计算干支历图谱（四柱区间表）。"""
+
+import argparse
+import os
+import time
+
+from bazibench.core.atlas import build_atlas, default_atlas_path
+from bazibench.core.calculator import BaZiCalculator
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the memory-mapped ganzhi calendar atlas")
+    parser.add_argument("--output", type=str, default=None, help="Output file (defaults to the cache directory)")
+    parser.add_argument("--start-year", type=int, default=1900, help="First year covered")
+    parser.add_argument("--end-year", type=int, default=2100, help="Last year covered")
+    parser.add_argument("--longitude", type=float, default=120.0, help="Longitude")
+    parser.add_argument("--utc-offset", type=float, default=8.0, help="UTC offset in hours")
+    parser.add_argument("--zi-school", type=str, default="late", choices=["late", "early"], help="Zi hour school")
+
+    args = parser.parse_args()
+
+    output = args.output or default_atlas_path(
+        args.start_year, args.end_year, args.longitude, args.utc_offset, args.zi_school
+    )
+    calculator = BaZiCalculator(zi_school=args.zi_school, cache_size=0)
+
+    start = time.time()
+    count = build_atlas(output, args.start_year, args.end_year, args.longitude, args.utc_offset, calculator)
+    print(f"Built {count} intervals in {time.time() - start:.1f}s")
+    print(f"Atlas saved to: {output} ({os.path.getsize(output) / 1e6:.1f} MB)")
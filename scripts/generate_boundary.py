@@ -0,0 +1,50 @@
+"""按配置在节令与时辰交界前后生成难题数据集。"""
+
+import os
+
+from tqdm import tqdm
+
+from bazibench.dataset.boundary import BoundaryGenerator
+from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.validator import BaziValidator
+from bazibench.dataset.writer import JsonlSink
+from generate_data import load_config
+
+
+def main():
+    config = load_config()
+    boundary_config = config["boundary"]
+    generator = BaziDatasetGenerator(
+        seed=config["generation"]["base_seed"],
+        start_year=config["date_range"]["start_year"],
+        end_year=config["date_range"]["end_year"],
+        longitude=config["location"]["longitude"],
+        latitude=config["location"]["latitude"],
+        utc_offset=config["location"]["utc_offset"],
+        record_time=False,
+        liunian_start_year=config["generation"]["liunian_start_year"]
+    )
+    validator = BaziValidator()
+    boundaries = BoundaryGenerator(generator)
+    kinds = boundary_config["kinds"]
+    offsets = boundary_config["offsets"]
+    total = int(boundaries.index.mask(kinds).sum()) * len(offsets)
+    output_file = os.path.join(config["output"]["dir"], boundary_config["filename"])
+
+    total_errors = 0
+    with JsonlSink(output_file) as sink:
+        for sample in tqdm(boundaries.generate(boundary_config["task_types"], kinds, offsets), total=total):
+            if validator.validate_sample(sample):
+                total_errors += 1
+                continue
+            sink.write(sample.model_dump_json(), sample.tags[0], sample.difficulty)
+
+    print(f"Total validation errors: {total_errors}")
+    print(f"Successfully generated {sink.count} samples to {output_file}")
+    print("Sample distribution:")
+    for tag, count in sink.tags.items():
+        print(f"  {tag}: {count}")
+
+
+if __name__ == "__main__":
+    main()
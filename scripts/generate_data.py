@@ -1,15 +1,19 @@
-"""生成标准数据集。"""
+"""生成标准数据集。
+
+每个样本下标都有独立的随机流（见 ``sample_seed``），工作进程按分片 [start, stop)
+生成，主进程按下标顺序写出，生成结果与 ``num_workers``、``batch_size`` 无关，
+同一配置多次运行得到逐字节相同的文件。
+"""
 
-import json
 import os
-import random
 import multiprocessing as mp
-from functools import partial
+from collections import deque
 from pathlib import Path
 import yaml
 from tqdm import tqdm
-from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.generator import BaziDatasetGenerator, check_fanout
 from bazibench.dataset.validator import BaziValidator
+from bazibench.dataset.writer import JsonlSink
 
 def load_config(config_path: str = None) -> dict:
     if config_path is None:
@@ -18,34 +22,61 @@ def load_config(config_path: str = None) -> dict:
     with open(config_path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
-def _generate_batch_worker(args):
-    """批量生成工作函数，返回序列化后的JSON字符串列表"""
-    task_types, batch_size, base_seed, config = args
-    generator = BaziDatasetGenerator(
-        seed=base_seed,
+_generator = None
+_validator = None
+
+def _init_worker(config):
+    """工作进程初始化：每个进程只建一次生成器，排盘与分析缓存在分片间复用"""
+    global _generator, _validator
+    _generator = BaziDatasetGenerator(
+        seed=config["generation"]["base_seed"],
         start_year=config["date_range"]["start_year"],
         end_year=config["date_range"]["end_year"],
         longitude=config["location"]["longitude"],
         latitude=config["location"]["latitude"],
-        utc_offset=config["location"]["utc_offset"]
+        utc_offset=config["location"]["utc_offset"],
+        record_time=False,
+        liunian_start_year=config["generation"]["liunian_start_year"]
     )
-    validator = BaziValidator()
-    
+    _validator = BaziValidator()
+
+def _generate_shard(args):
+    """
+    生成下标 [start, stop) 的样本，按下标顺序返回 (样本JSON, 标签, 难度) 列表及错误数。
+    tasks_per_chart 或 variants 非默认时，每个下标的八字派生多道题（共享一次分析）。
+    """
+    start, stop, task_types, tasks_per_chart, variants = args
+    fanout = tasks_per_chart != 1 or tuple(variants) != (0,)
     valid_samples = []
     errors_count = 0
-    for i in range(batch_size):
-        task_type = random.Random(base_seed + i).choice(task_types)
+    for index in range(start, stop):
         try:
-            sample = generator.generate_sample(task_type)
-            errors = validator.validate_sample(sample)
-            if not errors:
-                valid_samples.append(sample.model_dump_json())
+            if fanout:
+                samples = _generator.generate_indexed_fanout(index, task_types, tasks_per_chart, variants)
             else:
-                errors_count += 1
+                samples = [_generator.generate_indexed_sample(index, task_types)]
         except Exception as e:
             errors_count += 1
+            continue
+        for sample in samples:
+            errors = _validator.validate_sample(sample)
+            if not errors:
+                valid_samples.append((sample.model_dump_json(), sample.tags[0], sample.difficulty))
+            else:
+                errors_count += 1
     return valid_samples, errors_count
 
+def _iter_shards(pool, task_types, shard_size, window, tasks_per_chart=1, variants=(0,)):
+    """按下标顺序逐个产出分片结果，同时在途的分片不超过 window 个"""
+    pending = deque()
+    next_start = 0
+    while True:
+        while len(pending) < window:
+            shard = (next_start, next_start + shard_size, task_types, tasks_per_chart, variants)
+            pending.append(pool.apply_async(_generate_shard, (shard,)))
+            next_start += shard_size
+        yield pending.popleft().get()
+
 def main():
     config = load_config()
     
@@ -56,52 +87,41 @@ def main():
     task_types = config["task_types"]
     total_samples = gen_config["total_samples"]
     batch_size = gen_config["batch_size"]
-    base_seed = gen_config["base_seed"]
+    # 每个八字派生的任务数（null 为全部）与指令变体，默认一个八字一道题
+    tasks_per_chart = gen_config.get("tasks_per_chart", 1)
+    variants = tuple(gen_config.get("variants", [0]))
+    check_fanout(tasks_per_chart, variants)
     
     num_workers = gen_config.get("num_workers", -1)
     if num_workers <= 0:
         num_workers = max(1, mp.cpu_count() - 1)
     print(f"Using {num_workers} workers for parallel generation...")
     
-    valid_samples = []
     total_errors = 0
     
     print(f"Generating {total_samples} samples...")
     
-    num_batches = (total_samples + batch_size - 1) // batch_size
+    output_file = os.path.join(output_dir, config["output"]["filename"])
     
-    with mp.Pool(processes=num_workers) as pool:
-        batch_args = [
-            (task_types, batch_size, base_seed + i * 1000, config)
-            for i in range(num_batches)
-        ]
-        
+    # 样本随产随写，主进程只保留计数；校验失败的下标直接跳过，顺延到后续下标补足
+    with JsonlSink(output_file, limit=total_samples) as sink, \
+            mp.Pool(processes=num_workers, initializer=_init_worker, initargs=(config,)) as pool:
         with tqdm(total=total_samples) as pbar:
-            for samples_json, errors_count in pool.imap_unordered(_generate_batch_worker, batch_args):
+            for samples, errors_count in _iter_shards(pool, task_types, batch_size, 2 * num_workers, tasks_per_chart, variants):
                 total_errors += errors_count
-                for sample_json in samples_json:
-                    if len(valid_samples) < total_samples:
-                        valid_samples.append(sample_json)
+                for sample_json, tag, difficulty in samples:
+                    if sink.write(sample_json, tag, difficulty):
                         pbar.update(1)
+                if sink.full:
+                    break
+                if total_errors > total_samples:
+                    raise RuntimeError(f"Too many invalid samples ({total_errors}), check the configuration")
     
     print(f"Total validation errors: {total_errors}")
-    valid_samples = valid_samples[:total_samples]
-    
-    output_file = os.path.join(output_dir, config["output"]["filename"])
-    with open(output_file, "w", encoding="utf-8") as f:
-        for sample_json in valid_samples:
-            f.write(sample_json + "\n")
-            
-    print(f"Successfully generated {len(valid_samples)} samples to {output_file}")
+    print(f"Successfully generated {sink.count} samples to {output_file}")
     
-    stats = {}
-    for sample_json in valid_samples:
-        sample = json.loads(sample_json)
-        tag = sample["tags"][0]
-        stats[tag] = stats.get(tag, 0) + 1
-        
     print("Sample distribution:")
-    for tag, count in stats.items():
+    for tag, count in sink.tags.items():
         print(f"  {tag}: {count}")
 
 if __name__ == "__main__":
@@ -0,0 +1,46 @@
+"""按配置中的分层配额生成数据集。"""
+
+import os
+
+from tqdm import tqdm
+
+from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.stratified import StratifiedGenerator
+from bazibench.dataset.validator import BaziValidator
+from bazibench.dataset.writer import JsonlSink
+from generate_data import load_config
+
+
+def main():
+    config = load_config()
+    quotas = config["stratified"]["quotas"]
+    generator = BaziDatasetGenerator(
+        seed=config["generation"]["base_seed"],
+        start_year=config["date_range"]["start_year"],
+        end_year=config["date_range"]["end_year"],
+        longitude=config["location"]["longitude"],
+        latitude=config["location"]["latitude"],
+        utc_offset=config["location"]["utc_offset"],
+        record_time=False,
+        liunian_start_year=config["generation"]["liunian_start_year"]
+    )
+    validator = BaziValidator()
+    output_file = os.path.join(config["output"]["dir"], config["stratified"]["filename"])
+
+    total_errors = 0
+    with JsonlSink(output_file) as sink:
+        for sample in tqdm(StratifiedGenerator(generator).generate(quotas), total=sum(q["count"] for q in quotas)):
+            if validator.validate_sample(sample):
+                total_errors += 1
+                continue
+            sink.write(sample.model_dump_json(), sample.tags[0], sample.difficulty)
+
+    print(f"Total validation errors: {total_errors}")
+    print(f"Successfully generated {sink.count} samples to {output_file}")
+    print("Sample distribution:")
+    for tag, count in sink.tags.items():
+        print(f"  {tag}: {count}")
+
+
+if __name__ == "__main__":
+    main()
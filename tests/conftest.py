@@ -1,6 +1,19 @@
 import os
 import sys
 
+import pytest
+
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture(scope="session")
+def atlas(tmp_path_factory):
+    """2023-2024 年的干支历图谱，整个测试会话只构建一次。"""
+    from bazibench.core.atlas import CalendarAtlas, build_atlas
+
+    path = tmp_path_factory.mktemp("atlas") / "atlas.bin"
+    build_atlas(path, 2023, 2024)
+    with CalendarAtlas(path) as atlas:
+        yield atlas
@@ -0,0 +1,41 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from bazibench.core.calculator import BaZiCalculator
+
+
+def test_atlas_matches_calculate(atlas):
+    calc = BaZiCalculator(cache_size=0)
+    rng = random.Random(7)
+    for _ in range(500):
+        # 区间交界前后一秒及区间内部
+        i = rng.randrange(1, len(atlas))
+        seconds = atlas.starts[i] + rng.choice([-1, 0, 1, rng.randrange(-3600, 3600)])
+        dt = datetime(1970, 1, 1) + timedelta(seconds=seconds)
+        assert atlas.calculate(dt) == calc.calculate(dt), dt
+
+
+def test_atlas_header_and_range(atlas):
+    assert (atlas.start_year, atlas.end_year) == (2023, 2024)
+    assert (atlas.longitude, atlas.utc_offset, atlas.zi_school) == (120.0, 8.0, "late")
+    # 每天约 12 个时辰区间
+    assert 12 * 700 < len(atlas) < 13 * 740
+    with pytest.raises(ValueError):
+        atlas.calculate(datetime(2025, 1, 1, 0, 0))
+
+
+def test_calculator_uses_atlas(atlas):
+    calc = BaZiCalculator(atlas=atlas)
+    dt = datetime(2024, 2, 4, 16, 30)
+    assert calc.calculate(dt) == BaZiCalculator().calculate(dt)
+    assert calc.calculate_encoded(dt) == calc.calculate(dt)
+    assert calc.cache_misses == 0
+    # 其他地点或范围外的时刻回退到常规排盘
+    calc.calculate(dt, longitude=100.0)
+    calc.calculate(datetime(1990, 1, 1, 12, 0))
+    assert calc.cache_misses == 2
+
+    with pytest.raises(ValueError):
+        BaZiCalculator(atlas=atlas, zi_school="early")
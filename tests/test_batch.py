@@ -0,0 +1,63 @@
+import random
+
+import numpy as np
+import pytest
+
+from bazibench.core import BaZiCalculator, EncodedChart, analyze_chart
+from bazibench.core.batch import (
+    LEVELS,
+    codes_from_cycles,
+    encode_charts,
+    interaction_flags_batch,
+    strength_batch,
+    ten_gods_batch,
+    wuxing_counts_batch,
+)
+from bazibench.core.constants import WUXING
+from bazibench.core.interactions import FIELDS
+from bazibench.core.tables import TEN_GOD_NAMES
+
+
+def _random_charts(n, seed=0):
+    rng = random.Random(seed)
+    return [
+        EncodedChart(*(rng.randrange(10 if i % 2 == 0 else 12) for i in range(8)))
+        for _ in range(n)
+    ]
+
+
+def test_batch_matches_analyze_chart():
+    charts = _random_charts(2000)
+    codes = encode_charts(charts)
+    counts = wuxing_counts_batch(codes)
+    gods = ten_gods_batch(codes)
+    scores, levels = strength_batch(codes)
+    for i, chart in enumerate(charts):
+        result = analyze_chart(chart)
+        assert {WUXING[e]: int(n) for e, n in enumerate(counts[i]) if n} == result["wuxing"]["counts"]
+        assert [TEN_GOD_NAMES[g] for g in gods[i]] == result["ten_gods"]["gods"]
+        assert scores[i] == result["strength"]["score"]
+        assert LEVELS[levels[i]] == result["strength"]["level"]
+
+
+def test_codes_from_cycles():
+    from datetime import datetime
+
+    calc = BaZiCalculator()
+    dts = [datetime(1990, 5, 17, 14, 30), datetime(2024, 2, 4, 16, 0)]
+    codes = codes_from_cycles(calc.calculate_batch(dts))
+    assert codes.shape == (2, 8)
+    assert codes.tolist() == encode_charts(calc.calculate(dt) for dt in dts).tolist()
+
+
+def test_batch_rejects_bad_shape():
+    with pytest.raises(ValueError):
+        strength_batch(np.zeros((3, 4), dtype=np.uint8))
+
+
+def test_interaction_flags_batch():
+    charts = _random_charts(3000, seed=5)
+    flags = interaction_flags_batch(encode_charts(charts))
+    for chart, flag in zip(charts, flags):
+        result = analyze_chart(chart, ("interactions",))["interactions"]
+        assert [bool(flag >> k & 1) for k in range(len(FIELDS))] == [bool(result[f]) for f in FIELDS]
@@ -0,0 +1,52 @@
+"""测试交界难题生成。"""
+
+import json
+
+import pytest
+
+from bazibench.dataset.boundary import BoundaryGenerator, BoundaryIndex
+from bazibench.dataset.generator import BaziDatasetGenerator
+
+
+@pytest.fixture(scope="module")
+def index(atlas):
+    return BoundaryIndex(atlas)
+
+
+def test_boundary_kinds(index):
+    # 两年 24 个节；约每天一次换日、一次入子时（均时差按钟表日取值，子夜附近偶有往复）
+    assert len(index.select(["jie"])) == 24
+    assert abs(len(index.select(["day"])) - 731) < 10
+    assert abs(len(index.select(["zi"])) - 731) < 10
+    with pytest.raises(ValueError):
+        index.select(["minute"])
+
+
+def test_samples_straddle_the_boundary(index):
+    generator = BaziDatasetGenerator(seed=2, start_year=2023, end_year=2024)
+    samples = list(BoundaryGenerator(generator, index).generate(kinds=["jie"], offsets=(-1, 1)))
+    assert len(samples) == 48
+    for before, after in zip(samples[::2], samples[1::2]):
+        assert before.meta["boundary"] == after.meta["boundary"]
+        assert (before.meta["offset_minutes"], after.meta["offset_minutes"]) == (-1, 1)
+        assert before.meta["boundary_kind"] == "jie"
+        # 交节前后一分钟月柱不同
+        assert before.ground_truth.chart.month != after.ground_truth.chart.month
+        assert json.loads(after.expected_output)["month"] == after.ground_truth.chart.month
+        assert f"{after.input.minute}分" in after.instruction
+
+
+def test_sample_ids_are_unique(index):
+    generator = BaziDatasetGenerator(seed=5, start_year=2023, end_year=2024, record_time=False)
+    samples = list(BoundaryGenerator(generator, index).generate())
+    ids = [s.id for s in samples]
+    assert len(ids) == len(set(ids))
+    # 换日与入子时相邻，部分偏移落在同一分钟，只保留一题
+    assert len(samples) < len(index.select()) * 6
+
+
+def test_birth_time_tasks_show_the_minute(index):
+    generator = BaziDatasetGenerator(seed=3, start_year=2023, end_year=2024)
+    samples = BoundaryGenerator(generator, index).generate(task_types=("da_yun", "comprehensive"), kinds=["jie"], offsets=(-1, 1))
+    for sample in samples:
+        assert f"{sample.input.hour}时{sample.input.minute}分" in sample.instruction
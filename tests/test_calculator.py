@@ -1,5 +1,11 @@
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
 from bazibench.core.calculator import BaZiCalculator
+from bazibench.core.constants import JIAZI
+from bazibench.core.jieqi import load_jieqi_index
 
 def test_base_day_ganzhi():
     calc = BaZiCalculator()
@@ -55,3 +61,134 @@ def test_true_solar_time_adjustment():
     res_west = calc.calculate(dt, longitude=87.6)
     # Si hour is 6th branch -> "巳"
     assert "巳" in res_west["hour"]
+
+def _lunar_python_pillars(calc, dt, longitude):
+    bazi = calc._get_solar(dt, longitude).getLunar().getEightChar()
+    return {
+        "year": bazi.getYear(),
+        "month": bazi.getMonth(),
+        "day": bazi.getDay(),
+        "hour": bazi.getTime(),
+    }
+
+
+def _differential_corpus(start_year, end_year, seed):
+    rng = random.Random(seed)
+    start = datetime(start_year, 1, 1)
+    span = (datetime(end_year, 12, 31) - start).total_seconds()
+    dts = [start + timedelta(seconds=rng.randrange(int(span))) for _ in range(300)]
+    # 节气交接前后的时刻最容易出错
+    index = load_jieqi_index()
+    first = (start_year - index.start_year) * 24
+    last = (end_year - index.start_year + 1) * 24
+    for _ in range(200):
+        boundary = index.instant(rng.randrange(first, last))
+        dts.append(datetime(1970, 1, 1) + timedelta(seconds=boundary + rng.randrange(-1200, 1200)))
+    longitudes = [rng.uniform(73.0, 135.0) for _ in dts]
+    return dts, longitudes
+
+
+def test_calculate_matches_lunar_python():
+    calc = BaZiCalculator()
+    dts, longitudes = _differential_corpus(1801, 2199, seed=2025)
+    for dt, lon in zip(dts, longitudes):
+        expected = _lunar_python_pillars(calc, dt, lon)
+        result = calc.calculate(dt, longitude=lon)
+        assert {key: result[key] for key in expected} == expected, (dt, lon)
+
+
+def test_calculate_batch_matches_lunar_python():
+    calc = BaZiCalculator()
+    dts, longitudes = _differential_corpus(1900, 2100, seed=2024)
+    result = calc.calculate_batch(dts, longitudes)
+    for i, (dt, lon) in enumerate(zip(dts, longitudes)):
+        expected = _lunar_python_pillars(calc, dt, lon)
+        for key in ("year", "month", "day", "hour"):
+            assert JIAZI[result[key][i]] == expected[key], (dt, lon, key)
+
+
+@pytest.mark.parametrize("dt", [datetime(1750, 6, 1, 12, 0), datetime(1800, 1, 3, 8, 0), datetime(2200, 12, 30, 22, 0)])
+def test_outside_jieqi_index_falls_back_to_lunar_python(dt):
+    calc = BaZiCalculator()
+    expected = _lunar_python_pillars(calc, dt, 120.0)
+    result = calc.calculate(dt)
+    assert {key: result[key] for key in expected} == expected
+
+    batch = calc.calculate_batch([dt, datetime(2000, 1, 1)])
+    assert [JIAZI[batch[key][0]] for key in ("year", "month", "day", "hour")] == list(expected.values())
+
+
+def test_early_zi_school_rolls_day_at_23():
+    dt = datetime(2024, 3, 1, 23, 30)
+    late = BaZiCalculator().calculate(dt)
+    early = BaZiCalculator(zi_school="early").calculate(dt)
+    next_day = BaZiCalculator().calculate(datetime(2024, 3, 2, 1, 0))
+    assert early["hour"] == late["hour"]
+    assert early["day"] == next_day["day"] != late["day"]
+
+
+def test_chart_and_dayun_share_cache():
+    calc = BaZiCalculator(cache_size=2)
+    dt = datetime(1990, 5, 17, 8, 30)
+    chart = calc.calculate(dt)
+    dayun = calc.calculate_dayun(dt, 1)
+    assert calc.cache_info() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+    combined = calc.calculate_with_dayun(dt, 1)
+    assert combined == {"chart": chart, "dayun": dayun}
+    assert calc.cache_hits == 2
+
+    # 返回值是副本，修改不会污染缓存
+    chart["year"] = "X"
+    assert calc.calculate(dt)["year"] != "X"
+
+
+def test_cache_eviction_and_clear():
+    calc = BaZiCalculator(cache_size=2)
+    for hour in (1, 3, 5):
+        calc.calculate(datetime(2000, 1, 1, hour, 0))
+    assert calc.cache_info()["size"] == 2
+    calc.calculate(datetime(2000, 1, 1, 1, 0))
+    assert calc.cache_misses == 4
+
+    calc.clear_cache()
+    assert calc.cache_info() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 2}
+
+    uncached = BaZiCalculator(cache_size=0)
+    uncached.calculate(datetime(2000, 1, 1, 1, 0))
+    uncached.calculate(datetime(2000, 1, 1, 1, 0))
+    assert uncached.cache_info() == {"hits": 0, "misses": 2, "size": 0, "maxsize": 0}
+
+
+def test_liunian_and_liuyue_ranges():
+    calc = BaZiCalculator()
+    assert calc.liunian_range(1900, 2100) == [calc.calculate_liunian(y) for y in range(1900, 2101)]
+    assert calc.liunian_range(2024, 2026) == ["甲辰", "乙巳", "丙午"]
+    assert calc.liunian_range(2025, 2024) == []
+    assert calc.liuyue_range(2024)[:2] == ["丙寅", "丁卯"]
+    # 2024-03-10 在惊蛰后，月柱为卯月
+    assert calc.calculate(datetime(2024, 3, 10, 12))["month"] == calc.liuyue_range(2024)[1]
+
+
+def test_iter_intervals_matches_calculate():
+    calc = BaZiCalculator()
+    start, end = datetime(2023, 12, 30, 5, 17, 3), datetime(2024, 2, 10)
+    intervals = list(calc.iter_intervals(start, end))
+    assert intervals[0][0] == start and intervals[-1][1] == end
+    # 约每个时辰一段，外加子夜与节令交接
+    assert 12 * 41 < len(intervals) < 13 * 42
+    for (s, e, chart), following in zip(intervals, intervals[1:] + [None]):
+        assert calc.calculate(s) == chart
+        assert calc.calculate(e - timedelta(seconds=1)) == chart
+        if following is not None:
+            assert following[0] == e and following[2] != chart
+
+
+def test_iter_intervals_encoded_and_empty():
+    calc = BaZiCalculator()
+    start = datetime(2024, 2, 4, 16, 30)
+    (s, e, chart), = calc.iter_intervals(start, start + timedelta(minutes=5), encoded=True)
+    assert chart == calc.calculate_encoded(start)
+    assert list(calc.iter_intervals(start, start)) == []
+    with pytest.raises(ValueError):
+        list(BaZiCalculator(eot_method="spencer").iter_intervals(start, start + timedelta(days=1)))
@@ -0,0 +1,67 @@
+import random
+from datetime import datetime, timedelta
+from itertools import islice
+
+import pytest
+
+from bazibench.core.calculator import BaZiCalculator
+
+
+def _lunar_python_dayun(calc, dt, gender, longitude):
+    yun = calc._get_solar(dt, longitude).getLunar().getEightChar().getYun(gender)
+    pillars = [
+        {"start_year": dy.getStartYear(), "start_age": dy.getStartAge(), "ganzhi": dy.getGanZhi()}
+        for dy in yun.getDaYun()[1:]
+    ]
+    return yun, pillars
+
+
+def test_dayun_matches_lunar_python():
+    calc = BaZiCalculator(cache_size=0)
+    rng = random.Random(99)
+    for i in range(300):
+        if i % 2:
+            dt = datetime(1900, 1, 1) + timedelta(seconds=rng.randrange(200 * 365 * 86400))
+        else:
+            # 出生在节令附近时起运岁数对时刻最敏感
+            jie = 2 * rng.randrange(100 * 12, 300 * 12)
+            dt = datetime(1970, 1, 1) + timedelta(seconds=calc.jieqi.instant(jie) + rng.randrange(-20000, 20000))
+        longitude = rng.uniform(73.0, 135.0)
+        gender = rng.randrange(2)
+        yun, expected = _lunar_python_dayun(calc, dt, gender, longitude)
+        assert calc.calculate_dayun(dt, gender, longitude) == expected, (dt, longitude, gender)
+
+        sequence = calc._dayun(calc._resolve(dt, longitude, 8.0), gender)
+        assert sequence.forward == yun.isForward()
+        start = yun.getStartSolar()
+        assert sequence.start.start_date == datetime(start.getYear(), start.getMonth(), start.getDay()).date()
+
+
+def test_iter_dayun_is_lazy_and_unbounded():
+    calc = BaZiCalculator()
+    dt = datetime(1990, 5, 17, 8, 30)
+    first_three = list(islice(calc.iter_dayun(dt, 0), 3))
+    assert first_three == calc.calculate_dayun(dt, 0, count=3)
+    long_run = list(islice(calc.iter_dayun(dt, 0), 15))
+    assert long_run[:9] == calc.calculate_dayun(dt, 0)
+    assert long_run[14]["start_age"] - long_run[0]["start_age"] == 140
+
+    with pytest.raises(ValueError):
+        calc.iter_dayun(dt, 2)
+
+
+@pytest.mark.parametrize(
+    "dt",
+    [
+        datetime(1750, 6, 1, 12, 0),
+        datetime(1800, 1, 3, 8, 0),
+        # 2200 年大雪之后顺排，下一节已在节气索引之外
+        datetime(2200, 12, 15, 3, 0),
+        datetime(2200, 12, 30, 22, 0),
+    ],
+)
+def test_dayun_outside_jieqi_index_falls_back_to_lunar_python(dt):
+    calc = BaZiCalculator()
+    for gender in (0, 1):
+        _, expected = _lunar_python_dayun(calc, dt, gender, 120.0)
+        assert calc.calculate_dayun(dt, gender) == expected
@@ -0,0 +1,51 @@
+import sys
+from datetime import datetime
+
+from bazibench.core.calculator import BaZiCalculator
+from bazibench.core.encoding import EncodedChart
+from bazibench.core.strength import analyze_strength
+from bazibench.core.ten_gods import analyze_ten_gods
+from bazibench.core.wuxing import analyze_wuxing
+from bazibench.dataset.schema import BaziChart
+
+
+def _chart():
+    return BaZiCalculator().calculate(datetime(1990, 5, 17, 8, 30))
+
+
+def test_round_trips():
+    chart = _chart()
+    encoded = EncodedChart.from_dict(chart)
+    assert encoded.to_dict() == chart
+    assert encoded == chart
+    assert EncodedChart.unpack(encoded.pack()) == encoded
+    assert encoded.pack() < 2 ** 32
+
+    model = BaziChart(**chart)
+    assert EncodedChart.from_model(model) == encoded
+    assert encoded.to_model() == model
+
+
+def test_calculate_encoded():
+    calc = BaZiCalculator()
+    dt = datetime(1990, 5, 17, 8, 30)
+    encoded = calc.calculate_encoded(dt)
+    assert isinstance(encoded, EncodedChart)
+    assert encoded == calc.calculate(dt)
+    assert EncodedChart.from_cycles(0, 2, 40, 59)["day"] == "甲辰"
+
+
+def test_analyzers_accept_encoded_chart():
+    chart = _chart()
+    encoded = EncodedChart.from_dict(chart)
+    assert analyze_wuxing(encoded) == analyze_wuxing(chart)
+    assert analyze_ten_gods(encoded) == analyze_ten_gods(chart)
+    assert analyze_strength(encoded) == analyze_strength(chart)
+
+
+def test_compact_memory():
+    chart = _chart()
+    encoded = EncodedChart.from_dict(chart)
+    assert not hasattr(encoded, "__dict__")
+    dict_size = sys.getsizeof(chart) + sum(sys.getsizeof(v) for v in chart.values())
+    assert sys.getsizeof(encoded) * 10 < dict_size
@@ -0,0 +1,68 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+from lunar_python import Solar
+
+from bazibench.core.constants import JIAZI
+from bazibench.core.ganzhi import day_hour_cycles, day_hour_cycles_array, hour_cycle, day_cycle
+
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+def _days(d):
+    return d.toordinal() - EPOCH
+
+
+def test_day_cycle_from_julian_day():
+    # 1900-01-31 为甲辰日，儒略日数 2415051
+    assert JIAZI[day_cycle(2415051)] == "甲辰"
+    day, hour = day_hour_cycles(_days(date(1900, 1, 31)), 12)
+    assert (JIAZI[day], JIAZI[hour]) == ("甲辰", "庚午")
+
+
+def test_hour_stem_follows_wu_shu_dun():
+    # 甲己还加甲：甲日子时为甲子
+    assert JIAZI[hour_cycle(0, 0)] == "甲子"
+    assert JIAZI[hour_cycle(5, 0)] == "甲子"
+    # 戊癸何方发，壬子是真途
+    assert JIAZI[hour_cycle(9, 0)] == "壬子"
+
+
+@pytest.mark.parametrize("zi_school,sect", [("late", 2), ("early", 1)])
+def test_zi_hour_schools_match_lunar_python(zi_school, sect):
+    for dt in [datetime(2024, 3, 1, 22, 59), datetime(2024, 3, 1, 23, 0), datetime(2024, 3, 1, 23, 59),
+               datetime(2024, 3, 2, 0, 0), datetime(1999, 12, 31, 23, 30)]:
+        bazi = Solar.fromYmdHms(dt.year, dt.month, dt.day, dt.hour, dt.minute, 0).getLunar().getEightChar()
+        bazi.setSect(sect)
+        day, hour = day_hour_cycles(_days(dt.date()), dt.hour, zi_school)
+        assert (JIAZI[day], JIAZI[hour]) == (bazi.getDay(), bazi.getTime())
+
+
+def test_array_kernel_matches_scalar():
+    days = np.arange(-30000, 30000, 7)
+    hours = np.arange(len(days)) % 24
+    for zi_school in ("late", "early"):
+        day, hour = day_hour_cycles_array(days, hours, zi_school)
+        expected = [day_hour_cycles(int(d), int(h), zi_school) for d, h in zip(days, hours)]
+        assert list(zip(day.tolist(), hour.tolist())) == expected
+
+
+def test_invalid_school():
+    with pytest.raises(ValueError):
+        day_hour_cycles(0, 0, "midnight")
+
+
+def test_year_and_month_cycles():
+    from bazibench.core.constants import WU_HU_DUN, TIANGAN
+    from bazibench.core.ganzhi import MONTH_CYCLES, month_cycle_array, year_cycle, year_cycle_array
+
+    years = np.arange(1800, 2201)
+    assert year_cycle_array(years).tolist() == [year_cycle(int(y)) for y in years]
+    assert JIAZI[year_cycle(1984)] == "甲子"
+    months = month_cycle_array(year_cycle_array(years) % 10)
+    assert months.shape == (len(years), 12)
+    for stem in range(10):
+        # 寅月天干按五虎遁，其后逐月顺推
+        assert JIAZI[MONTH_CYCLES[stem][0]] == WU_HU_DUN[TIANGAN[stem]] + "寅"
+        assert all((b - a) % 60 == 1 for a, b in zip(MONTH_CYCLES[stem], MONTH_CYCLES[stem][1:]))
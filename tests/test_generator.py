@@ -1,8 +1,9 @@
 """测试数据集生成器。"""
 
+import json
 import pytest
 from datetime import datetime
-from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.generator import BaziDatasetGenerator, PROMPT_PREFIXES, content_id
 from bazibench.dataset.schema import BaziSample, BaziAnalysis
 
 def test_generator_initialization():
@@ -70,3 +71,93 @@ def test_generate_sample_comprehensive():
     assert "综合八字分析" in sample.instruction
     assert "chart" in sample.expected_output
     assert "useful_god" in sample.expected_output
+
+def test_lazy_analysis_computes_on_access():
+    generator = BaziDatasetGenerator()
+    dt = datetime(2024, 2, 4, 12, 0)
+    lazy = generator.lazy_analyze(dt, 1)
+    assert lazy.chart.year == generator.analyze(dt).chart.year
+    # 只访问四柱时不排大运、不查分析缓存
+    assert "da_yun" not in vars(lazy) and "results" not in vars(lazy)
+    assert lazy.materialize().model_dump() == generator.analyze(dt).model_dump()
+
+def test_ground_truth_sections_per_task():
+    sample = BaziDatasetGenerator(seed=1).generate_sample("chart")
+    assert sample.ground_truth.wuxing is None and sample.ground_truth.da_yun is None
+    sample = BaziDatasetGenerator(seed=1).generate_sample("da_yun")
+    assert sample.ground_truth.da_yun is not None and sample.ground_truth.strength is None
+    sample = BaziDatasetGenerator(seed=1, full_ground_truth=True).generate_sample("chart")
+    assert sample.ground_truth.da_yun is not None and sample.ground_truth.useful_god is not None
+
+def test_indexed_samples_are_order_independent():
+    tasks = ["chart", "wuxing", "da_yun"]
+    forward = BaziDatasetGenerator(seed=9, record_time=False)
+    backward = BaziDatasetGenerator(seed=9, record_time=False)
+    a = [forward.generate_indexed_sample(i, tasks).model_dump_json() for i in range(6)]
+    b = [backward.generate_indexed_sample(i, tasks).model_dump_json() for i in reversed(range(6))]
+    assert a == b[::-1]
+    assert len(set(a)) == 6
+    other = BaziDatasetGenerator(seed=10, record_time=False).generate_indexed_sample(0, tasks)
+    assert other.model_dump_json() != a[0]
+
+def test_sample_ids_are_content_addressed():
+    a = BaziDatasetGenerator(seed=4).generate_sample("chart")
+    b = BaziDatasetGenerator(seed=4).generate_sample("chart")
+    # 生成时间不同，ID 仍相同
+    assert a.id == b.id and len(a.id) == 32
+    assert a.id == content_id(a.input, "chart")
+    assert content_id(a.input, "wuxing") != a.id
+    assert content_id(a.input, "da_yun", {"liunian_start": 2025}) != content_id(a.input, "da_yun", {"liunian_start": 2026})
+
+def test_fanout_shares_one_chart():
+    generator = BaziDatasetGenerator(seed=6)
+    samples = generator.generate_fanout(["chart", "da_yun", "comprehensive"], variants=(0, 2))
+    assert len(samples) == 6
+    assert len({s.meta["group"] for s in samples}) == 1
+    assert len({s.input.model_dump_json() for s in samples}) == 1
+    assert len({s.id for s in samples}) == 6
+    # 变体只改题面引导语，答案不变
+    assert samples[0].expected_output == samples[1].expected_output
+    assert samples[1].instruction.startswith(PROMPT_PREFIXES[2]) and samples[1].meta["variant"] == 2
+    assert samples[0].instruction.endswith(samples[1].instruction[len(PROMPT_PREFIXES[2]):])
+
+def test_fanout_batch_controls_correlation():
+    generator = BaziDatasetGenerator(seed=6)
+    samples = generator.generate_batch(10, ["chart", "wuxing", "strength"], tasks_per_chart=2)
+    assert len(samples) == 10
+    groups = [s.meta["group"] for s in samples]
+    assert all(groups[i] == groups[i + 1] for i in range(0, 10, 2))
+    assert all(samples[i].tags != samples[i + 1].tags for i in range(0, 10, 2))
+    with pytest.raises(ValueError):
+        generator.generate_sample("chart", variant=len(PROMPT_PREFIXES))
+
+def test_liunian_years_are_fixed():
+    sample = BaziDatasetGenerator(seed=2, liunian_start_year=2030).generate_sample("da_yun")
+    assert "2030-2032年" in sample.instruction
+    assert [y["year"] for y in json.loads(sample.expected_output)["liunian"]] == [2030, 2031, 2032]
+
+@pytest.mark.parametrize("kwargs", [
+    {"tasks_per_chart": 0},
+    {"tasks_per_chart": -1},
+    {"variants": ()},
+    {"variants": (0, len(PROMPT_PREFIXES))},
+    {"task_types": []},
+])
+def test_fanout_rejects_empty_configurations(kwargs):
+    generator = BaziDatasetGenerator()
+    with pytest.raises(ValueError):
+        generator.generate_fanout(**kwargs)
+    # 批量生成不会因每个八字不出题而陷入死循环
+    batch_kwargs = {"tasks_per_chart": 2, **kwargs}
+    with pytest.raises(ValueError):
+        generator.generate_batch(3, **batch_kwargs)
+
+
+def test_birth_time_is_truncated_to_the_minute():
+    generator = BaziDatasetGenerator(start_year=2020, end_year=2021)
+    assert all(generator.generate_random_date().second == 0 for _ in range(20))
+    # 东经 120° 钟表时间 2024-02-04 16:41:13 交立春：同一分钟内交节前后的时刻得到同一道题
+    before = BaziDatasetGenerator(record_time=False).generate_sample("chart", datetime(2024, 2, 4, 16, 41, 5), gender=1)
+    after = BaziDatasetGenerator(record_time=False).generate_sample("chart", datetime(2024, 2, 4, 16, 41, 30), gender=1)
+    assert before.model_dump_json() == after.model_dump_json()
+    assert before.ground_truth.chart.month == "乙丑"
@@ -14,3 +14,22 @@ def test_interactions_xing_and_self():
     result = analyze_interactions(branches)
     assert ("寅", "巳", "申") in result["xing"]
     assert "辰" in result["self_xing"]
+
+
+def test_interactions_dayun_liunian_branches():
+    # 原局四支加大运、流年支
+    branches = ["寅", "卯", "巳", "亥", "申", "亥"]
+    result = analyze_interactions(branches)
+    assert ("寅", "亥") in result["liuhe"]
+    assert ("巳", "亥") in result["liuchong"]
+    assert ("申", "亥") in result["liuhai"]
+    assert result["self_xing"] == ["亥"]
+
+
+def test_interaction_masks():
+    from bazibench.core.interactions import branch_masks, interaction_table, interactions_from_masks
+
+    seen, dup = branch_masks([0, 1, 0])
+    assert (seen, dup) == (0b11, 0b1)
+    assert len(interaction_table()) == 4096
+    assert interactions_from_masks(seen, dup) == analyze_interactions(["子", "丑", "子"])
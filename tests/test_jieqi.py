@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from bazibench.core.constants import JIAZI
+from bazibench.core.jieqi import JieQiIndex, jieqi_table, load_jieqi_index
+
+
+def _seconds(dt):
+    return int((dt - datetime(1970, 1, 1)) / timedelta(seconds=1))
+
+
+def test_index_is_sorted_and_named():
+    index = load_jieqi_index()
+    assert len(index) == (2200 - 1800 + 1) * 24
+    assert np.all(np.diff(index.instants) > 0)
+    lichun = (2024 - index.start_year) * 24 + 2
+    assert index.term_name(lichun) == "立春"
+    assert datetime(1970, 1, 1) + timedelta(seconds=index.instant(lichun)) == datetime(2024, 2, 4, 16, 27, 7)
+
+
+def test_year_month_switch_at_lichun():
+    index = JieQiIndex(jieqi_table(2023, 2025), 2023)
+    before = _seconds(datetime(2024, 2, 4, 16, 27, 6))
+    after = _seconds(datetime(2024, 2, 4, 16, 27, 7))
+    assert [JIAZI[i] for i in index.year_month(before)] == ["癸卯", "乙丑"]
+    assert [JIAZI[i] for i in index.year_month(after)] == ["甲辰", "丙寅"]
+
+    years, months = index.year_month_array(np.array([before, after]))
+    assert list(zip(years.tolist(), months.tolist())) == [index.year_month(before), index.year_month(after)]
+
+
+def test_out_of_range():
+    index = JieQiIndex(jieqi_table(2023, 2025), 2023)
+    with pytest.raises(ValueError):
+        index.locate(_seconds(datetime(2022, 6, 1)))
+    with pytest.raises(ValueError):
+        index.year_month_array(np.array([_seconds(datetime(2026, 6, 1))]))
+
+
+def test_load_without_writable_cache(tmp_path, monkeypatch):
+    from bazibench.core import jieqi
+
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    monkeypatch.setenv("BAZIBENCH_CACHE_DIR", str(blocker / "cache"))
+    monkeypatch.setattr(jieqi, "jieqi_table", lambda start, end: np.arange((end - start + 1) * 24, dtype=np.int64))
+    index = jieqi.load_jieqi_index.__wrapped__()
+    assert len(index) == (2200 - 1800 + 1) * 24
+    assert list(tmp_path.iterdir()) == [blocker]
+
+
+def test_failed_cache_write_leaves_no_tmp_file(tmp_path, monkeypatch):
+    from bazibench.core import jieqi
+
+    def fail(src, dst):
+        raise OSError("read-only")
+
+    monkeypatch.setenv("BAZIBENCH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(jieqi, "jieqi_table", lambda start, end: np.arange((end - start + 1) * 24, dtype=np.int64))
+    monkeypatch.setattr(jieqi.os, "replace", fail)
+    assert len(jieqi.load_jieqi_index.__wrapped__()) == (2200 - 1800 + 1) * 24
+    assert list(tmp_path.iterdir()) == []
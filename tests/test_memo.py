@@ -0,0 +1,73 @@
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+from bazibench.core import BaZiCalculator, EncodedChart, analyze_chart
+from bazibench.core.memo import AnalysisMemo
+from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.validator import BaziValidator
+
+
+def test_memo_matches_analyze_chart():
+    memo = AnalysisMemo(maxsize=2)
+    calc = BaZiCalculator()
+    charts = [calc.calculate(datetime(2000 + i, 3, 1, 9)) for i in range(3)]
+    for chart in charts:
+        assert memo.analyze(chart) == analyze_chart(chart)
+    assert memo.cache_info() == {"hits": 0, "misses": 3, "size": 2, "maxsize": 2}
+    # 最早的一项已被淘汰
+    memo.analyze(charts[2])
+    memo.analyze(charts[0])
+    assert (memo.hits, memo.misses) == (1, 4)
+
+
+def test_memo_persistent_store(tmp_path):
+    chart = EncodedChart.from_dict(BaZiCalculator().calculate(datetime(1990, 5, 17, 14, 30)))
+    path = tmp_path / "memo.sqlite"
+    with AnalysisMemo(path=path) as memo:
+        expected = memo.analyze(chart)
+    with AnalysisMemo(path=path) as memo:
+        assert memo.get(chart.pack()) == expected
+        assert memo.cache_info()["misses"] == 0
+
+
+def test_prewarm_range(tmp_path, monkeypatch):
+    monkeypatch.setenv("BAZIBENCH_CACHE_DIR", str(tmp_path))
+    with AnalysisMemo(maxsize=0, path=tmp_path / "memo.sqlite") as memo:
+        computed = memo.prewarm_range(2024, 2024)
+        assert computed > 0
+        assert memo.prewarm_range(2024, 2024) == 0
+        chart = BaZiCalculator().calculate(datetime(2024, 7, 1, 12))
+        memo.analyze(chart)
+        assert memo.cache_info()["hits"] == 1
+
+
+def test_validator_checks_ground_truth():
+    memo = AnalysisMemo()
+    sample = BaziDatasetGenerator(memo=memo).generate_sample("strength")
+    validator = BaziValidator(memo=memo)
+    assert validator.validate_sample(sample) == []
+    # 日干对自身恒为比肩
+    sample.ground_truth.ten_gods.gods[2] = "七杀"
+    assert validator.validate_sample(sample) == ["Ten gods do not match the chart"]
+
+
+def test_persistent_store_commits_in_batches(tmp_path):
+    path = tmp_path / "memo.sqlite"
+
+    def stored():
+        with closing(sqlite3.connect(str(path))) as db:
+            return db.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+
+    calc = BaZiCalculator()
+    charts = [calc.calculate(datetime(2000 + i, 3, 1, 9)) for i in range(5)]
+    memo = AnalysisMemo(path=path, commit_every=2)
+    for chart in charts:
+        memo.analyze(chart)
+    # 未调用 close 时也已提交满两条的批次，只剩最后一条未提交
+    assert stored() == 4
+
+    with BaziDatasetGenerator(memo=memo) as generator:
+        generator.generate_sample("wuxing")
+    assert stored() == memo.misses >= 5
+    memo.close()
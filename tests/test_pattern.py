@@ -0,0 +1,42 @@
+import random
+from datetime import datetime
+
+from bazibench.core import BaZiCalculator
+from bazibench.core.batch import pattern_batch
+from bazibench.core.pattern import PATTERN_NAMES, analyze_pattern, pattern_from_indices
+
+
+def test_normal_pattern_from_protrusion():
+    # 庚午 辛巳 壬午 丁未：巳藏庚透出年干，庚为壬水偏印
+    chart = BaZiCalculator().calculate(datetime(1990, 5, 17, 14, 30))
+    result = analyze_pattern(chart)
+    assert result["main_pattern"] == "偏印格"
+    assert "庚透出" in result["description"]
+
+
+def test_jianlu_when_main_qi_is_bijian():
+    # 壬子 壬寅 甲子 壬子：寅本气甲为日主比肩
+    assert pattern_from_indices([8, 8, 0, 8], [0, 2, 0, 0])["main_pattern"] == "建禄格"
+
+
+def test_special_patterns():
+    # 甲己合于辰月，化神土当令
+    assert pattern_from_indices([4, 5, 0, 2], [4, 4, 4, 4])["main_pattern"] == "化土格"
+    # 甲木日主满局财星，无比劫印绶
+    assert pattern_from_indices([4, 4, 0, 4], [4, 10, 1, 7])["main_pattern"] == "从财格"
+    # 壬水日主生子月，一片水势
+    assert pattern_from_indices([8, 9, 8, 8], [0, 0, 11, 0])["main_pattern"] == "润下格"
+
+
+def test_sub_patterns():
+    # 甲日：辛正官、癸正印
+    result = pattern_from_indices([7, 9, 0, 2], [0, 0, 0, 0])
+    assert "官印相生" in result["sub_patterns"]
+
+
+def test_pattern_batch_matches_scalar():
+    rng = random.Random(5)
+    rows = [[rng.randrange(10 if i % 2 == 0 else 12) for i in range(8)] for _ in range(3000)]
+    codes = pattern_batch(rows)
+    for row, code in zip(rows, codes):
+        assert pattern_from_indices(row[0::2], row[1::2])["main_pattern"] == PATTERN_NAMES[code]
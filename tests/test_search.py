@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from bazibench.core.calculator import BaZiCalculator
+from bazibench.core.search import ChartSearchIndex
+
+
+@pytest.fixture(scope="module")
+def index(atlas):
+    return ChartSearchIndex(atlas)
+
+
+def test_full_chart_lookup(index):
+    calc = BaZiCalculator()
+    dt = datetime(2024, 2, 4, 16, 30)
+    chart = calc.calculate(dt)
+    results = index.search(chart["year"], chart["month"], chart["day"], chart["hour"])
+    assert any(start <= dt < end for start, end in results)
+    for start, end in results:
+        assert calc.calculate(start) == chart
+        assert calc.calculate(end - timedelta(seconds=1)) == chart
+        assert calc.calculate(end) != chart
+        assert calc.calculate(start - timedelta(seconds=1)) != chart
+
+
+def test_partial_lookup(index):
+    calc = BaZiCalculator()
+    results = index.search(day="甲子", hour="甲子")
+    # 两年内约 12 个甲子日，每日只有零点起的子时为甲子时（晚子时按次日日干起为丙子）
+    assert 11 <= len(results) <= 13
+    for start, end in results:
+        chart = calc.calculate(start)
+        assert (chart["day"], chart["hour"]) == ("甲子", "甲子")
+        chart = calc.calculate(end - timedelta(seconds=1))
+        assert (chart["day"], chart["hour"]) == ("甲子", "甲子")
+    assert index.count(year="癸卯") == 1
+    assert index.count(hour=0) == len(index.search(hour="甲子"))
+
+
+def test_invalid_queries(index):
+    assert index.search("甲子", "甲子", "甲子", "甲子") == []
+    with pytest.raises(ValueError):
+        index.search()
+    with pytest.raises(ValueError):
+        index.search(day="甲丑")
@@ -0,0 +1,47 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from bazibench.core.calculator import BaZiCalculator
+from bazibench.core.constants import JIAZI
+from bazibench.core.solar_time import equation_of_time, true_solar_time, true_solar_time_array
+
+
+def _corpus(seed, n=300):
+    rng = random.Random(seed)
+    dts = [datetime(1950, 1, 1) + timedelta(seconds=rng.randrange(80 * 365 * 86400)) for _ in range(n)]
+    longitudes = np.array([rng.uniform(73.0, 135.0) for _ in dts])
+    utc_offsets = np.array([rng.choice([7.0, 8.0, 9.0]) for _ in dts])
+    return dts, longitudes, utc_offsets
+
+
+def test_spencer_equation_of_time():
+    # 11月3日前后均时差约 +16.4 分钟，2月11日前后约 -14.2 分钟
+    assert equation_of_time(307, method="spencer") == pytest.approx(16.4, abs=0.3)
+    assert equation_of_time(42, method="spencer") == pytest.approx(-14.2, abs=0.3)
+    # 近似式与 Spencer 级数相差不超过约一分钟
+    for day in range(1, 366, 5):
+        assert abs(equation_of_time(day) - equation_of_time(day, method="spencer")) < 1.5
+
+
+@pytest.mark.parametrize("method", ["approx", "spencer"])
+def test_array_matches_scalar(method):
+    dts, longitudes, utc_offsets = _corpus(11)
+    result = true_solar_time_array(dts, longitudes, utc_offsets, method)
+    for i, dt in enumerate(dts):
+        expected = true_solar_time(dt, longitudes[i], utc_offsets[i], method)
+        assert abs(result[i].item() - expected) <= timedelta(microseconds=1)
+
+
+def test_calculator_eot_method():
+    dts, longitudes, utc_offsets = _corpus(12, n=100)
+    calc = BaZiCalculator(eot_method="spencer")
+    batch = calc.calculate_batch(dts, longitudes, utc_offsets)
+    for i, dt in enumerate(dts):
+        chart = calc.calculate(dt, longitude=longitudes[i], utc_offset=utc_offsets[i])
+        assert JIAZI[batch["hour"][i]] == chart["hour"]
+
+    with pytest.raises(ValueError):
+        BaZiCalculator(eot_method="noaa2")
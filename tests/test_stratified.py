@@ -0,0 +1,76 @@
+"""测试分层抽样生成。"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.stratified import ChartFeatureIndex, StratifiedGenerator
+
+
+@pytest.fixture(scope="module")
+def features(atlas):
+    return ChartFeatureIndex(atlas)
+
+
+def test_quotas_are_filled_from_matching_intervals(features):
+    generator = BaziDatasetGenerator(seed=11, start_year=2023, end_year=2024, full_ground_truth=True)
+    quotas = [
+        {"task_type": "interactions", "interaction": "sanhui", "count": 5},
+        {"difficulty": 3, "level": "身弱", "day_master": "甲", "count": 5},
+        {"task_type": "pattern", "pattern": "从格", "count": 3},
+    ]
+    samples = list(StratifiedGenerator(generator, features).generate(quotas))
+    assert len(samples) == 13
+    for sample in samples[:5]:
+        assert sample.tags == ["interactions"] and sample.ground_truth.interactions.sanhui
+    for sample in samples[5:10]:
+        assert sample.difficulty == 3
+        assert sample.ground_truth.strength.level == "身弱" and sample.ground_truth.chart.day_stem == "甲"
+    for sample in samples[10:]:
+        assert sample.ground_truth.pattern.main_pattern.startswith("从")
+        assert sample.meta["stratum"] == {"task_type": "pattern", "pattern": "从格"}
+
+
+def test_invalid_strata(features):
+    stratified = StratifiedGenerator(BaziDatasetGenerator(), features)
+    with pytest.raises(ValueError):
+        list(stratified.generate([{"interaction": "unknown", "count": 1}]))
+    with pytest.raises(ValueError):
+        list(stratified.generate([{"task_type": "chart", "difficulty": 5, "count": 1}]))
+    with pytest.raises(ValueError):
+        list(stratified.generate([{"color": "red", "count": 1}]))
+
+
+def test_samples_are_whole_minutes_inside_the_stratum(features):
+    generator = BaziDatasetGenerator(seed=12, start_year=2023, end_year=2024)
+    samples = list(StratifiedGenerator(generator, features).generate([{"task_type": "chart", "pattern": "从格", "count": 20}]))
+    for sample in samples:
+        dt = datetime(sample.input.year, sample.input.month, sample.input.day, sample.input.hour, sample.input.minute)
+        # 题面给出的分钟重新排盘，得到的正是样本答案
+        assert generator.calculator.calculate(dt)["day"] == sample.ground_truth.chart.day
+        assert generator.analyze(dt).pattern.main_pattern.startswith("从")
+
+
+@pytest.mark.parametrize("near, window, day_master", [("lichun", 30, "戊"), ("midnight", 60, "甲")])
+def test_near_strata_stay_within_the_window(features, near, window, day_master):
+    starts, ends = features.spans(features.select(), near, window)
+    assert np.all(starts < ends) and np.all(starts[1:] >= ends[:-1])
+
+    generator = BaziDatasetGenerator(seed=13, start_year=2023, end_year=2024)
+    quotas = [{"task_type": "chart", "day_master": day_master, "near": near, "window": window, "count": 10}]
+    events = features.events[near]
+    for sample in StratifiedGenerator(generator, features).generate(quotas):
+        dt = datetime(sample.input.year, sample.input.month, sample.input.day, sample.input.hour, sample.input.minute)
+        seconds = (dt - datetime(1970, 1, 1)).total_seconds()
+        assert np.abs(events - seconds).min() <= window * 60
+        assert sample.ground_truth.chart.day_stem == day_master
+
+
+def test_invalid_near_strata(features):
+    stratified = StratifiedGenerator(BaziDatasetGenerator(), features)
+    with pytest.raises(ValueError):
+        list(stratified.generate([{"near": "noon", "count": 1}]))
+    with pytest.raises(ValueError):
+        list(stratified.generate([{"window": 10, "count": 1}]))
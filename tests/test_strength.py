@@ -1,3 +1,4 @@
+import pytest
 from bazibench.core.strength import analyze_strength
 
 
@@ -29,3 +30,50 @@ def test_strength_weak_case():
     }
     result = analyze_strength(pillars)
     assert result["level"] in {"身弱", "中和"}
+
+
+def _pillars(stems, branches):
+    pillars = {}
+    for p, stem, branch in zip(("year", "month", "day", "hour"), stems, branches):
+        pillars[p] = stem + branch
+        pillars[f"{p}_stem"] = stem
+        pillars[f"{p}_branch"] = branch
+    return pillars
+
+
+# 逐项分析改为查表前的实现给出的结果：(天干, 地支, 五行计数（按出现顺序）, 缺失, 十神, 得分, 判定)
+_PINNED = [
+    ("甲丙戊庚", "子寅辰申", [("木", 3), ("火", 2), ("土", 4), ("金", 2), ("水", 3)], [],
+     ["七杀", "偏印", "比肩", "食神"], -2.8, "身弱"),
+    ("甲乙甲乙", "寅寅卯寅", [("木", 8), ("火", 3), ("土", 3)], ["金", "水"],
+     ["比肩", "劫财", "比肩", "劫财"], 9.2, "身强"),
+    # 得分恰在判定阈值上
+    ("丙癸庚乙", "丑丑卯亥", [("火", 1), ("水", 4), ("金", 3), ("木", 3), ("土", 2)], [],
+     ["七杀", "伤官", "比肩", "正财"], 1.0, "身偏强"),
+    ("辛丁壬庚", "辰戌子丑", [("金", 4), ("火", 2), ("水", 4), ("土", 3), ("木", 1)], [],
+     ["正印", "正财", "比肩", "偏印"], -1.0, "中和"),
+    ("甲壬壬己", "巳酉戌子", [("木", 1), ("水", 3), ("土", 3), ("火", 2), ("金", 3)], [],
+     ["食神", "比肩", "比肩", "正官"], 4.0, "身强"),
+]
+
+
+@pytest.mark.parametrize("stems, branches, counts, missing, gods, score, level", _PINNED)
+def test_analyze_chart_matches_pinned_results(stems, branches, counts, missing, gods, score, level):
+    from bazibench.core import analyze_chart
+
+    result = analyze_chart(_pillars(stems, branches))
+    assert list(result["wuxing"]["counts"].items()) == counts
+    assert result["wuxing"]["missing"] == missing
+    assert result["ten_gods"]["gods"] == gods
+    assert result["strength"] == {"score": score, "level": level}
+
+
+def test_analyze_chart_sections():
+    from bazibench.core import analyze_chart
+
+    pillars = _pillars("甲丙戊庚", "子寅辰申")
+    result = analyze_chart(pillars)
+    assert result["interactions"]["liuchong"] == [("寅", "申")]
+    assert result["interactions"]["sanhe"] == [("申", "子", "辰")]
+    assert set(result) == {"wuxing", "ten_gods", "strength", "interactions", "pattern"}
+    assert set(analyze_chart(pillars, ["strength"])) == {"strength"}
@@ -0,0 +1,61 @@
+from bazibench.core.constants import TIANGAN, DIZHI, WUXING, STEM_INFO, BRANCH_INFO, SHENG, KE, HIDDEN_WEIGHTS
+from bazibench.core.encoding import EncodedChart
+from bazibench.core.tables import (
+    RELATIONS,
+    ELEMENT_RELATION,
+    TEN_GOD_NAMES,
+    TEN_GOD_TABLE,
+    HIDDEN_ELEMENTS,
+    HIDDEN_ELEMENT_VECTORS,
+    BRANCH_STRENGTH,
+    BRANCH_STRENGTH_TERMS,
+    stem_indices,
+    branch_indices,
+)
+
+
+def test_element_relation_table():
+    for i, day in enumerate(WUXING):
+        for j, target in enumerate(WUXING):
+            relation = RELATIONS[ELEMENT_RELATION[i * 5 + j]]
+            if day == target:
+                assert relation == "same"
+            elif SHENG[target] == day:
+                assert relation == "supported"
+            elif SHENG[day] == target:
+                assert relation == "drain"
+            elif KE[target] == day:
+                assert relation == "controlled"
+            else:
+                assert KE[day] == target and relation == "controls"
+
+
+def test_ten_god_table_rows():
+    # 每个日干对十干各得一个十神，且十神互不重复
+    for day in range(10):
+        row = TEN_GOD_TABLE[day * 10:day * 10 + 10]
+        assert sorted(row) == list(range(10))
+        assert TEN_GOD_NAMES[row[day]] == "比肩"
+    assert TEN_GOD_NAMES[TEN_GOD_TABLE[TIANGAN.index("丙") * 10 + TIANGAN.index("壬")]] == "七杀"
+
+
+def test_hidden_stem_tables():
+    for b, branch in enumerate(DIZHI):
+        hidden = BRANCH_INFO[branch]["hidden_stems"]
+        assert [WUXING[e] for e in HIDDEN_ELEMENTS[b]] == [STEM_INFO[s]["wuxing"] for s in hidden]
+        assert sum(HIDDEN_ELEMENT_VECTORS[b]) == len(hidden)
+        assert len(HIDDEN_WEIGHTS[branch]) == len(hidden)
+
+
+def test_branch_strength():
+    # 甲木日主：寅（甲丙戊）= 0.6*1 + 0.2*(-0.5) + 0.2*(-0.5)
+    wood = WUXING.index("木")
+    assert BRANCH_STRENGTH_TERMS[wood * 12 + DIZHI.index("寅")] == (0.6, -0.1, -0.1)
+    assert abs(BRANCH_STRENGTH[wood * 12 + DIZHI.index("寅")] - 0.4) < 1e-12
+    assert BRANCH_STRENGTH[wood * 12 + DIZHI.index("子")] == 0.5
+
+
+def test_indices_accept_dict_and_encoded():
+    chart = EncodedChart(0, 2, 2, 2, 4, 6, 6, 8)
+    assert stem_indices(chart) == stem_indices(chart.to_dict()) == (0, 2, 4, 6)
+    assert branch_indices(chart) == branch_indices(chart.to_dict()) == (2, 2, 6, 8)
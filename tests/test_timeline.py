@@ -0,0 +1,56 @@
+from datetime import datetime
+from itertools import islice
+
+import pytest
+
+from bazibench.core import BaZiCalculator, analyze_interactions
+from bazibench.core.constants import WU_HU_DUN
+from bazibench.core.ten_gods import ten_god
+
+BIRTH = datetime(1990, 5, 17, 14, 30)
+
+
+@pytest.fixture(scope="module")
+def calc():
+    return BaZiCalculator()
+
+
+def test_dayun_and_liunian_match_calculator(calc):
+    timeline = calc.timeline(BIRTH, 1)
+    dayun = calc.calculate_dayun(BIRTH, 1)
+    entries = list(timeline.dayun(len(dayun)))
+    assert [(e.year, e.ganzhi) for e in entries] == [(d["start_year"], d["ganzhi"]) for d in dayun]
+    assert [e.ganzhi for e in timeline.liunian(2020, 2030)] == [calc.calculate_liunian(y) for y in range(2020, 2031)]
+
+
+def test_liuyue_follows_wu_hu_dun(calc):
+    months = list(calc.timeline(BIRTH, 0).liuyue(2024, 2024))
+    assert len(months) == 12
+    assert months[0].ganzhi == WU_HU_DUN["甲"] + "寅"
+    assert months[-1].period == (2024, 12) and months[-1].ganzhi[1] == "丑"
+
+
+def test_entries_against_natal_chart(calc):
+    chart = calc.calculate(BIRTH)
+    natal = [chart["year_branch"], chart["month_branch"], chart["day_branch"], chart["hour_branch"]]
+    for entry in calc.timeline(BIRTH, 1).liunian(2000, 2011):
+        assert entry.ten_god == ten_god(chart["day_stem"], entry.ganzhi[0])
+        full = analyze_interactions(natal + [entry.ganzhi[1]])
+        for field, rules in entry.interactions.items():
+            if field == "self_xing":
+                continue
+            assert set(rules) <= set(full[field])
+            assert all(entry.ganzhi[1] in rule for rule in rules)
+
+
+def test_walk_is_chronological(calc):
+    timeline = calc.timeline(BIRTH, 1)
+    entries = list(timeline.walk(2000, 2030))
+    assert entries[0].level == "dayun" and entries[0].year <= 2000
+    assert sum(e.level == "liuyue" for e in entries) == 31 * 12
+    years = [e.year for e in entries[1:]]
+    assert years == sorted(years)
+    # 惰性：无上限的大运也能只取前几步
+    assert len(list(islice(timeline.dayun(), 20))) == 20
+    with pytest.raises(ValueError):
+        list(timeline.walk(2000, 2001, ("dayun", "xiaoyun")))
@@ -36,3 +36,16 @@ def test_validate_invalid_sample():
     errors = validator.validate_sample(sample)
     assert len(errors) > 0
     assert "Invalid stem" in errors[0]
+
+def test_static_datasets_match_current_analysis():
+    import json
+    from pathlib import Path
+    from bazibench.core.memo import AnalysisMemo
+    from bazibench.dataset.schema import BaziSample
+
+    validator = BaziValidator(memo=AnalysisMemo())
+    static_dir = Path(__file__).parent.parent / "bazibench" / "dataset" / "static"
+    for path in sorted(static_dir.glob("*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            samples = [BaziSample(**json.loads(line)) for line in f]
+        assert validator.validate_batch(samples) == {}, path.name
@@ -0,0 +1,35 @@
+"""测试流式数据集写入器。"""
+
+import json
+
+import pytest
+
+from bazibench.dataset.generator import BaziDatasetGenerator
+from bazibench.dataset.writer import JsonlSink
+
+
+def test_sink_streams_and_counts(tmp_path):
+    path = tmp_path / "out" / "samples.jsonl"
+    generator = BaziDatasetGenerator(seed=3)
+    with JsonlSink(path, limit=3) as sink:
+        for task in ["chart", "wuxing", "chart", "strength"]:
+            sample = generator.generate_sample(task)
+            sink.write(sample.model_dump_json(), sample.tags[0], sample.difficulty)
+        assert sink.full
+        # 关闭前目标文件尚不存在
+        assert not path.exists()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["tags"][0] for line in lines] == ["chart", "wuxing", "chart"]
+    assert sink.stats() == {"tags": {"chart": 2, "wuxing": 1}, "difficulties": {2: 2, 3: 1}}
+
+
+def test_sink_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / "samples.jsonl"
+    path.write_text("old\n", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with JsonlSink(path) as sink:
+            sink.write("{}", "chart")
+            raise RuntimeError
+    assert path.read_text(encoding="utf-8") == "old\n"
+    assert list(tmp_path.iterdir()) == [path]